@@ -0,0 +1,144 @@
+import os
+
+
+def _env_str(name: str, default: str) -> str:
+    """문자열 환경 변수 읽기"""
+    return os.environ.get(name) or default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """불리언 환경 변수 읽기 (1/true/yes/on)"""
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    """정수형 환경 변수 읽기 (없거나 잘못된 값이면 기본값 사용)"""
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        print(f"[WARN] Invalid value for {name}: {value!r}, using default {default}")
+        return default
+
+
+CPU_COUNT = os.cpu_count() or 1
+
+# Whisper STT 워커 프로세스 수 (각 워커가 모델을 따로 로드하므로 메모리에 주의)
+WHISPER_WORKERS = max(1, min(_env_int("WHISPER_WORKERS", 2), CPU_COUNT))
+
+# 기본 STT 엔진 (openai-whisper, faster-whisper) - 업로드 시 stt_engine 파라미터로 요청별 선택 가능
+STT_ENGINE = _env_str("STT_ENGINE", "openai-whisper")
+
+# 기본 Whisper 모델 (tiny, base, small, medium, large), 장치(cpu/cuda), 연산 타입(float32/float16)
+WHISPER_MODEL_SIZE = _env_str("WHISPER_MODEL_SIZE", "base")
+WHISPER_DEVICE = _env_str("WHISPER_DEVICE", "cpu")
+WHISPER_COMPUTE_TYPE = _env_str("WHISPER_COMPUTE_TYPE", "float16" if WHISPER_DEVICE.startswith("cuda") else "float32")
+# faster-whisper(CTranslate2) 연산 타입 (CPU에서는 int8 양자화가 가장 빠르고 메모리를 적게 씀)
+FASTER_WHISPER_COMPUTE_TYPE = _env_str(
+    "FASTER_WHISPER_COMPUTE_TYPE", "float16" if WHISPER_DEVICE.startswith("cuda") else "int8"
+)
+# 서버 시작 시 미리 로드할 모델 크기 (쉼표로 구분, "none"이면 미리 로드하지 않음)
+WHISPER_PRELOAD = [
+    size.strip() for size in _env_str("WHISPER_PRELOAD", WHISPER_MODEL_SIZE).split(",")
+    if size.strip() and size.strip().lower() != "none"
+]
+# 미리 로드하지 않은 모델을 내리기까지의 유휴 시간 (초), 로드된 모델 메모리 합계 상한 (MB, 0이면 제한 없음)
+MODEL_IDLE_TIMEOUT_SECONDS = max(10, _env_int("MODEL_IDLE_TIMEOUT_SECONDS", 1800))
+MODEL_MEMORY_BUDGET_BYTES = max(0, _env_int("MODEL_MEMORY_BUDGET_MB", 8192)) * 1024 * 1024
+
+# 음성 구간 검출(VAD): 무음 구간을 건너뛰고 음성 구간만 Whisper로 인식
+VAD_ENABLED = _env_bool("VAD_ENABLED", True)
+# 잡음 바닥(하위 10% 프레임 에너지)보다 이만큼(dB) 큰 프레임을 음성으로 판단
+VAD_THRESHOLD_DB = max(1, _env_int("VAD_THRESHOLD_DB", 12))
+# 이보다 짧은 무음(ms)은 잘라내지 않음, 음성 구간 앞뒤 여유(ms)
+VAD_MIN_SILENCE_MS = max(100, _env_int("VAD_MIN_SILENCE_MS", 700))
+VAD_PAD_MS = max(0, _env_int("VAD_PAD_MS", 200))
+
+# 짧은 오디오(30초 이하) 배치 인식: 첫 요청 후 최대 대기 시간(ms) 동안 최대 배치 크기만큼 모아 한 번에 인식 (1이면 사용 안 함)
+WHISPER_BATCH_SIZE = max(1, _env_int("WHISPER_BATCH_SIZE", 8))
+WHISPER_BATCH_WAIT_MS = max(0, _env_int("WHISPER_BATCH_WAIT_MS", 100))
+
+# 실시간 전사(/ws/live): 새 오디오가 이만큼(ms) 쌓이면 미확정 구간을 다시 인식, 한 번에 인식하는 최대 구간(초), 동시 세션 수
+LIVE_STEP_MS = max(200, _env_int("LIVE_STEP_MS", 1000))
+LIVE_WINDOW_SECONDS = max(5, min(_env_int("LIVE_WINDOW_SECONDS", 30), 30))
+LIVE_MAX_SESSIONS = max(1, _env_int("LIVE_MAX_SESSIONS", 4))
+
+# 긴 오디오 모드: 이 길이(초) 이상이면 무음 지점에서 청크(최대 길이, 초)로 나누어 워커들이 동시에 인식
+LONG_AUDIO_MIN_SECONDS = max(60, _env_int("LONG_AUDIO_MIN_SECONDS", 600))
+LONG_AUDIO_CHUNK_SECONDS = max(60, _env_int("LONG_AUDIO_CHUNK_SECONDS", 300))
+
+# 요약 백엔드: auto(서버 시작 시 Ollama에 기본 모델이 있으면 Ollama, 없으면 더미), ollama(항상 Ollama), dummy(항상 더미)
+SUMMARY_BACKEND = _env_str("SUMMARY_BACKEND", "auto").strip().lower()
+if SUMMARY_BACKEND not in ("auto", "ollama", "dummy"):
+    print(f"[WARN] Invalid value for SUMMARY_BACKEND: {SUMMARY_BACKEND!r}, using default 'auto'")
+    SUMMARY_BACKEND = "auto"
+
+# Ollama LLM 서버
+OLLAMA_BASE_URL = _env_str("OLLAMA_BASE_URL", "http://localhost:11434")
+OLLAMA_MODEL = _env_str("OLLAMA_MODEL", "llama3.1:8b")
+OLLAMA_MAX_CONNECTIONS = max(1, _env_int("OLLAMA_MAX_CONNECTIONS", 8))
+# 모델 가용성(/api/tags) 캐시 유지 시간 (초)
+OLLAMA_AVAILABILITY_TTL = max(1, _env_int("OLLAMA_AVAILABILITY_TTL", 60))
+# 토큰 스트리밍 생성 사용 여부와 생성 토큰 상한 (진행률 계산 기준)
+OLLAMA_STREAM = _env_bool("OLLAMA_STREAM", True)
+OLLAMA_NUM_PREDICT = max(1, _env_int("OLLAMA_NUM_PREDICT", 2048))
+# Ollama 컨텍스트 길이 (토큰)
+OLLAMA_NUM_CTX = max(512, _env_int("OLLAMA_NUM_CTX", 8192))
+# 요청 후 모델을 메모리에 유지할 시간 (Ollama keep_alive: "30m", "1h", 초 단위 숫자, -1이면 계속 유지)
+# 모델이 내려가지 않아야 작업 사이에 공통 지시문(system 프롬프트)의 KV 캐시도 재사용됨
+OLLAMA_KEEP_ALIVE = _env_str("OLLAMA_KEEP_ALIVE", "30m")
+
+# 긴 텍스트의 계층적(map-reduce) 요약: 청크 크기/겹침(토큰), 청크 요약 토큰 상한, 동시 요약 수
+SUMMARY_CHUNK_TOKENS = max(256, _env_int("SUMMARY_CHUNK_TOKENS", 3000))
+SUMMARY_CHUNK_OVERLAP_TOKENS = max(0, _env_int("SUMMARY_CHUNK_OVERLAP_TOKENS", 200))
+SUMMARY_CHUNK_NUM_PREDICT = max(1, _env_int("SUMMARY_CHUNK_NUM_PREDICT", 1024))
+SUMMARY_MAP_CONCURRENCY = max(1, _env_int("SUMMARY_MAP_CONCURRENCY", 2))
+# 전사가 앞에서부터 확정되는 대로 청크별 부분 요약을 시작 (긴 녹음의 STT와 요약을 겹쳐 실행)
+SUMMARY_OVERLAP = _env_bool("SUMMARY_OVERLAP", True)
+
+# 전사/요약 결과 content-addressed 캐시 (디스크, 크기 제한 LRU)
+CACHE_DIR = _env_str("CACHE_DIR", "cache")
+CACHE_MAX_BYTES = max(0, _env_int("CACHE_MAX_MB", 512)) * 1024 * 1024
+
+# 업로드 최대 크기 (MB)
+MAX_UPLOAD_MB = max(1, _env_int("MAX_UPLOAD_MB", 1024))
+MAX_UPLOAD_BYTES = MAX_UPLOAD_MB * 1024 * 1024
+
+# 작업 스케줄러: 단계별 동시 실행 수와 대기열 크기 (초과 시 429)
+# STT 기본값은 워커 수 (워커 풀은 FIFO이므로 더 받으면 먼저 들어온 긴 오디오가 짧은 오디오를 막음)
+# 배치로 묶이는 30초 이하 오디오는 배치 대기열로 넘어갈 때 슬롯을 반납하고 배처가 따로 워커 수 x 배치 크기까지 받음
+STT_CONCURRENCY = max(1, _env_int("STT_CONCURRENCY", WHISPER_WORKERS))
+# 모델 크기/엔진마다 워커 풀이 따로 생기므로 모든 풀의 워커 프로세스 합계 상한 (넘으면 유휴 풀을 내리고 새 풀을 띄움)
+STT_MAX_WORKERS = max(WHISPER_WORKERS, _env_int("STT_MAX_WORKERS", max(WHISPER_WORKERS, STT_CONCURRENCY)))
+LLM_CONCURRENCY = max(1, _env_int("LLM_CONCURRENCY", 1))
+MAX_QUEUE_SIZE = max(1, _env_int("MAX_QUEUE_SIZE", 20))
+# 저장된 전사로 요약만 하는 작업(/resummarize)의 대기열 크기
+MAX_SUMMARY_QUEUE_SIZE = max(1, _env_int("MAX_SUMMARY_QUEUE_SIZE", MAX_QUEUE_SIZE))
+
+# 작업별 모델 선택 정책: 오디오 길이, 대기열 길이, 요청 품질 힌트(quality)로 STT 모델 크기와 요약 모델을 고름
+MODEL_POLICY_ENABLED = _env_bool("MODEL_POLICY_ENABLED", True)
+# 정책이 고를 수 있는 STT 모델 크기 (작은 것부터)
+WHISPER_MODEL_LADDER = [
+    size.strip() for size in _env_str("WHISPER_MODEL_LADDER", "tiny,base,small,medium,large").split(",") if size.strip()
+]
+# 대기 작업이 이만큼 쌓일 때마다 STT 모델을 한 단계 낮춤 (최대 두 단계), 요약 대기열이 쌓이면 빠른 요약 모델 사용
+MODEL_POLICY_BACKLOG = max(1, _env_int("MODEL_POLICY_BACKLOG", max(2, MAX_QUEUE_SIZE // 4)))
+# 이 길이(초) 이상의 오디오는 한 단계 작은 STT 모델 사용
+MODEL_POLICY_LONG_AUDIO_SECONDS = max(60, _env_int("MODEL_POLICY_LONG_AUDIO_SECONDS", 1800))
+# 빠른 요약 모델 (비어 있으면 항상 OLLAMA_MODEL)
+OLLAMA_FAST_MODEL = _env_str("OLLAMA_FAST_MODEL", "")
+
+# 작업 상태 저장소: "sqlite" (여러 워커 공유, 재시작 후 복구) 또는 "memory"
+TASK_STORE = _env_str("TASK_STORE", "sqlite")
+TASK_DB_PATH = _env_str("TASK_DB_PATH", "data/tasks.db")
+# 진행률 일괄 기록 주기 (ms)
+TASK_FLUSH_INTERVAL = max(50, _env_int("TASK_FLUSH_INTERVAL_MS", 500)) / 1000
+# 이 시간(초) 동안 갱신되지 않은 진행 중 작업은 중단된 것으로 보고 복구
+TASK_LEASE_SECONDS = max(5, _env_int("TASK_LEASE_SECONDS", 30))
+# 완료/실패 작업 보관 기간 (시간)
+TASK_TTL_SECONDS = max(1, _env_int("TASK_TTL_HOURS", 72)) * 3600
@@ -1,25 +1,70 @@
 import os
 import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, File, UploadFile, HTTPException, WebSocket
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
+import json
 import uuid
+import time
 from datetime import datetime
+from typing import Dict, List, Optional, Set
 
-from .models.schemas import ProcessingType, ProcessingResponse, ProcessingStatusResponse
+from . import config
+from .models.schemas import (
+    ProcessingType,
+    ProcessingResponse,
+    QualityHint,
+    ProcessingStatusResponse,
+    ResummarizeRequest,
+    TranscriptSegmentsResponse
+)
 from .services.processor_demo import AudioProcessor
-
-# Global state to store processing tasks
-processing_tasks = {}
+from .services.task_store import TERMINAL_STATUSES, create_task_store
+from .services import audio_ingest, metrics, segment_store
+from .services.events import RESYNC_EVENT, TaskEventBus, drain
+from .services.live_transcription import LiveTranscriber
+from .services.scheduler import JobScheduler, QueueFullError, size_priority
+from .services.stt_engines import STT_ENGINES
+from .services.upload_stream import UploadRejected, receive_upload
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Initialize audio processor
+    # Startup: Initialize task store and audio processor
+    app.state.task_store = create_task_store(
+        config.TASK_STORE,
+        config.TASK_DB_PATH,
+        flush_interval=config.TASK_FLUSH_INTERVAL,
+        lease_seconds=config.TASK_LEASE_SECONDS
+    )
+    await app.state.task_store.start()
+    app.state.event_bus = TaskEventBus()
+    # FFmpeg 경로는 시작 시 한 번만 찾음 (요청마다 PATH를 바꾸지 않음)
+    audio_ingest.ffmpeg_path()
     app.state.audio_processor = AudioProcessor()
+    # 요약 백엔드 확정 (SUMMARY_BACKEND=auto이면 Ollama 연결과 기본 모델 확인)
+    await app.state.audio_processor.start()
+    # STT 모델 미리 로드 (백그라운드, 준비 상태는 /health로 확인)
+    app.state.model_registry = app.state.audio_processor.models
+    await app.state.model_registry.start()
+    app.state.scheduler = JobScheduler(
+        stt_concurrency=config.STT_CONCURRENCY,
+        llm_concurrency=config.LLM_CONCURRENCY,
+        max_queue=config.MAX_QUEUE_SIZE,
+        on_queue_change=publish_queue_positions,
+        max_summary_queue=config.MAX_SUMMARY_QUEUE_SIZE
+    )
+    # 중단된 작업 복구 + 만료된 작업 정리 (주기적)
+    maintenance = asyncio.create_task(task_maintenance_loop())
+    # /metrics 조회 시 대기열/캐시 게이지 갱신
+    metrics.REGISTRY.add_collector(collect_metrics)
     yield
-    # Shutdown: cleanup if needed
+    # Shutdown: STT 모델(워커 프로세스), Ollama 커넥션, 작업 저장소 정리
+    metrics.REGISTRY.remove_collector(collect_metrics)
+    maintenance.cancel()
+    await app.state.audio_processor.shutdown()
+    await app.state.task_store.close()
 
 app = FastAPI(
     title="Voice to Markdown API",
@@ -41,56 +86,149 @@ app.add_middleware(
 os.makedirs("uploads", exist_ok=True)
 os.makedirs("results", exist_ok=True)
 
+# 이 프로세스에서 실행 중인 작업의 최신 상태 (task_id -> 작업 dict)
+# WebSocket 스냅샷은 저장소 대신 여기서 읽음 (배치 기록 전의 값까지 포함)
+running_tasks: Dict[str, dict] = {}
+
+# 진행 중인 실시간 전사 세션 (task_id)
+live_sessions: Set[str] = set()
+
+# 누적되는 텍스트 필드 -> 이어 붙은 부분만 보내는 delta 이벤트 종류
+TEXT_DELTA_EVENTS = {"transcript": "transcript_delta", "partial_summary": "summary_delta"}
+
+# WebSocket 스냅샷에 포함하는 필드
+SNAPSHOT_FIELDS = ["status", "progress", "message", "transcript", "segment_count", "partial_summary"]
+
 @app.get("/")
 async def root():
     return {"message": "Voice to Markdown API", "status": "running"}
 
-@app.post("/upload", response_model=ProcessingResponse)
+@app.get("/health")
+async def health():
+    """
+    서버 준비 상태
+    
+    미리 로드할 STT 모델이 모두 준비되면 200, 로드 중이거나 실패했으면 503을 반환합니다.
+    """
+    models = app.state.model_registry.status()
+    return JSONResponse(
+        status_code=200 if models["ready"] else 503,
+        content={
+            "status": "ok" if models["ready"] else "starting",
+            "models": models,
+            "stt_engines": app.state.audio_processor.stt_engines()
+        }
+    )
+
+@app.post(
+    "/upload",
+    response_model=ProcessingResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "required": ["file"],
+                        "properties": {
+                            "file": {"type": "string", "format": "binary"},
+                            "processing_type": {"type": "string", "enum": [t.value for t in ProcessingType]},
+                            "stt_engine": {"type": "string", "enum": list(STT_ENGINES)},
+                            "quality": {"type": "string", "enum": [q.value for q in QualityHint]}
+                        }
+                    }
+                }
+            }
+        }
+    }
+)
 async def upload_audio(
-    file: UploadFile = File(...),
-    processing_type: ProcessingType = ProcessingType.LECTURE
+    request: Request,
+    processing_type: Optional[ProcessingType] = None,
+    stt_engine: Optional[str] = None,
+    quality: Optional[QualityHint] = None
 ):
-    # 파일 타입 검증 개선 (더 관대한 검증)
-    allowed_types = [
-        'audio/', 'video/webm', 'video/mp4', 'video/quicktime',
-        'application/octet-stream'  # 일부 브라우저에서 오디오 파일을 이렇게 전송
-    ]
-    
-    # 파일 확장자로도 검증
-    allowed_extensions = ['.mp3', '.wav', '.webm', '.m4a', '.mp4', '.aac', '.ogg', '.flac']
-    file_extension = os.path.splitext(file.filename or '')[1].lower()
+    # Content-Length로 판단 가능한 초과 업로드는 본문을 받기 전에 거부
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > config.MAX_UPLOAD_BYTES + 64 * 1024:
+        raise HTTPException(status_code=413, detail=f"파일이 너무 큽니다. 최대 {config.MAX_UPLOAD_MB}MB까지 업로드할 수 있습니다.")
     
-    is_valid_type = any(file.content_type.startswith(t) for t in allowed_types) if file.content_type else False
-    is_valid_extension = file_extension in allowed_extensions
-    
-    if not (is_valid_type or is_valid_extension):
-        print(f"Invalid file - Content-Type: {file.content_type}, Extension: {file_extension}, Filename: {file.filename}")
-        raise HTTPException(status_code=400, detail=f"지원하지 않는 파일 형식입니다. 업로드된 파일: {file.content_type or 'Unknown'} (.{file_extension})")
+    # 대기열이 가득 차 있으면 본문을 받기 전에 거부
+    scheduler = app.state.scheduler
+    if scheduler.is_full():
+        raise _queue_full_error(scheduler.retry_after())
     
     # 고유 task ID 생성
     task_id = str(uuid.uuid4())
     
-    # 파일 저장
-    file_extension = os.path.splitext(file.filename)[1]
-    saved_filename = f"{task_id}{file_extension}"
-    file_path = f"uploads/{saved_filename}"
+    # 파일 저장 (청크 단위 스트리밍, 해시/크기/형식 검증 동시 수행)
+    try:
+        with metrics.UPLOAD_SECONDS.time():
+            upload = await receive_upload(
+                request.headers.get("content-type", ""),
+                request.stream(),
+                dest_dir="uploads",
+                file_stem=task_id,
+                max_bytes=config.MAX_UPLOAD_BYTES
+            )
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    
+    # 처리 유형: 쿼리 파라미터 우선, 없으면 폼 필드
+    if processing_type is None:
+        try:
+            processing_type = ProcessingType(upload.fields.get("processing_type", ProcessingType.LECTURE.value))
+        except ValueError:
+            os.remove(upload.file_path)
+            raise HTTPException(status_code=422, detail="processing_type은 lecture 또는 meeting이어야 합니다.")
+    
+    # STT 엔진: 쿼리 파라미터 우선, 없으면 폼 필드, 둘 다 없으면 STT_ENGINE 설정값
+    stt_engine = stt_engine or upload.fields.get("stt_engine") or app.state.audio_processor.default_stt_engine
+    if stt_engine not in app.state.audio_processor.stt_engines():
+        os.remove(upload.file_path)
+        raise HTTPException(
+            status_code=422,
+            detail=f"사용할 수 없는 STT 엔진입니다: {stt_engine} (사용 가능: {', '.join(app.state.audio_processor.stt_engines())})"
+        )
     
-    with open(file_path, "wb") as buffer:
-        content = await file.read()
-        buffer.write(content)
+    # 품질 힌트: 쿼리 파라미터 우선, 없으면 폼 필드 (모델 선택 정책에 사용)
+    if quality is None:
+        try:
+            quality = QualityHint(upload.fields.get("quality", QualityHint.BALANCED.value))
+        except ValueError:
+            os.remove(upload.file_path)
+            raise HTTPException(status_code=422, detail="quality는 fast, balanced, accurate 중 하나여야 합니다.")
+    
+    file_path = upload.file_path
     
     # 처리 상태 초기화
-    processing_tasks[task_id] = {
+    task_store = app.state.task_store
+    await task_store.create(task_id, {
         "status": "pending",
         "progress": 0,
         "message": "처리 대기 중",
         "file_path": file_path,
+        "file_size": upload.size,
+        "audio_sha256": upload.sha256,
+        "audio_format": upload.audio_format,
         "processing_type": processing_type,
+        "stt_engine": stt_engine,
+        "quality": quality.value,
         "created_at": datetime.now().isoformat()
-    }
+    })
     
-    # 백그라운드에서 처리 시작
-    asyncio.create_task(process_audio_task(task_id))
+    # 스케줄러에 처리 작업 등록 (대기열이 가득 차면 429)
+    try:
+        scheduler.submit(
+            task_id,
+            lambda: process_audio_task(task_id),
+            priority=size_priority(upload.size)
+        )
+    except QueueFullError as e:
+        await task_store.delete(task_id)
+        os.remove(file_path)
+        raise _queue_full_error(e.retry_after)
     
     return ProcessingResponse(
         task_id=task_id,
@@ -98,32 +236,56 @@ async def upload_audio(
         message="파일 업로드 완료. 처리를 시작합니다."
     )
 
+def _queue_full_error(retry_after: int) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=f"처리 대기열이 가득 찼습니다. {retry_after}초 후 다시 시도해주세요.",
+        headers={"Retry-After": str(retry_after)}
+    )
+
 @app.get("/status/{task_id}", response_model=ProcessingStatusResponse)
-async def get_processing_status(task_id: str):
-    if task_id not in processing_tasks:
-        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+async def get_processing_status(task_id: str, include_transcript: bool = False):
+    """
+    작업 상태
     
-    task = processing_tasks[task_id]
+    전사 텍스트는 폴링마다 다시 보내지 않도록 include_transcript=true일 때만 포함합니다.
+    필요한 부분만 받으려면 segment_count를 보고 /transcript/{task_id}/segments로 구간을 조회합니다.
+    """
+    task = await app.state.task_store.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
     
     result_url = None
     if task["status"] == "completed":
         result_url = f"/download/{task_id}"
     
+    scheduler = app.state.scheduler
+    estimated_start = scheduler.estimated_start(task_id)
+    
     return ProcessingStatusResponse(
         task_id=task_id,
         status=task["status"],
         progress=task["progress"],
         message=task["message"],
         result_url=result_url,
-        transcript=task.get("transcript")
+        transcript=task.get("transcript") if include_transcript else None,
+        segment_count=task.get("segment_count"),
+        stt_model=task.get("stt_model"),
+        llm_model=task.get("llm_model"),
+        prompt_version=task.get("prompt_version"),
+        source_task_id=task.get("source_task_id"),
+        prompt_eval_saved_seconds=task.get("prompt_eval_saved_seconds"),
+        partial_summary=task.get("partial_summary"),
+        queue_position=scheduler.queue_position(task_id),
+        estimated_start_at=estimated_start.isoformat() if estimated_start else None
     )
 
 @app.get("/download/{task_id}")
 async def download_result(task_id: str):
-    if task_id not in processing_tasks:
+    task = await app.state.task_store.get(task_id)
+    if task is None:
         raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
     
-    task = processing_tasks[task_id]
     if task["status"] != "completed":
         raise HTTPException(status_code=400, detail="처리가 완료되지 않았습니다")
     
@@ -137,103 +299,686 @@ async def download_result(task_id: str):
         media_type="text/markdown"
     )
 
+@app.post("/resummarize/{task_id}", response_model=ProcessingResponse)
+async def resummarize(task_id: str, request: Optional[ResummarizeRequest] = None):
+    """
+    저장된 전사로 새 요약 작업 시작 (음성 인식은 다시 하지 않음)
+    
+    처리 유형, 요약 모델, 품질 힌트를 바꿔 새 작업으로 요약하고 원래 작업은 그대로 둡니다.
+    프롬프트 템플릿이 바뀐 뒤에 요청하면 현재 버전으로 다시 요약합니다.
+    전사를 마친 작업이면 요약에 실패했거나 요약 중이어도 요청할 수 있습니다.
+    """
+    request = request or ResummarizeRequest()
+    task_store = app.state.task_store
+    source = await task_store.get(task_id)
+    if source is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    if not source.get("transcript"):
+        raise HTTPException(status_code=409, detail="전사 결과가 아직 없습니다")
+    
+    # 요약 대기열이 가득 차 있으면 새 작업을 만들기 전에 거부
+    scheduler = app.state.scheduler
+    if scheduler.is_full(needs_stt=False):
+        raise _queue_full_error(scheduler.retry_after(needs_stt=False))
+    
+    processor = app.state.audio_processor
+    if request.llm_model and not await processor.ollama_service.ensure_model(request.llm_model):
+        raise HTTPException(
+            status_code=422,
+            detail=f"사용할 수 없는 요약 모델입니다: {request.llm_model} (사용 가능: {', '.join(processor.ollama_service.get_available_models())})"
+        )
+    
+    new_task_id = str(uuid.uuid4())
+    # 세그먼트 파일은 새 작업 ID로도 구간 조회할 수 있게 공유
+    source_segments = segment_store.segments_path("results", task_id)
+    segments_path = segment_store.segments_path("results", new_task_id)
+    if os.path.exists(source_segments):
+        await asyncio.to_thread(segment_store.share_segments, source_segments, segments_path)
+    
+    await task_store.create(new_task_id, {
+        "status": "pending",
+        "progress": 50,
+        "message": "저장된 전사로 요약 대기 중",
+        "source_task_id": task_id,
+        "file_size": source.get("file_size", 0),
+        "audio_sha256": source.get("audio_sha256"),
+        "processing_type": request.processing_type or source["processing_type"],
+        "stt_engine": source.get("stt_engine"),
+        "quality": request.quality.value if request.quality else source.get("quality"),
+        "stt_model": source.get("stt_model"),
+        "stt_model_size": source.get("stt_model_size"),
+        "stt_model_reason": source.get("stt_model_reason"),
+        "requested_llm_model": request.llm_model,
+        "transcript": source["transcript"],
+        "segment_count": source.get("segment_count"),
+        "created_at": datetime.now().isoformat()
+    })
+    # 음성 인식 없이 요약 단계에만 등록 (요약 대기열이 가득 차면 429)
+    try:
+        scheduler.submit(
+            new_task_id,
+            lambda: process_audio_task(new_task_id),
+            priority=size_priority(source.get("file_size", 0)),
+            needs_stt=False
+        )
+    except QueueFullError as e:
+        await task_store.delete(new_task_id)
+        if os.path.exists(segments_path):
+            os.remove(segments_path)
+        raise _queue_full_error(e.retry_after)
+    
+    return ProcessingResponse(
+        task_id=new_task_id,
+        status="pending",
+        message="저장된 전사로 요약을 시작합니다."
+    )
+
+@app.post("/resume/{task_id}", response_model=ProcessingResponse)
+async def resume_task(task_id: str):
+    """
+    실패한 작업을 마지막으로 완료한 단계 다음부터 재개
+    
+    전사를 마친 뒤 요약에서 실패했으면 저장된 전사로 요약만 다시 하고,
+    음성 인식에서 실패했으면 업로드 파일로 음성 인식부터 다시 합니다.
+    """
+    task_store = app.state.task_store
+    task = await task_store.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    if task["status"] != "failed":
+        raise HTTPException(status_code=409, detail="실패한 작업만 재개할 수 있습니다")
+    
+    needs_stt = not task.get("transcript")
+    if needs_stt and not os.path.exists(task.get("file_path") or ""):
+        raise HTTPException(status_code=409, detail="업로드 파일이 없어 작업을 재개할 수 없습니다")
+    
+    scheduler = app.state.scheduler
+    # 실패를 기록한 이전 실행이 아직 정리 중이면 상태를 바꾸지 않고 거부 (pending으로 남은 채 멈추지 않도록)
+    if scheduler.is_running(task_id):
+        raise HTTPException(status_code=409, detail="이전 실행이 아직 정리 중입니다. 잠시 후 다시 시도해주세요.")
+    if needs_stt and scheduler.is_full():
+        raise _queue_full_error(scheduler.retry_after())
+    
+    message = "처리 재개 대기 중" if needs_stt else "저장된 전사로 요약 재개 대기 중"
+    await task_store.update(
+        task_id,
+        status="pending",
+        progress=0 if needs_stt else 50,
+        message=message,
+        partial_summary=None
+    )
+    # 기록하는 동안 동시에 들어온 재개 요청이 먼저 등록했으면 그 실행을 그대로 사용 (확인과 등록 사이에 await 없음)
+    if scheduler.is_running(task_id):
+        return ProcessingResponse(task_id=task_id, status="pending", message=message)
+    scheduler.submit(
+        task_id,
+        lambda: process_audio_task(task_id),
+        priority=size_priority(task.get("file_size", 0)),
+        force=True,
+        needs_stt=needs_stt
+    )
+    
+    return ProcessingResponse(task_id=task_id, status="pending", message=message)
+
+@app.get("/transcript/{task_id}/segments", response_model=TranscriptSegmentsResponse)
+async def get_transcript_segments(
+    task_id: str,
+    offset: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    start_time: Optional[float] = Query(None, ge=0),
+    end_time: Optional[float] = Query(None, ge=0)
+):
+    """
+    전사 세그먼트 구간 조회 (시각, 텍스트, 신뢰도)
+    
+    - offset/limit: 세그먼트 번호 기준 페이지 (offset이 음수이면 끝에서부터, 예: offset=-20은 마지막 20개)
+    - start_time/end_time: 이 시각 구간(초)과 겹치는 세그먼트만 조회 (offset은 구간 안에서 적용)
+    
+    다음 페이지는 응답의 next_offset을 offset으로 넘겨 조회합니다.
+    """
+    path = segment_store.segments_path("results", task_id)
+    if not os.path.exists(path):
+        if await app.state.task_store.get(task_id) is None:
+            raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+        raise HTTPException(status_code=404, detail="전사 결과가 아직 없습니다")
+    
+    table = await asyncio.to_thread(segment_store.load_segments, path)
+    first, last = table.time_range(start_time, end_time)
+    page_start = max(first, last + offset) if offset < 0 else first + offset
+    page_end = min(last, page_start + limit)
+    return TranscriptSegmentsResponse(
+        task_id=task_id,
+        total=len(table),
+        duration=table.duration,
+        next_offset=page_end - first if page_end < last else None,
+        segments=table.rows(page_start, page_end)
+    )
+
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """전사/요약 캐시 사용량과 적중률"""
+    return app.state.audio_processor.cache.stats()
+
+@app.get("/scheduler/stats")
+async def get_scheduler_stats():
+    """작업 대기열과 단계별 실행 현황"""
+    return app.state.scheduler.stats()
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus 형식 지표 (단계별 소요 시간, STT 실시간 대비 속도, Ollama 처리량, 대기열, 캐시 적중률)"""
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+def collect_metrics():
+    """대기열 길이, 실행 중인 작업 수, 캐시 적중률을 게이지에 채움 (적중/실패 수는 캐시가 조회할 때 카운터에 기록)"""
+    scheduler = app.state.scheduler
+    for stage, stats in scheduler.stats()["stages"].items():
+        metrics.QUEUE_DEPTH.set(scheduler.queue_depth(stage), stage=stage)
+        metrics.IN_FLIGHT.set(stats["active"], stage=stage)
+    metrics.IN_FLIGHT.set(len(live_sessions), stage="live")
+    
+    cache_stats = app.state.audio_processor.cache.stats()
+    metrics.CACHE_BYTES.set(cache_stats["total_bytes"])
+    for namespace, stats in cache_stats["namespaces"].items():
+        if stats["hit_rate"] is not None:
+            metrics.CACHE_HIT_RATIO.set(stats["hit_rate"], namespace=namespace)
+
+@app.websocket("/ws/live")
+async def live_transcription_endpoint(websocket: WebSocket):
+    """
+    녹음 중 실시간 전사
+    
+    - 클라이언트 -> 서버: {"type": "start", "processing_type", "language", "stt_engine", "quality"}를 보낸 뒤
+      16kHz mono 16bit PCM 바이너리 프레임을 보내고, 녹음이 끝나면 {"type": "stop"}
+    - 서버 -> 클라이언트: "ready" {task_id}, "partial" {text, start, end}, "final" {segments},
+      녹음 종료 후 "completed" {task_id, transcript} 또는 "error" {message}
+    
+    녹음하는 동안 전사가 진행되므로 녹음이 끝나면 남은 몇 초만 인식한 뒤 바로 요약 작업을 등록합니다.
+    이후 요약 진행 상황은 /ws/{task_id}로 받습니다.
+    """
+    await websocket.accept()
+    processor = app.state.audio_processor
+    task_id = str(uuid.uuid4())
+    wav_path = f"uploads/{task_id}.wav"
+    pcm_path = audio_ingest.pcm_path_for(wav_path)
+    segments_path = segment_store.segments_path("results", task_id)
+    completed = False
+    
+    async def send_event(event_type: str, payload: dict):
+        await websocket.send_json({"type": event_type, **payload})
+    
+    try:
+        scheduler = app.state.scheduler
+        if len(live_sessions) >= config.LIVE_MAX_SESSIONS:
+            await send_event("error", {"message": "실시간 전사 세션이 모두 사용 중입니다. 녹음 후 업로드해주세요."})
+            return
+        if scheduler.is_full():
+            # 업로드가 밀려 있으면 실시간 전사가 STT 슬롯을 더 가져가지 않도록 새 세션을 받지 않음
+            retry_after = scheduler.retry_after()
+            await send_event("error", {"message": f"처리 대기열이 가득 찼습니다. {retry_after}초 후 다시 시도해주세요.", "retry_after": retry_after})
+            return
+        
+        start = await websocket.receive_json()
+        try:
+            processing_type = ProcessingType(start.get("processing_type", ProcessingType.LECTURE.value))
+        except ValueError:
+            await send_event("error", {"message": "processing_type은 lecture 또는 meeting이어야 합니다."})
+            return
+        stt_engine = start.get("stt_engine") or processor.default_stt_engine
+        if stt_engine not in processor.stt_engines():
+            await send_event("error", {"message": f"사용할 수 없는 STT 엔진입니다: {stt_engine}"})
+            return
+        try:
+            quality = QualityHint(start.get("quality", QualityHint.BALANCED.value))
+        except ValueError:
+            await send_event("error", {"message": "quality는 fast, balanced, accurate 중 하나여야 합니다."})
+            return
+        # 녹음 길이는 미리 알 수 없으므로 대기열과 품질 힌트로만 모델 크기 선택
+        stt_choice = processor.model_policy.choose_stt_size(0, scheduler.queue_depth("stt"), quality.value)
+        
+        live_sessions.add(task_id)
+        # 녹음하는 동안 모델을 빌려 두어 유휴 시간으로 내려가지 않게 함
+        async with processor.stt_session(stt_engine, stt_choice.model) as stt_service:
+            transcriber = LiveTranscriber(
+                stt_service,
+                pcm_path,
+                start.get("language", "ko"),
+                send_event,
+                step_seconds=config.LIVE_STEP_MS / 1000,
+                window_seconds=config.LIVE_WINDOW_SECONDS,
+                # 구간마다 업로드 작업과 같은 STT 슬롯을 잡음 (STT_CONCURRENCY 공유, 요청 시각 순으로 짧은 파일처럼 우선순위)
+                slot=lambda: scheduler.stage("stt", task_id, record_duration=False, priority=time.time())
+            )
+            runner = asyncio.create_task(transcriber.run())
+            try:
+                await send_event("ready", {"task_id": task_id})
+                while True:
+                    message = await websocket.receive()
+                    if message["type"] == "websocket.disconnect":
+                        raise WebSocketDisconnect(message.get("code", 1000))
+                    if message.get("bytes"):
+                        transcriber.append(message["bytes"])
+                    elif message.get("text") and json.loads(message["text"]).get("type") == "stop":
+                        break
+                
+                await transcriber.finish()
+                await runner
+            finally:
+                transcriber.close()
+                runner.cancel()
+        
+        transcript = transcriber.transcript
+        if not transcript.strip():
+            await send_event("error", {"message": "인식된 음성이 없습니다. 마이크를 확인하고 다시 녹음해주세요."})
+            return
+        
+        # 녹음 원본은 WAV로 보관 (다운로드/재처리용, 디코딩된 PCM은 그대로 재사용)
+        await asyncio.to_thread(audio_ingest.write_wav, pcm_path, wav_path)
+        await asyncio.to_thread(segment_store.save_segments, segments_path, transcriber.segments)
+        file_size = os.path.getsize(wav_path)
+        await app.state.task_store.create(task_id, {
+            "status": "pending",
+            "progress": 50,
+            "message": "실시간 전사 완료, 요약 대기 중",
+            "file_path": wav_path,
+            "file_size": file_size,
+            "audio_format": "wav",
+            "processing_type": processing_type,
+            "stt_engine": stt_engine,
+            "quality": quality.value,
+            "stt_model": f"{stt_engine} {stt_choice.model}",
+            "stt_model_size": stt_choice.model,
+            "stt_model_reason": stt_choice.reason,
+            "transcript": transcript,
+            "segment_count": len(transcriber.segments),
+            "created_at": datetime.now().isoformat()
+        })
+        # 녹음하는 동안 이미 전사를 마친 작업이므로 대기열 크기 제한 없이 요약 단계에 등록
+        scheduler.submit(
+            task_id,
+            lambda: process_audio_task(task_id),
+            priority=size_priority(file_size),
+            force=True,
+            needs_stt=False
+        )
+        completed = True
+        await send_event("completed", {"task_id": task_id, "transcript": transcript})
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        print(f"Live transcription error: {e}")
+        try:
+            await send_event("error", {"message": f"실시간 전사 중 오류가 발생했습니다: {str(e)}"})
+        except (RuntimeError, WebSocketDisconnect):
+            pass
+    finally:
+        live_sessions.discard(task_id)
+        if not completed:
+            for path in (pcm_path, wav_path, segments_path):
+                if os.path.exists(path):
+                    os.remove(path)
+        try:
+            await websocket.close()
+        except RuntimeError:
+            pass  # 클라이언트가 먼저 연결을 끊은 경우
+
 @app.websocket("/ws/{task_id}")
 async def websocket_endpoint(websocket: WebSocket, task_id: str):
+    """
+    작업 상태 실시간 전송
+    
+    연결 직후 전체 상태를 "snapshot" 이벤트로 한 번 보내고, 이후에는 변경분만 보냅니다
+    (status, progress, transcript_delta, summary_delta, queue).
+    이 프로세스에서 실행 중인 작업은 이벤트 버스를 구독하여 변경 즉시 전달하고,
+    다른 워커에서 실행 중인 작업은 저장소를 주기적으로 읽어 변경분을 계산합니다.
+    """
     await websocket.accept()
     
     try:
         while True:
-            if task_id in processing_tasks:
-                task = processing_tasks[task_id]
-                await websocket.send_json({
-                    "task_id": task_id,
-                    "status": task["status"],
-                    "progress": task["progress"],
-                    "message": task["message"],
-                    "transcript": task.get("transcript")
-                })
-                
-                if task["status"] in ["completed", "failed"]:
-                    break
+            if task_id in running_tasks:
+                await _stream_task_events(websocket, task_id)
+                break
             
-            await asyncio.sleep(1)
+            # 아직 시작 전이거나 다른 워커가 처리 중인 작업
+            finished = await _poll_task_changes(websocket, task_id)
+            if finished:
+                break
+    except WebSocketDisconnect:
+        pass
     except Exception as e:
         print(f"WebSocket error: {e}")
     finally:
-        await websocket.close()
+        try:
+            await websocket.close()
+        except RuntimeError:
+            pass  # 클라이언트가 먼저 연결을 끊은 경우
+
+def _task_snapshot(task_id: str, task: dict) -> dict:
+    scheduler = app.state.scheduler
+    estimated_start = scheduler.estimated_start(task_id)
+    snapshot = {"task_id": task_id, "type": "snapshot"}
+    for name in SNAPSHOT_FIELDS:
+        snapshot[name] = task.get(name)
+    snapshot["queue_position"] = scheduler.queue_position(task_id)
+    snapshot["estimated_start_at"] = estimated_start.isoformat() if estimated_start else None
+    return snapshot
+
+async def _stream_task_events(websocket: WebSocket, task_id: str):
+    """이벤트 버스 구독 (구독과 스냅샷 사이에 await가 없어 놓치는 이벤트가 없음)"""
+    with app.state.event_bus.subscribe(task_id) as events:
+        await websocket.send_json(_task_snapshot(task_id, running_tasks[task_id]))
+        while True:
+            event = await events.get()
+            if event["type"] == RESYNC_EVENT:
+                # 클라이언트가 늦어 이벤트를 버린 경우: 남은 변경분은 현재 상태에 이미 반영되어 있으므로
+                # 버리고(await 없이) 스냅샷을 다시 보냄
+                drain(events)
+                event = _task_snapshot(task_id, running_tasks.get(task_id) or await app.state.task_store.get(task_id) or {})
+            await websocket.send_json(event)
+            if event.get("status") in TERMINAL_STATUSES:
+                return
+
+async def _poll_task_changes(websocket: WebSocket, task_id: str) -> bool:
+    """
+    저장소를 1초마다 읽어 변경분 전송
+    
+    Returns:
+        작업이 끝났으면 True, 이 프로세스에서 실행이 시작되어 구독으로 전환해야 하면 False
+    """
+    sent = None
+    while task_id not in running_tasks:
+        task = await app.state.task_store.get(task_id)
+        if task is not None:
+            if sent is None:
+                sent = _task_snapshot(task_id, task)
+                await websocket.send_json(sent)
+            else:
+                for event_type, payload in _diff_events(sent, task):
+                    await websocket.send_json({"task_id": task_id, "type": event_type, **payload})
+                sent.update({name: task.get(name) for name in SNAPSHOT_FIELDS})
+            
+            if task["status"] in TERMINAL_STATUSES:
+                return True
+        
+        await asyncio.sleep(1)
+    return False
+
+def _diff_events(previous: dict, fields: dict) -> List[tuple]:
+    """이전 상태와 새 값을 비교하여 보낼 (이벤트 종류, 내용) 목록 생성"""
+    events = []
+    changes = {}
+    for name, value in fields.items():
+        old = previous.get(name)
+        if value == old or name not in SNAPSHOT_FIELDS:
+            continue
+        # 텍스트가 뒤에 이어 붙은 경우에는 추가된 부분만 전송
+        event_type = TEXT_DELTA_EVENTS.get(name)
+        if event_type and value and value.startswith(old or ""):
+            events.append((event_type, {"text": value[len(old or ""):]}))
+        else:
+            changes[name] = value
+    
+    if changes:
+        events.insert(0, ("status" if "status" in changes else "progress", changes))
+    return events
+
+def _publish_task_changes(task_id: str, task: dict, fields: dict):
+    """변경된 필드를 구독 중인 WebSocket에 이벤트로 전달 (구독자가 없으면 아무 일도 하지 않음)"""
+    event_bus = app.state.event_bus
+    if not event_bus.has_subscribers(task_id):
+        return
+    for event_type, payload in _diff_events(task, fields):
+        event_bus.publish(task_id, event_type, **payload)
+
+def publish_queue_positions(waiting: Dict[str, List[str]]):
+    """대기 순서가 바뀌면 대기 중인 작업의 구독자에게 새 순번 전달"""
+    event_bus = app.state.event_bus
+    scheduler = app.state.scheduler
+    for task_ids in waiting.values():
+        for task_id in task_ids:
+            if event_bus.has_subscribers(task_id):
+                estimated_start = scheduler.estimated_start(task_id)
+                event_bus.publish(
+                    task_id, "queue",
+                    queue_position=scheduler.queue_position(task_id),
+                    estimated_start_at=estimated_start.isoformat() if estimated_start else None
+                )
+
+async def update_task(task_id: str, task: dict, **fields):
+    """작업 상태 변경 (즉시 기록)"""
+    _publish_task_changes(task_id, task, fields)
+    task.update(fields)
+    await app.state.task_store.update(task_id, **fields)
+
+async def update_task_progress(task_id: str, task: dict, **fields):
+    """진행률 등 자주 바뀌는 값 변경 (모아서 기록)"""
+    _publish_task_changes(task_id, task, fields)
+    task.update(fields)
+    await app.state.task_store.update_progress(task_id, **fields)
+
+def stage_progress(task_id: str, task: dict, start: int, end: int):
+    """단계 진행률(0~1)을 전체 진행률의 [start, end] 구간으로 바꿔 기록하는 콜백 (뒤로 가지 않음)"""
+    async def on_progress(fraction: float, message: str):
+        progress = max(task["progress"], start + int((end - start) * fraction))
+        await update_task_progress(task_id, task, progress=progress, message=message)
+    return on_progress
 
 async def process_audio_task(task_id: str):
+    task_store = app.state.task_store
+    task = {}
+    incremental = None
     try:
-        task = processing_tasks[task_id]
+        task = await task_store.get(task_id)
+        running_tasks[task_id] = task
         processor = app.state.audio_processor
+        scheduler = app.state.scheduler
+        processing_type = ProcessingType(task["processing_type"])
+        usage = {}
+        llm_choice = None
         
-        # 업로드 완료 상태 표시
-        task["status"] = "uploading"
-        task["progress"] = 10
-        task["message"] = "파일 업로드 완료, 처리 준비 중..."
-        await asyncio.sleep(0.5)  # WebSocket이 상태를 전달할 시간 제공
-        
-        # STT 처리 시작
-        task["status"] = "transcribing"
-        task["progress"] = 20
-        task["message"] = "음성을 텍스트로 변환 중..."
-        await asyncio.sleep(0.5)  # WebSocket이 상태를 전달할 시간 제공
-        
-        # STT 처리 중 진행률 업데이트
-        for progress in range(25, 50, 5):
-            task["progress"] = progress
-            task["message"] = f"음성 인식 진행 중... ({progress}%)"
-            await asyncio.sleep(0.3)
+        def choose_llm_model():
+            # 요약 대기열 길이와 품질 힌트로 요약 모델 선택 (사용자가 지정했으면 그대로)
+            return processor.choose_llm_model(
+                scheduler.queue_depth("llm"),
+                task.get("quality"),
+                requested=task.get("requested_llm_model")
+            )
         
-        transcript = await processor.transcribe_audio(task["file_path"])
-        
-        # STT 완료
-        task["progress"] = 50
-        task["message"] = "음성 인식 완료!"
-        task["transcript"] = transcript
-        await asyncio.sleep(0.5)
-        
-        # AI 요약 처리 시작
-        task["status"] = "summarizing"
-        task["progress"] = 55
-        task["message"] = "AI로 요약 생성 중..."
-        await asyncio.sleep(0.5)
+        # 재시작 후 복구된 작업이 이미 전사를 마쳤다면 STT 생략
+        transcript = task.get("transcript")
+        if not transcript:
+            stt_engine = task.get("stt_engine") or processor.default_stt_engine
+            
+            async def record_stt_choice(choice):
+                print(f"Task {task_id}: STT model {stt_engine} {choice.model} ({choice.reason})")
+                await update_task(
+                    task_id, task,
+                    stt_model=f"{stt_engine} {choice.model}",
+                    stt_model_size=choice.model,
+                    stt_model_reason=choice.reason
+                )
+            
+            # 오디오 길이는 디코딩하지 않고 헤더로 확인하고, 같은 오디오의 전사가 캐시에 있으면
+            # 대기열 길이에 따른 모델 선택이나 STT 슬롯 대기 없이 바로 사용
+            duration = await processor.audio_duration(task["file_path"])
+            cached = await processor.cached_transcript(
+                task["file_path"],
+                duration,
+                audio_hash=task.get("audio_sha256"),
+                quality=task.get("quality"),
+                stt_engine=stt_engine
+            )
+            if cached is not None:
+                scheduler.skip_stt(task_id)
+                stt_choice, result = cached
+                await record_stt_choice(stt_choice)
+            else:
+                # STT 실행 슬롯 대기 (짧은 파일 우선, 동시 실행 수 제한)
+                async with scheduler.stage("stt", task_id) as stt_slot:
+                    await update_task(task_id, task, status="transcribing", progress=10, message="음성을 텍스트로 변환 중...")
+                    
+                    # 오디오 길이, 대기열 길이, 품질 힌트로 STT 모델 크기 선택
+                    stt_choice = processor.choose_stt_model(duration, scheduler.queue_depth("stt"), task.get("quality"))
+                    await record_stt_choice(stt_choice)
+                    
+                    # 전사가 앞에서부터 확정되는 대로 청크별 부분 요약을 시작 (긴 녹음에서 STT와 요약이 겹침)
+                    # 부분 요약 요청마다 요약 단계 슬롯을 잠깐씩 잡으므로 다른 작업의 요약을 오래 막지 않음
+                    if config.SUMMARY_OVERLAP:
+                        llm_choice = choose_llm_model()
+                        incremental = processor.start_incremental_summary(
+                            processing_type,
+                            llm_choice.model,
+                            usage,
+                            slot=lambda: scheduler.stage("llm", task_id, record_duration=False)
+                        )
+                    
+                    # 디코딩한 오디오 길이 / 전체 길이로 실제 진행률 계산 (10% ~ 50%)
+                    result = await processor.transcribe_audio_segments(
+                        task["file_path"],
+                        audio_hash=task.get("audio_sha256"),
+                        on_progress=stage_progress(task_id, task, 10, 50),
+                        stt_engine=stt_engine,
+                        model_size=stt_choice.model,
+                        on_partial=incremental.feed if incremental is not None else None,
+                        # 30초 이하 오디오는 배치 대기열로 넘어가면 슬롯을 반납 (다른 짧은 오디오가 같은 배치에 합류)
+                        release_slot=stt_slot.release
+                    )
+            
+            transcript = result["text"]
+            # 세그먼트는 구간 조회용으로 열 단위 파일에 저장 (전사 텍스트보다 먼저 기록해 재개 시에도 존재)
+            with metrics.WRITE_SECONDS.time(kind="segments"):
+                await asyncio.to_thread(
+                    segment_store.save_segments,
+                    segment_store.segments_path("results", task_id),
+                    result["segments"]
+                )
+            
+            # STT 완료
+            await update_task(
+                task_id, task,
+                progress=50,
+                message="음성 인식 완료!",
+                transcript=transcript,
+                segment_count=len(result["segments"])
+            )
         
-        # AI 요약 처리 중 진행률 업데이트
-        for progress in range(60, 90, 5):
-            task["progress"] = progress
-            task["message"] = f"AI 요약 생성 중... ({progress}%)"
-            await asyncio.sleep(0.3)
+        if incremental is not None:
+            # 전사 중에 보낸 부분 요약은 요약 단계 슬롯을 따로 잡으므로 먼저 끝난 뒤 슬롯을 기다림
+            await incremental.drain()
         
-        summary = await processor.generate_summary(transcript, task["processing_type"])
+        # 요약 실행 슬롯 대기
+        async with scheduler.stage("llm", task_id):
+            if llm_choice is None:
+                llm_choice = choose_llm_model()
+            print(f"Task {task_id}: summary model {llm_choice.model} ({llm_choice.reason})")
+            await update_task(
+                task_id, task,
+                status="summarizing",
+                progress=55,
+                message="AI로 요약 생성 중...",
+                partial_summary="",
+                llm_model=llm_choice.model,
+                llm_model_reason=llm_choice.reason,
+                prompt_version=processor.ollama_service.prompt_version
+            )
+            
+            async def on_summary_chunk(chunk: str, token_count: int):
+                await update_task_progress(task_id, task, partial_summary=task["partial_summary"] + chunk)
+            
+            # 생성된 토큰 수로 실제 진행률 계산 (55% ~ 95%)
+            summary = await processor.generate_summary(
+                transcript,
+                processing_type,
+                on_chunk=on_summary_chunk,
+                on_progress=stage_progress(task_id, task, 55, 95),
+                llm_model=llm_choice.model,
+                stt_engine=task.get("stt_engine"),
+                stt_model_size=task.get("stt_model_size"),
+                usage=usage,
+                incremental=incremental
+            )
+            if usage:
+                print(
+                    f"Task {task_id}: prompt {usage['prompt_tokens']} tokens evaluated in "
+                    f"{usage['prompt_eval_seconds']:.2f}s, ~{usage['cached_prompt_tokens']} cached "
+                    f"(saved ~{usage['prompt_eval_saved_seconds']:.2f}s)"
+                )
         
         # 결과 파일 저장
-        task["progress"] = 95
-        task["message"] = "결과 파일 저장 중..."
-        await asyncio.sleep(0.2)
-        
         result_path = f"results/{task_id}.md"
-        with open(result_path, "w", encoding="utf-8") as f:
-            f.write(summary)
+        with metrics.WRITE_SECONDS.time(kind="summary"):
+            with open(result_path, "w", encoding="utf-8") as f:
+                f.write(summary)
         
-        # 완료
-        task["status"] = "completed"
-        task["progress"] = 100
-        task["message"] = "처리 완료!"
+        # 완료 (공통 지시문의 KV 캐시 재사용으로 아낀 프롬프트 처리 시간도 함께 기록)
+        saved = usage.get("prompt_eval_saved_seconds")
+        await update_task(
+            task_id, task,
+            status="completed",
+            progress=100,
+            message="처리 완료!",
+            prompt_eval_saved_seconds=round(saved, 3) if saved is not None else None
+        )
+        metrics.JOBS.inc(status="completed")
         
     except Exception as e:
-        processing_tasks[task_id]["status"] = "failed"
-        processing_tasks[task_id]["progress"] = 0
-        processing_tasks[task_id]["message"] = f"처리 중 오류 발생: {str(e)}"
         print(f"Processing error for task {task_id}: {e}")
+        message = f"처리 중 오류 발생: {str(e)}"
         
         # 에러 발생 시 좀 더 구체적인 정보 제공
         if "ffmpeg" in str(e).lower():
-            processing_tasks[task_id]["message"] = "FFmpeg 오류: 음성 파일 처리 중 문제가 발생했습니다. 다시 시도해주세요."
+            message = "FFmpeg 오류: 음성 파일 처리 중 문제가 발생했습니다. 다시 시도해주세요."
         elif "whisper" in str(e).lower() or "model" in str(e).lower():
-            processing_tasks[task_id]["message"] = "음성 인식 모델 오류: 오디오 파일을 확인하고 다시 시도해주세요."
+            message = "음성 인식 모델 오류: 오디오 파일을 확인하고 다시 시도해주세요."
         elif "ollama" in str(e).lower():
-            processing_tasks[task_id]["message"] = "AI 요약 생성 오류: Ollama 서비스를 확인하고 다시 시도해주세요."
+            message = "AI 요약 생성 오류: Ollama 서비스를 확인하고 다시 시도해주세요."
+        
+        await update_task(task_id, task, status="failed", progress=0, message=message)
+        metrics.JOBS.inc(status="failed")
+    finally:
+        if incremental is not None:
+            incremental.cancel()
+        running_tasks.pop(task_id, None)
+
+async def task_maintenance_loop():
+    """
+    작업 저장소 주기 관리
+    
+    - 다른 워커가 죽었거나 서버가 재시작되어 중단된 작업을 가져와 다시 실행
+    - 보관 기간(TTL)이 지난 완료/실패 작업과 그 파일 삭제
+    """
+    task_store = app.state.task_store
+    while True:
+        try:
+            for task in await task_store.claim_interrupted(config.TASK_LEASE_SECONDS):
+                task_id = task["task_id"]
+                if not task.get("transcript") and not os.path.exists(task.get("file_path", "")):
+                    await task_store.update(task_id, status="failed", progress=0, message="업로드 파일이 없어 작업을 재개할 수 없습니다.")
+                    continue
+                
+                print(f"Resuming interrupted task {task_id} (status: {task['status']})")
+                await task_store.update(task_id, status="pending", message="서버 재시작 후 처리 재개 대기 중")
+                # 이미 접수된 작업이므로 대기열 크기 제한 없이 다시 등록
+                app.state.scheduler.submit(
+                    task_id,
+                    lambda task_id=task_id: process_audio_task(task_id),
+                    priority=size_priority(task.get("file_size", 0)),
+                    force=True,
+                    needs_stt=not task.get("transcript")
+                )
+            
+            for task in await task_store.purge_expired(config.TASK_TTL_SECONDS):
+                file_path = task.get("file_path")
+                pcm_path = audio_ingest.pcm_path_for(file_path) if file_path else None
+                segments_path = segment_store.segments_path("results", task["task_id"])
+                for path in (file_path, pcm_path, segments_path, f"results/{task['task_id']}.md"):
+                    if path and os.path.exists(path):
+                        os.remove(path)
+        except Exception as e:
+            print(f"Task maintenance error: {e}")
+        
+        await asyncio.sleep(config.TASK_LEASE_SECONDS / 2)
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,11 +1,16 @@
 from pydantic import BaseModel
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 
 class ProcessingType(str, Enum):
     LECTURE = "lecture"
     MEETING = "meeting"
 
+class QualityHint(str, Enum):
+    FAST = "fast"  # 작은 모델로 빠르게
+    BALANCED = "balanced"  # 기본 (부하에 따라 자동 조정)
+    ACCURATE = "accurate"  # 큰 모델 우선
+
 class ProcessingStatus(str, Enum):
     PENDING = "pending"
     UPLOADING = "uploading"
@@ -18,6 +23,11 @@ class ProcessingRequest(BaseModel):
     type: ProcessingType
     filename: str
 
+class ResummarizeRequest(BaseModel):
+    processing_type: Optional[ProcessingType] = None  # 없으면 원래 작업과 같은 유형
+    llm_model: Optional[str] = None  # 없으면 모델 선택 정책에 따름
+    quality: Optional[QualityHint] = None  # 없으면 원래 작업의 품질 힌트
+
 class ProcessingResponse(BaseModel):
     task_id: str
     status: ProcessingStatus
@@ -29,7 +39,30 @@ class ProcessingStatusResponse(BaseModel):
     progress: int
     message: str
     result_url: Optional[str] = None
-    transcript: Optional[str] = None  # STT 결과 텍스트
+    transcript: Optional[str] = None  # STT 결과 텍스트 (include_transcript=true일 때만)
+    segment_count: Optional[int] = None  # 전사 세그먼트 수 (구간 조회: /transcript/{task_id}/segments)
+    stt_model: Optional[str] = None  # 이 작업에 선택된 STT 엔진/모델 크기
+    llm_model: Optional[str] = None  # 이 작업에 선택된 요약 모델
+    prompt_version: Optional[str] = None  # 요약에 사용한 프롬프트 템플릿 버전
+    source_task_id: Optional[str] = None  # 다른 작업의 전사로 다시 요약한 작업이면 원래 작업 ID
+    prompt_eval_saved_seconds: Optional[float] = None  # 공통 지시문 캐시 재사용으로 아낀 프롬프트 처리 시간 (추정, 초)
+    partial_summary: Optional[str] = None  # 생성 중인 요약 (스트리밍)
+    queue_position: Optional[int] = None  # 대기열 순번 (1부터, 실행 중이면 None)
+    estimated_start_at: Optional[str] = None  # 예상 시작 시각 (ISO 8601)
+
+class TranscriptSegment(BaseModel):
+    index: int
+    start: float  # 초
+    end: float
+    text: str
+    confidence: Optional[float] = None  # 0~1 (엔진이 제공하지 않으면 None)
+
+class TranscriptSegmentsResponse(BaseModel):
+    task_id: str
+    total: int  # 전체 세그먼트 수
+    duration: float  # 마지막 세그먼트가 끝나는 시각 (초)
+    next_offset: Optional[int] = None  # 다음 페이지의 offset (마지막 페이지면 None)
+    segments: List[TranscriptSegment]
 
 class ResultResponse(BaseModel):
     task_id: str
@@ -0,0 +1,179 @@
+import functools
+import os
+import shutil
+import subprocess
+import tempfile
+import wave
+from typing import Optional
+
+import numpy as np
+
+from . import metrics, vad
+
+# 디코딩한 PCM 파일 확장자 (업로드 파일 옆에 저장, 헤더 없는 16kHz mono float32 little-endian)
+PCM_SUFFIX = ".pcm.f32"
+PCM_DTYPE = np.dtype("<f4")
+# WAV 직접 변환 시 한 번에 읽는 프레임 수
+WAV_BLOCK_FRAMES = vad.SAMPLE_RATE * 60
+
+
+@functools.lru_cache(maxsize=None)
+def ffmpeg_path() -> Optional[str]:
+    """FFmpeg 실행파일 경로 (프로세스당 한 번만 찾음)"""
+    # 일반적인 FFmpeg 설치 경로들
+    common_paths = [
+        "/opt/homebrew/bin/ffmpeg",     # Apple Silicon Mac Homebrew
+        "/usr/local/bin/ffmpeg",        # Intel Mac Homebrew
+        "/usr/bin/ffmpeg",              # Linux 시스템 경로
+        shutil.which("ffmpeg")          # PATH에서 찾기
+    ]
+
+    for path in common_paths:
+        if path and os.path.exists(path) and os.path.isfile(path):
+            print(f"Found FFmpeg at: {path}")
+            return path
+
+    print("FFmpeg not found in common paths")
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def ffprobe_path() -> Optional[str]:
+    """FFprobe 실행파일 경로 (FFmpeg와 같은 디렉터리 우선, 프로세스당 한 번만 찾음)"""
+    ffmpeg = ffmpeg_path()
+    if ffmpeg is not None:
+        path = os.path.join(os.path.dirname(ffmpeg), "ffprobe")
+        if os.path.isfile(path):
+            return path
+    return shutil.which("ffprobe")
+
+
+def probe_duration(audio_file_path: str) -> Optional[float]:
+    """
+    디코딩하지 않고 오디오 길이 확인 (초, 알 수 없으면 None)
+
+    이미 디코딩한 PCM이 있으면 그 크기로, WAV는 헤더로, 그 외 형식은 ffprobe로 컨테이너 헤더를 읽습니다.
+    """
+    pcm_path = pcm_path_for(audio_file_path)
+    if os.path.exists(pcm_path):
+        return pcm_duration(pcm_path)
+    try:
+        with wave.open(audio_file_path, "rb") as wav:
+            return wav.getnframes() / wav.getframerate()
+    except (wave.Error, EOFError, ZeroDivisionError):
+        pass
+
+    path = ffprobe_path()
+    if path is None:
+        return None
+    command = [
+        path, "-v", "error", "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1", audio_file_path
+    ]
+    try:
+        output = subprocess.run(command, capture_output=True, check=True, timeout=30).stdout
+        return float(output.decode().strip())
+    except (subprocess.SubprocessError, ValueError, OSError):
+        return None
+
+
+def pcm_path_for(audio_file_path: str) -> str:
+    """업로드 파일의 디코딩된 PCM 파일 경로"""
+    return audio_file_path + PCM_SUFFIX
+
+
+def ensure_pcm(audio_file_path: str) -> str:
+    """
+    업로드 파일을 16kHz mono float32 PCM으로 한 번만 디코딩하여 업로드 파일 옆에 저장
+
+    이미 디코딩된 파일이 있으면 그대로 사용하므로 재시도, 긴 오디오 청크 처리, 재전사는
+    다시 디코딩하지 않습니다. 파일은 임시 이름으로 쓴 뒤 교체하므로 존재하면 항상 완전합니다.
+
+    Returns:
+        PCM 파일 경로 (open_pcm으로 메모리 맵)
+    """
+    pcm_path = pcm_path_for(audio_file_path)
+    if not os.path.exists(pcm_path):
+        with metrics.DECODE_SECONDS.time():
+            decode_to_pcm(audio_file_path, pcm_path)
+    return pcm_path
+
+
+def decode_to_pcm(audio_file_path: str, pcm_path: str):
+    """
+    오디오 파일을 16kHz mono float32 PCM 파일로 디코딩
+
+    이미 16kHz mono 16bit WAV이면 ffmpeg 없이 바로 변환하고,
+    그 외 형식은 ffmpeg가 PCM 파일을 직접 쓰게 하여 디코딩 결과를 메모리에 올리지 않습니다.
+    """
+    if not os.path.exists(audio_file_path):
+        raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
+
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(pcm_path) or ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        if not _convert_wav(audio_file_path, temp_path):
+            _decode_with_ffmpeg(audio_file_path, temp_path)
+        os.replace(temp_path, pcm_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def open_pcm(pcm_path: str) -> np.ndarray:
+    """PCM 파일을 읽기 전용 메모리 맵으로 열기 (구간 슬라이스는 복사 없이 읽음)"""
+    if os.path.getsize(pcm_path) == 0:
+        return np.zeros(0, dtype=PCM_DTYPE)
+    return np.memmap(pcm_path, dtype=PCM_DTYPE, mode="r")
+
+
+def pcm_duration(pcm_path: str) -> float:
+    """PCM 파일의 오디오 길이 (초, 파일을 읽지 않음)"""
+    return os.path.getsize(pcm_path) / PCM_DTYPE.itemsize / vad.SAMPLE_RATE
+
+
+def write_wav(pcm_path: str, wav_path: str):
+    """PCM 파일을 16kHz mono 16bit WAV로 저장 (실시간 녹음 원본 보관용, 블록 단위 변환)"""
+    audio = open_pcm(pcm_path)
+    with wave.open(wav_path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(vad.SAMPLE_RATE)
+        for start in range(0, len(audio), WAV_BLOCK_FRAMES):
+            block = np.clip(audio[start:start + WAV_BLOCK_FRAMES], -1.0, 1.0)
+            wav.writeframes((block * 32767).astype("<i2").tobytes())
+
+
+def _convert_wav(audio_file_path: str, pcm_path: str) -> bool:
+    """16kHz mono 16bit PCM WAV이면 블록 단위로 float32 변환 (해당하지 않으면 False)"""
+    try:
+        with wave.open(audio_file_path, "rb") as wav:
+            if (wav.getnchannels(), wav.getframerate(), wav.getsampwidth()) != (1, vad.SAMPLE_RATE, 2):
+                return False
+            with open(pcm_path, "wb") as out:
+                while True:
+                    frames = wav.readframes(WAV_BLOCK_FRAMES)
+                    if not frames:
+                        break
+                    samples = np.frombuffer(frames, dtype="<i2") / np.float32(32768.0)
+                    out.write(samples.astype(PCM_DTYPE).tobytes())
+    except (wave.Error, EOFError):
+        # WAV가 아니거나 wave 모듈이 읽지 못하는 형식(float WAV 등)은 ffmpeg로 처리
+        return False
+    print(f"Converted 16kHz mono WAV without ffmpeg: {audio_file_path}")
+    return True
+
+
+def _decode_with_ffmpeg(audio_file_path: str, pcm_path: str):
+    path = ffmpeg_path()
+    if path is None:
+        raise Exception("FFmpeg를 찾을 수 없습니다. brew install ffmpeg로 설치해주세요.")
+
+    command = [
+        path, "-nostdin", "-threads", "0", "-y", "-i", audio_file_path,
+        "-f", "f32le", "-ac", "1", "-acodec", "pcm_f32le", "-ar", str(vad.SAMPLE_RATE), pcm_path
+    ]
+    try:
+        subprocess.run(command, capture_output=True, check=True)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to load audio with ffmpeg: {e.stderr.decode(errors='replace')}") from e
@@ -0,0 +1,160 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from . import metrics
+
+
+def make_cache_key(*parts) -> str:
+    """키 구성 요소들로 content-addressed 캐시 키(sha256) 생성"""
+    joined = "\0".join(str(part) for part in parts)
+    return hashlib.sha256(joined.encode("utf-8")).hexdigest()
+
+
+def sha256_text(text: str) -> str:
+    """텍스트의 sha256"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def sha256_file(file_path: str, block_size: int = 1024 * 1024) -> str:
+    """파일 내용의 sha256 (블록 단위로 읽어 메모리 사용 일정)"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ContentCache:
+    def __init__(self, cache_dir: str, max_bytes: int):
+        """
+        디스크 기반 content-addressed 캐시 (크기 제한 LRU)
+
+        값은 cache_dir/<namespace>/<key 앞 2글자>/<key> 파일로 저장되고,
+        파일 수정 시각을 마지막 사용 시각으로 사용하여 재시작 후에도 LRU 순서를 복원합니다.
+
+        Args:
+            cache_dir: 캐시 디렉토리
+            max_bytes: 전체 캐시 크기 상한 (초과 시 오래 사용하지 않은 항목부터 삭제)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], int]" = OrderedDict()  # (namespace, key) -> 크기
+        self._total_bytes = 0
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        self._load_index()
+
+    def _path(self, namespace: str, key: str) -> str:
+        return os.path.join(self.cache_dir, namespace, key[:2], key)
+
+    def _load_index(self):
+        """디스크의 캐시 파일을 스캔하여 LRU 인덱스 복원"""
+        found = []
+        if os.path.isdir(self.cache_dir):
+            for namespace in os.listdir(self.cache_dir):
+                namespace_dir = os.path.join(self.cache_dir, namespace)
+                if not os.path.isdir(namespace_dir):
+                    continue
+                for root, _, files in os.walk(namespace_dir):
+                    for name in files:
+                        if name.endswith(".tmp"):
+                            continue
+                        stat = os.stat(os.path.join(root, name))
+                        found.append((stat.st_mtime, namespace, name, stat.st_size))
+
+        for _, namespace, key, size in sorted(found):
+            self._entries[(namespace, key)] = size
+            self._total_bytes += size
+
+        if found:
+            print(f"Content cache loaded: {len(found)} entries, {self._total_bytes:,} bytes")
+        self._evict()
+
+    def contains(self, namespace: str, key: str) -> bool:
+        """캐시에 항목이 있는지 (적중/실패 통계와 LRU 순서는 바꾸지 않음)"""
+        with self._lock:
+            return (namespace, key) in self._entries
+
+    def get(self, namespace: str, key: str) -> Optional[str]:
+        """캐시 조회 (없으면 None)"""
+        path = self._path(namespace, key)
+        with self._lock:
+            if (namespace, key) not in self._entries:
+                self._misses[namespace] = self._misses.get(namespace, 0) + 1
+                metrics.CACHE_MISSES.inc(namespace=namespace)
+                return None
+            self._entries.move_to_end((namespace, key))
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = f.read()
+            os.utime(path)  # LRU 순서 보존용
+        except FileNotFoundError:
+            with self._lock:
+                size = self._entries.pop((namespace, key), 0)
+                self._total_bytes -= size
+                self._misses[namespace] = self._misses.get(namespace, 0) + 1
+            metrics.CACHE_MISSES.inc(namespace=namespace)
+            return None
+
+        with self._lock:
+            self._hits[namespace] = self._hits.get(namespace, 0) + 1
+        metrics.CACHE_HITS.inc(namespace=namespace)
+        return value
+
+    def put(self, namespace: str, key: str, value: str):
+        """캐시 저장 (원자적 쓰기 후 크기 상한 초과분 삭제)"""
+        path = self._path(namespace, key)
+        data = value.encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._total_bytes -= self._entries.pop((namespace, key), 0)
+            self._entries[(namespace, key)] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def _evict(self):
+        """크기 상한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제"""
+        while self._total_bytes > self.max_bytes and self._entries:
+            (namespace, key), size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(self._path(namespace, key))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> dict:
+        """캐시 사용량과 네임스페이스별 적중/실패 횟수"""
+        with self._lock:
+            namespaces = set(self._hits) | set(self._misses) | {ns for ns, _ in self._entries}
+            by_namespace = {}
+            for namespace in sorted(namespaces):
+                hits = self._hits.get(namespace, 0)
+                misses = self._misses.get(namespace, 0)
+                by_namespace[namespace] = {
+                    "entries": sum(1 for ns, _ in self._entries if ns == namespace),
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None
+                }
+            return {
+                "entries": len(self._entries),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "namespaces": by_namespace
+            }
@@ -0,0 +1,72 @@
+import asyncio
+from contextlib import contextmanager
+from typing import Dict, Iterator, Set
+
+# 구독자 하나에 쌓아 둘 수 있는 이벤트 수 (읽지 않는 WebSocket 때문에 메모리가 늘지 않도록)
+MAX_QUEUED_EVENTS = 256
+# 큐가 가득 차 이벤트를 버렸을 때 넣는 이벤트 (구독자는 남은 이벤트를 버리고 스냅샷을 다시 보내야 함)
+RESYNC_EVENT = "resync"
+
+
+class TaskEventBus:
+    """
+    작업별 이벤트 pub/sub (프로세스 내)
+
+    파이프라인 단계가 상태 변화를 publish하면 해당 작업을 구독 중인 WebSocket마다
+    이벤트가 큐로 전달됩니다. 구독자가 없으면 publish는 아무 일도 하지 않고,
+    구독자는 큐를 기다리는 동안 CPU를 쓰지 않습니다.
+
+    이벤트 형식 (모두 "task_id", "type" 포함):
+        status:           상태가 바뀔 때, 함께 바뀐 필드 포함 ({"status", "progress", "message", ...})
+        progress:         상태 외 필드만 바뀔 때 ({"progress", "message", ...})
+        transcript_delta: {"text"} - 전사 텍스트에 이어 붙일 내용
+        summary_delta:    {"text"} - 생성 중인 요약에 이어 붙일 내용
+        queue:            {"queue_position", "estimated_start_at"}
+        resync:           {} - 구독자가 늦어 이벤트를 버림 (현재 상태 스냅샷으로 다시 맞춰야 함)
+    """
+
+    def __init__(self, max_queued_events: int = MAX_QUEUED_EVENTS):
+        self.max_queued_events = max_queued_events
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    def has_subscribers(self, task_id: str) -> bool:
+        return bool(self._subscribers.get(task_id))
+
+    def publish(self, task_id: str, event_type: str, **payload):
+        subscribers = self._subscribers.get(task_id)
+        if not subscribers:
+            return
+        event = {"task_id": task_id, "type": event_type, **payload}
+        for queue in subscribers:
+            if queue.full():
+                # 느린 구독자: 밀린 이벤트(토큰 단위 변경분 등)를 버리고 다시 맞추라는 이벤트 하나로 대체
+                drain(queue)
+                queue.put_nowait({"task_id": task_id, "type": RESYNC_EVENT})
+            else:
+                queue.put_nowait(event)
+
+    @contextmanager
+    def subscribe(self, task_id: str) -> Iterator[asyncio.Queue]:
+        """작업 이벤트 구독 (with 블록을 벗어나면 구독 해제)"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queued_events)
+        self._subscribers.setdefault(task_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(task_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[task_id]
+
+    def subscriber_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+def drain(queue: asyncio.Queue) -> int:
+    """큐에 남은 이벤트를 모두 버리고 버린 개수 반환"""
+    dropped = 0
+    while not queue.empty():
+        queue.get_nowait()
+        dropped += 1
+    return dropped
@@ -0,0 +1,99 @@
+import os
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from .. import config
+from . import vad
+from .stt_base import STTService, transcribe_pcm_range
+
+# 워커 프로세스 하나가 모델을 로드했을 때의 대략적인 메모리 사용량 (MB, int8 가중치 + CTranslate2 런타임)
+MODEL_MEMORY_MB = {
+    "tiny": 150,
+    "base": 200,
+    "small": 450,
+    "medium": 1000,
+    "large": 2000,
+    "turbo": 1200,
+    "distil": 1000,
+}
+
+# 워커 프로세스마다 한 번만 로드되는 CTranslate2 모델
+# faster_whisper/CTranslate2는 워커 함수 안에서만 import (API 프로세스에는 로드하지 않음)
+_worker_model = None
+
+
+def _init_worker(model_size: str, num_threads: int, device: str = "cpu", compute_type: str = "int8"):
+    """워커 프로세스 초기화: 프로세스 전용 모델 로드"""
+    global _worker_model
+    from faster_whisper import WhisperModel
+
+    print(f"[worker {os.getpid()}] Loading faster-whisper model: {model_size} ({device}, {compute_type})")
+    # 워커끼리 CPU 코어를 나눠 쓰도록 스레드 수 제한 (워커 안에서는 요청을 하나씩 처리)
+    _worker_model = WhisperModel(
+        model_size,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=num_threads,
+        num_workers=1
+    )
+    print(f"[worker {os.getpid()}] faster-whisper model loaded successfully")
+
+
+def _warm_up_worker() -> int:
+    """워커 프로세스를 띄우고 짧은 무음으로 한 번 추론하여 첫 요청의 지연을 없앰"""
+    segments, _ = _worker_model.transcribe(np.zeros(vad.SAMPLE_RATE, dtype=np.float32), language="en")
+    list(segments)  # 세그먼트는 순회할 때 디코딩됨
+    return os.getpid()
+
+
+def _model_transcribe(audio: np.ndarray, language: str, report: Callable[[float, float], None]) -> List[dict]:
+    """faster-whisper로 인식 (세그먼트가 하나씩 디코딩될 때마다 끝 시각으로 진행률 보고)"""
+    segments, info = _worker_model.transcribe(audio, language=language, task="transcribe")
+    result = []
+    for segment in segments:
+        result.append({"start": segment.start, "end": segment.end, "text": segment.text, "avg_logprob": segment.avg_logprob})
+        report(min(segment.end, info.duration), info.duration)
+    return result
+
+
+def _transcribe_in_worker(
+    pcm_path: str,
+    start: int,
+    end: int,
+    language: str,
+    progress_queue=None,
+    vad_options: Optional[dict] = None
+) -> dict:
+    """워커 프로세스에서 실행되는 음성 인식 (디코딩된 PCM의 [start, end) 샘플 구간)"""
+    return transcribe_pcm_range(pcm_path, start, end, language, progress_queue, vad_options, _model_transcribe)
+
+
+class FasterWhisperService(STTService):
+    """
+    faster-whisper (CTranslate2) 엔진
+
+    같은 Whisper 가중치를 int8로 양자화해 CPU에서 실행하므로 openai-whisper(float32)보다
+    메모리를 적게 쓰고 CPU 전용 서버에서 실시간 대비 처리 속도가 빠릅니다.
+    """
+    engine_name = "faster-whisper"
+    model_memory_mb = MODEL_MEMORY_MB
+    worker_init = staticmethod(_init_worker)
+    worker_warm_up = staticmethod(_warm_up_worker)
+    worker_transcribe = staticmethod(_transcribe_in_worker)
+
+    def __init__(
+        self,
+        model_size: str = config.WHISPER_MODEL_SIZE,
+        num_workers: Optional[int] = None,
+        device: str = config.WHISPER_DEVICE,
+        compute_type: str = config.FASTER_WHISPER_COMPUTE_TYPE
+    ):
+        """
+        faster-whisper 서비스 초기화
+        model_size: tiny, base, small, medium, large-v3 등
+        num_workers: STT 워커 프로세스 수 (기본값: WHISPER_WORKERS 환경 변수)
+        device: cpu 또는 cuda
+        compute_type: int8, int8_float16, float16, float32 (CPU에서는 int8 권장)
+        """
+        super().__init__(model_size, num_workers, device, compute_type)
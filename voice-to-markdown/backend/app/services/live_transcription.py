@@ -0,0 +1,164 @@
+import asyncio
+from typing import Any, AsyncContextManager, Awaitable, Callable, List, Optional
+
+import numpy as np
+
+from . import audio_ingest, vad
+
+# 구간 끝에서 이 시간(초) 안에 끝나는 세그먼트는 뒤에 오는 음성에 따라 바뀔 수 있으므로 확정하지 않음
+STABLE_MARGIN_SECONDS = 1.5
+# 이보다 짧은 미확정 구간은 인식하지 않음 (초)
+MIN_WINDOW_SECONDS = 0.5
+
+# 실시간 전사 이벤트 콜백: (이벤트 타입, 내용)
+LiveEventCallback = Callable[[str, dict], Awaitable[None]]
+
+
+class LiveTranscriber:
+    def __init__(
+        self,
+        stt_service: Any,
+        pcm_path: str,
+        language: str,
+        on_event: LiveEventCallback,
+        step_seconds: float = 1.0,
+        window_seconds: float = 30.0,
+        slot: Optional[Callable[[], AsyncContextManager]] = None
+    ):
+        """
+        녹음 중 들어오는 오디오를 롤링 윈도로 반복 인식하는 실시간 전사기
+
+        받은 오디오는 audio_ingest와 같은 형식(16kHz mono float32)의 PCM 파일 끝에 덧붙이고,
+        새 오디오가 step_seconds 쌓일 때마다 아직 확정되지 않은 구간(최대 window_seconds)을 다시 인식합니다.
+        구간 끝에서 STABLE_MARGIN_SECONDS 이상 떨어진 세그먼트는 확정("final")하고 확정 지점을 옮기며,
+        나머지는 미확정 텍스트("partial")로 보냅니다. 녹음이 끝나면 남은 구간만 인식하면 되므로
+        전사는 녹음 종료 직후 완료됩니다.
+
+        Args:
+            stt_service: transcribe_pcm(pcm_path, start, end, language)를 제공하는 STT 서비스
+            pcm_path: 오디오를 덧붙일 PCM 파일 경로
+            language: 언어 코드
+            on_event: "partial" {"text", "start", "end"}, "final" {"segments"} 이벤트 콜백
+            step_seconds: 재인식 간격 (새로 쌓인 오디오 길이 기준, 초)
+            window_seconds: 한 번에 인식하는 미확정 구간의 최대 길이 (초)
+            slot: 구간을 인식할 때마다 잡을 실행 슬롯 (업로드 작업과 같은 STT 동시 실행 제한, 없으면 제한 없음)
+        """
+        self.stt_service = stt_service
+        self.pcm_path = pcm_path
+        self.language = language
+        self.on_event = on_event
+        self.step_samples = int(step_seconds * vad.SAMPLE_RATE)
+        self.window_samples = int(window_seconds * vad.SAMPLE_RATE)
+        self.slot = slot
+        self.segments: List[dict] = []
+        self.total_samples = 0
+        self._committed = 0  # 확정된 세그먼트가 끝나는 샘플
+        self._transcribed_until = 0  # 마지막으로 인식한 구간의 끝 샘플
+        self._file = open(pcm_path, "wb")
+        self._new_audio = asyncio.Event()
+        self._stopped = False
+        self._lock = asyncio.Lock()
+
+    @property
+    def transcript(self) -> str:
+        """확정된 전사 텍스트"""
+        return " ".join(segment["text"] for segment in self.segments if segment["text"])
+
+    @property
+    def duration(self) -> float:
+        return self.total_samples / vad.SAMPLE_RATE
+
+    def append(self, frame: bytes):
+        """클라이언트가 보낸 16kHz mono 16bit little-endian PCM 조각 추가"""
+        samples = np.frombuffer(frame[:len(frame) - len(frame) % 2], dtype="<i2") / np.float32(32768.0)
+        self._file.write(samples.astype(audio_ingest.PCM_DTYPE).tobytes())
+        # 워커 프로세스가 메모리 맵으로 읽을 수 있도록 바로 기록
+        self._file.flush()
+        self.total_samples += len(samples)
+        if self.total_samples - self._transcribed_until >= self.step_samples:
+            self._new_audio.set()
+
+    async def run(self):
+        """녹음이 끝날 때까지 새 오디오가 쌓이면 미확정 구간 재인식"""
+        while not self._stopped:
+            await self._new_audio.wait()
+            self._new_audio.clear()
+            if self._stopped:
+                break
+            await self._transcribe_pending(final=False)
+
+    async def finish(self) -> List[dict]:
+        """
+        녹음 종료: 남은 구간을 인식해 모든 세그먼트 확정
+
+        Returns:
+            확정된 세그먼트 목록 (녹음 시작 기준 시각)
+        """
+        self._stopped = True
+        self._new_audio.set()
+        self._file.close()
+        await self._transcribe_pending(final=True)
+        return self.segments
+
+    def close(self):
+        """연결이 끊긴 경우 정리 (파일 닫기)"""
+        self._stopped = True
+        self._new_audio.set()
+        if not self._file.closed:
+            self._file.close()
+
+    async def _transcribe_pending(self, final: bool):
+        async with self._lock:
+            start = self._committed
+            end = self.total_samples if final else min(self.total_samples, start + self.window_samples)
+            if end - start < MIN_WINDOW_SECONDS * vad.SAMPLE_RATE and not final:
+                return
+            if end <= start:
+                return
+            self._transcribed_until = end
+
+            if self.slot is None:
+                result = await self.stt_service.transcribe_pcm(self.pcm_path, start, end, self.language)
+            else:
+                async with self.slot():
+                    result = await self.stt_service.transcribe_pcm(self.pcm_path, start, end, self.language)
+            offset = start / vad.SAMPLE_RATE
+            window_end = (end - start) / vad.SAMPLE_RATE
+            window_full = end - start >= self.window_samples
+            segments = [segment for segment in result["segments"] if segment["text"]]
+
+            if final:
+                stable = len(segments)
+            elif window_full:
+                # 구간이 가득 찼으면 마지막 세그먼트만 남기고 확정 (세그먼트가 하나뿐이면 그것도 확정)
+                stable = max(1, len(segments) - 1) if segments else 0
+            else:
+                # 마지막 세그먼트는 이어지는 말에 따라 바뀔 수 있으므로 확정하지 않음
+                stable = 0
+                for index, segment in enumerate(segments[:-1]):
+                    if segment["end"] <= window_end - STABLE_MARGIN_SECONDS:
+                        stable = index + 1
+
+            finalized = [
+                {
+                    "start": round(offset + segment["start"], 2),
+                    "end": round(offset + segment["end"], 2),
+                    "text": segment["text"],
+                    "confidence": segment.get("confidence")
+                }
+                for segment in segments[:stable]
+            ]
+            if finalized:
+                self.segments.extend(finalized)
+                self._committed = max(start, start + int(segments[stable - 1]["end"] * vad.SAMPLE_RATE))
+                await self.on_event("final", {"segments": finalized})
+            if final or (window_full and self._committed == start):
+                # 가득 찬 구간에서 확정 지점이 움직이지 않으면(음성 없음 등) 구간 전체를 건너뜀
+                self._committed = end
+
+            pending = segments[stable:]
+            await self.on_event("partial", {
+                "text": " ".join(segment["text"] for segment in pending),
+                "start": round(offset + pending[0]["start"], 2) if pending else round(self._committed / vad.SAMPLE_RATE, 2),
+                "end": round(end / vad.SAMPLE_RATE, 2)
+            })
@@ -0,0 +1,254 @@
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# 단계 소요 시간 버킷 (초, 짧은 업로드부터 긴 오디오 전사까지)
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+# 실시간 대비 처리 시간 (처리 시간 / 오디오 길이)
+RTF_BUCKETS = (0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 4)
+# 초당 토큰 수
+TOKENS_PER_SECOND_BUCKETS = (1, 2, 5, 10, 20, 40, 80, 160, 320, 640, 1280, 2560)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} 레이블이 맞지 않습니다: {sorted(labels)} (필요: {list(self.label_names)})")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """누적 값 (줄지 않음)"""
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(_Metric):
+    """현재 값 (대기열 길이처럼 수집 시점에 채움)"""
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Histogram(_Metric):
+    """관측값 분포 (누적 버킷, 합계, 개수)"""
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DURATION_BUCKETS
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # 레이블 값 -> [버킷별 개수, 합계, 개수]
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][index] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """with 블록의 실행 시간 기록 (예외로 끝나도 기록)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.label_names, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """
+        Prometheus 텍스트 형식으로 내보낼 지표 모음
+
+        대기열 길이, 캐시 적중률처럼 다른 객체가 가진 값은 수집기(collector)를 등록해 두면
+        /metrics를 조회할 때마다 게이지에 채운 뒤 출력합니다.
+        """
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labels))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DURATION_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def add_collector(self, collector: Callable[[], None]):
+        """조회 직전에 호출할 함수 등록 (게이지 값 갱신용)"""
+        self._collectors.append(collector)
+
+    def remove_collector(self, collector: Callable[[], None]):
+        if collector in self._collectors:
+            self._collectors.remove(collector)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 노출 형식 (text/plain; version=0.0.4)"""
+        for collector in list(self._collectors):
+            try:
+                collector()
+            except Exception as e:
+                print(f"Metrics collector error: {e}")
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# 단계별 소요 시간
+UPLOAD_SECONDS = REGISTRY.histogram("v2m_upload_duration_seconds", "업로드 수신/검증/저장 시간")
+DECODE_SECONDS = REGISTRY.histogram("v2m_decode_duration_seconds", "업로드 파일을 16kHz PCM으로 디코딩하는 시간")
+STT_SECONDS = REGISTRY.histogram("v2m_stt_duration_seconds", "음성 인식 시간 (캐시 적중 제외)", ("engine", "model"))
+STT_RTF = REGISTRY.histogram(
+    "v2m_stt_realtime_factor", "음성 인식 시간 / 오디오 길이", ("engine", "model"), buckets=RTF_BUCKETS
+)
+LLM_SECONDS = REGISTRY.histogram("v2m_llm_duration_seconds", "요약 생성 시간 (캐시 적중 제외)", ("model",))
+WRITE_SECONDS = REGISTRY.histogram("v2m_write_duration_seconds", "전사 세그먼트/요약 결과 파일 저장 시간", ("kind",))
+MODEL_LOAD_SECONDS = REGISTRY.histogram("v2m_model_load_duration_seconds", "STT 모델 로드(워커 시작 + 워밍업) 시간", ("engine", "model"))
+AUDIO_SECONDS = REGISTRY.counter("v2m_stt_audio_seconds_total", "음성 인식한 오디오 길이 합계", ("engine", "model"))
+
+# Ollama 처리량 (응답의 eval_count/eval_duration, prompt_eval_count/prompt_eval_duration 기준)
+OLLAMA_EVAL_TPS = REGISTRY.histogram(
+    "v2m_ollama_eval_tokens_per_second", "요청별 토큰 생성 속도", ("model",), buckets=TOKENS_PER_SECOND_BUCKETS
+)
+OLLAMA_PROMPT_EVAL_TPS = REGISTRY.histogram(
+    "v2m_ollama_prompt_eval_tokens_per_second", "요청별 프롬프트 처리 속도", ("model",), buckets=TOKENS_PER_SECOND_BUCKETS
+)
+OLLAMA_EVAL_TOKENS = REGISTRY.counter("v2m_ollama_eval_tokens_total", "생성한 토큰 수", ("model",))
+OLLAMA_PROMPT_EVAL_TOKENS = REGISTRY.counter("v2m_ollama_prompt_eval_tokens_total", "처리한 프롬프트 토큰 수", ("model",))
+OLLAMA_REQUESTS = REGISTRY.counter("v2m_ollama_requests_total", "Ollama 생성 요청 수", ("model", "outcome"))
+OLLAMA_PROMPT_CACHED_TOKENS = REGISTRY.counter(
+    "v2m_ollama_prompt_cached_tokens_total", "공통 지시문 KV 캐시 재사용으로 평가를 건너뛴 프롬프트 토큰 수 (추정)", ("model",)
+)
+OLLAMA_PROMPT_EVAL_SAVED_SECONDS = REGISTRY.counter(
+    "v2m_ollama_prompt_eval_saved_seconds_total", "공통 지시문 KV 캐시 재사용으로 아낀 프롬프트 처리 시간 (추정)", ("model",)
+)
+
+# 작업/대기열 (조회 시점에 수집)
+JOBS = REGISTRY.counter("v2m_jobs_total", "끝난 작업 수", ("status",))
+QUEUE_DEPTH = REGISTRY.gauge("v2m_queue_depth", "단계를 기다리는 작업 수", ("stage",))
+IN_FLIGHT = REGISTRY.gauge("v2m_jobs_in_flight", "단계를 실행 중인 작업 수", ("stage",))
+CACHE_HITS = REGISTRY.counter("v2m_cache_hits_total", "캐시 적중 수", ("namespace",))
+CACHE_MISSES = REGISTRY.counter("v2m_cache_misses_total", "캐시 실패 수", ("namespace",))
+CACHE_HIT_RATIO = REGISTRY.gauge("v2m_cache_hit_ratio", "캐시 적중률", ("namespace",))
+CACHE_BYTES = REGISTRY.gauge("v2m_cache_bytes", "캐시 사용량")
+
+
+def observe_ollama_response(model: str, data: dict):
+    """Ollama 생성 응답(스트림의 마지막 줄)의 토큰 수/소요 시간(ns)으로 처리량 기록"""
+    eval_count = data.get("eval_count")
+    eval_duration = data.get("eval_duration")
+    if eval_count:
+        OLLAMA_EVAL_TOKENS.inc(eval_count, model=model)
+        if eval_duration:
+            OLLAMA_EVAL_TPS.observe(eval_count / (eval_duration / 1e9), model=model)
+
+    prompt_count = data.get("prompt_eval_count")
+    prompt_duration = data.get("prompt_eval_duration")
+    if prompt_count:
+        OLLAMA_PROMPT_EVAL_TOKENS.inc(prompt_count, model=model)
+        if prompt_duration:
+            OLLAMA_PROMPT_EVAL_TPS.observe(prompt_count / (prompt_duration / 1e9), model=model)
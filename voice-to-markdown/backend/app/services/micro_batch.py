@@ -0,0 +1,90 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        run_batch: Callable[[Hashable, List[Any]], Awaitable[List[Any]]],
+        max_size: int,
+        max_wait: float,
+        max_pending: Optional[int] = None
+    ):
+        """
+        짧은 간격으로 들어온 요청을 모아 한 번에 처리하는 마이크로 배처
+
+        같은 그룹 키의 요청은 첫 요청이 들어온 뒤 max_wait(초) 동안 모으거나 max_size개가 차면
+        run_batch(키, 항목 목록)로 한 번에 처리하고, 결과를 각 요청에 순서대로 돌려줍니다.
+        따라서 요청 하나가 배치를 기다리는 시간은 max_wait를 넘지 않습니다.
+
+        Args:
+            run_batch: 항목 목록과 같은 길이의 결과 목록을 반환하는 코루틴 함수
+            max_size: 배치 최대 크기
+            max_wait: 첫 요청 이후 배치를 모으는 최대 시간 (초)
+            max_pending: 배치를 기다리거나 처리 중인 항목 수 상한 (넘으면 submit이 자리가 날 때까지 대기, None이면 제한 없음)
+        """
+        self.run_batch = run_batch
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self._pending: Dict[Hashable, List[Tuple[Any, asyncio.Future]]] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        self._running: set = set()
+        self._allowance: Optional[asyncio.Semaphore] = asyncio.Semaphore(max_pending) if max_pending else None
+
+    async def submit(self, key: Hashable, item: Any) -> Any:
+        """항목을 배치에 넣고 결과를 기다림 (배치 처리 중 예외는 그대로 전달)"""
+        if self._allowance is None:
+            return await self._submit(key, item)
+        async with self._allowance:
+            return await self._submit(key, item)
+
+    async def _submit(self, key: Hashable, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(key, [])
+        pending.append((item, future))
+
+        if len(pending) >= self.max_size:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.max_wait, self._flush, key)
+        return await future
+
+    def close(self):
+        """대기 중인 요청 취소"""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for pending in self._pending.values():
+            for _, future in pending:
+                if not future.done():
+                    future.cancel()
+        self._pending.clear()
+
+    def _flush(self, key: Hashable):
+        timer: Optional[asyncio.TimerHandle] = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, [])
+        # 기다리다 취소된 요청은 빼고 처리
+        batch = [(item, future) for item, future in batch if not future.done()]
+        if batch:
+            task = asyncio.create_task(self._run(key, batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, key: Hashable, batch: List[Tuple[Any, asyncio.Future]]):
+        try:
+            results = await self.run_batch(key, [item for item, _ in batch])
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .progress import format_seconds
+
+# 요청별 품질 힌트 (schemas.QualityHint 값)
+QUALITY_FAST = "fast"
+QUALITY_BALANCED = "balanced"
+QUALITY_ACCURATE = "accurate"
+# 대기열이 쌓였을 때 STT 모델을 최대 몇 단계까지 낮출지
+MAX_BACKLOG_STEPS = 2
+
+
+@dataclass(frozen=True)
+class ModelChoice:
+    """정책이 고른 모델과 그 이유 (요약 메타데이터와 작업 상태에 기록)"""
+    model: str
+    reason: str
+
+
+class ModelPolicy:
+    def __init__(
+        self,
+        stt_ladder: List[str],
+        default_stt_size: str,
+        default_llm: str,
+        fast_llm: Optional[str] = None,
+        backlog: int = 5,
+        long_audio_seconds: float = 1800,
+        enabled: bool = True
+    ):
+        """
+        작업마다 STT 모델 크기와 요약 LLM을 고르는 정책
+
+        - STT: 기본 크기에서 시작해 품질 힌트(fast -1단계, accurate +1단계), 대기열 길이
+          (backlog건마다 -1단계, 최대 2단계), 오디오 길이(long_audio_seconds 이상이면 -1단계)로 조정합니다.
+          accurate 요청은 긴 오디오로 낮추지 않고 대기열로도 한 단계까지만 낮춥니다.
+        - LLM: fast 요청이거나 요약 대기열이 backlog건 이상 쌓이면 fast_llm, 그 외에는 기본 모델을 사용합니다.
+
+        Args:
+            stt_ladder: 작은 것부터 큰 순서의 STT 모델 크기 목록 (이 안에서만 고름)
+            default_stt_size: 기본 STT 모델 크기 (ladder에 없으면 항상 기본값 사용)
+            default_llm: 기본 요약 모델
+            fast_llm: 부하가 높을 때 쓰는 빠른 요약 모델 (없으면 항상 기본 모델)
+            backlog: 모델을 한 단계 낮추는 대기 작업 수
+            long_audio_seconds: 한 단계 작은 STT 모델을 쓰는 오디오 길이 (초)
+            enabled: False이면 항상 기본 모델
+        """
+        self.stt_ladder = stt_ladder
+        self.default_stt_size = default_stt_size
+        self.default_llm = default_llm
+        self.fast_llm = fast_llm or None
+        self.backlog = max(1, backlog)
+        self.long_audio_seconds = long_audio_seconds
+        self.enabled = enabled
+
+    def choose_stt_size(self, duration: float, queue_depth: int, quality: Optional[str] = None) -> ModelChoice:
+        """
+        STT 모델 크기 선택
+
+        Args:
+            duration: 오디오 길이 (초)
+            queue_depth: 음성 인식을 기다리는 작업 수
+            quality: 품질 힌트 (fast, balanced, accurate)
+        """
+        if not self.enabled or self.default_stt_size not in self.stt_ladder:
+            return ModelChoice(self.default_stt_size, "기본")
+
+        index = self.stt_ladder.index(self.default_stt_size)
+        reasons = []
+        if quality == QUALITY_ACCURATE:
+            index += 1
+            reasons.append("정확도 우선 요청")
+        elif quality == QUALITY_FAST:
+            index -= 1
+            reasons.append("빠른 처리 요청")
+
+        steps = min(MAX_BACKLOG_STEPS, queue_depth // self.backlog)
+        if quality == QUALITY_ACCURATE:
+            steps = min(steps, 1)
+        if steps:
+            index -= steps
+            reasons.append(f"대기열 {queue_depth}건")
+
+        if duration >= self.long_audio_seconds and quality != QUALITY_ACCURATE:
+            index -= 1
+            reasons.append(f"긴 오디오 {format_seconds(duration)}")
+
+        index = min(max(index, 0), len(self.stt_ladder) - 1)
+        return ModelChoice(self.stt_ladder[index], ", ".join(reasons) or "기본")
+
+    def choose_llm_model(self, queue_depth: int, quality: Optional[str] = None) -> ModelChoice:
+        """
+        요약 모델 선택
+
+        Args:
+            queue_depth: 요약을 기다리는 작업 수
+            quality: 품질 힌트 (fast, balanced, accurate)
+        """
+        if not self.enabled or self.fast_llm is None:
+            return ModelChoice(self.default_llm, "기본")
+        if quality == QUALITY_ACCURATE:
+            return ModelChoice(self.default_llm, "정확도 우선 요청")
+        if quality == QUALITY_FAST:
+            return ModelChoice(self.fast_llm, "빠른 처리 요청")
+        if queue_depth >= self.backlog:
+            return ModelChoice(self.fast_llm, f"요약 대기열 {queue_depth}건")
+        return ModelChoice(self.default_llm, "기본")
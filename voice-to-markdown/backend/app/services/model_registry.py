@@ -0,0 +1,254 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from . import metrics
+
+
+@dataclass(frozen=True)
+class ModelKey:
+    """로드된 모델을 공유하는 기준 (같은 엔진/크기/장치/연산 타입이면 같은 인스턴스 사용)"""
+    engine: str
+    size: str
+    device: str = "cpu"
+    compute_type: str = "float32"
+
+    def __str__(self) -> str:
+        return f"{self.engine}:{self.size}/{self.device}/{self.compute_type}"
+
+
+class _Entry:
+    def __init__(self, key: ModelKey, pinned: bool):
+        self.key = key
+        self.pinned = pinned  # 시작 시 미리 로드한 모델 (유휴 시간으로는 내리지 않음)
+        self.service: Any = None
+        self.state = "unloaded"  # unloaded, loading, ready, failed
+        self.error: Optional[str] = None
+        self.load_task: Optional[asyncio.Task] = None
+        self.in_use = 0
+        self.last_used = time.monotonic()
+        self.memory_bytes = 0
+        self.workers = 0  # 워커 풀을 띄운 뒤의 프로세스 수 (자리를 받기 전에는 0)
+        self.load_seconds: Optional[float] = None
+
+
+class ModelRegistry:
+    def __init__(
+        self,
+        factory: Callable[[ModelKey], Any],
+        preload: List[ModelKey],
+        idle_timeout: float,
+        memory_budget_bytes: int,
+        max_workers: int = 0
+    ):
+        """
+        STT 모델 레지스트리
+
+        모델 인스턴스(워커 풀 포함)를 (엔진, 크기, 장치, 연산 타입)별로 하나만 만들어 요청 간에 공유합니다.
+        서비스 객체는 warm_up(), shutdown(), estimated_memory_bytes()와 num_workers를 제공해야 합니다.
+
+        - 시작 시 preload 모델을 백그라운드에서 로드하고 준비 상태를 /health로 알립니다.
+        - 미리 로드하지 않은 모델은 idle_timeout(초) 동안 쓰이지 않으면 내립니다.
+        - 새 모델을 로드할 때 memory_budget_bytes를 넘으면 사용 중이 아닌 모델을
+          오래 쓰이지 않은 순서로 내립니다 (미리 로드한 모델은 마지막에).
+        - 모델 크기마다 워커 풀이 따로 생기므로, 모든 풀의 워커 프로세스 합계가 max_workers를 넘지 않도록
+          같은 순서로 유휴 풀을 내리고, 모두 사용 중이면 자리가 날 때까지 기다린 뒤 새 풀을 띄웁니다.
+
+        Args:
+            factory: ModelKey로 서비스 객체를 만드는 함수 (모델 로드는 warm_up에서)
+            preload: 시작 시 로드할 모델 목록
+            idle_timeout: 유휴 모델을 내리기까지의 시간 (초)
+            memory_budget_bytes: 로드된 모델의 추정 메모리 합계 상한 (0이면 제한 없음)
+            max_workers: 모든 모델의 워커 프로세스 합계 상한 (0이면 제한 없음)
+        """
+        self.factory = factory
+        self.preload = preload
+        self.idle_timeout = idle_timeout
+        self.memory_budget_bytes = memory_budget_bytes
+        self.max_workers = max_workers
+        # 모델이 반납/준비/언로드될 때마다 설정 (워커 자리를 기다리는 로드가 다시 확인)
+        self._released = asyncio.Event()
+        self._entries: Dict[ModelKey, _Entry] = {}
+        self._evict_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """미리 로드할 모델의 로드 시작 (완료를 기다리지 않음)"""
+        for key in self.preload:
+            self._ensure_loading(key, pinned=True)
+        if self._evict_task is None:
+            self._evict_task = asyncio.create_task(self._evict_loop())
+
+    async def shutdown(self):
+        """모든 모델 언로드"""
+        if self._evict_task is not None:
+            self._evict_task.cancel()
+            self._evict_task = None
+        for entry in self._entries.values():
+            if entry.load_task is not None and not entry.load_task.done():
+                entry.load_task.cancel()
+            self._unload(entry)
+
+    def is_ready(self) -> bool:
+        """미리 로드할 모델이 모두 준비되었는지"""
+        return all(
+            self._entries.get(key) is not None and self._entries[key].state == "ready"
+            for key in self.preload
+        )
+
+    @asynccontextmanager
+    async def use(self, key: ModelKey) -> AsyncIterator[Any]:
+        """
+        모델 사용 (로드 중이면 완료까지 대기, 사용 중에는 내리지 않음)
+
+        Raises:
+            Exception: 모델 로드에 실패한 경우
+        """
+        entry = self._ensure_loading(key)
+        entry.in_use += 1
+        try:
+            # 대기 중인 요청이 취소되어도 로드 자체는 계속 진행
+            await asyncio.shield(entry.load_task)
+            if entry.state != "ready":
+                raise Exception(f"STT 모델({key})을 로드하지 못했습니다: {entry.error}")
+            yield entry.service
+        finally:
+            entry.in_use -= 1
+            entry.last_used = time.monotonic()
+            self._released.set()
+
+    def status(self) -> dict:
+        """모델별 상태 (health 엔드포인트용)"""
+        now = time.monotonic()
+        return {
+            "ready": self.is_ready(),
+            "memory_bytes": self._loaded_bytes(),
+            "memory_budget_bytes": self.memory_budget_bytes,
+            "workers": self._loaded_workers(),
+            "max_workers": self.max_workers,
+            "models": [
+                {
+                    "key": str(entry.key),
+                    "state": entry.state,
+                    "preloaded": entry.pinned,
+                    "in_use": entry.in_use,
+                    "idle_seconds": round(now - entry.last_used, 1),
+                    "memory_bytes": entry.memory_bytes,
+                    "workers": entry.workers,
+                    "load_seconds": entry.load_seconds,
+                    "error": entry.error
+                }
+                for entry in self._entries.values()
+            ]
+        }
+
+    def _ensure_loading(self, key: ModelKey, pinned: bool = False) -> _Entry:
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = _Entry(key, pinned)
+            self._entries[key] = entry
+        entry.pinned = entry.pinned or pinned
+        if entry.state in ("unloaded", "failed"):
+            entry.state = "loading"
+            entry.error = None
+            entry.load_task = asyncio.create_task(self._load(entry))
+        return entry
+
+    async def _load(self, entry: _Entry):
+        started = time.monotonic()
+        try:
+            service = self.factory(entry.key)
+            entry.memory_bytes = service.estimated_memory_bytes()
+            await self._reserve_workers(entry, service.num_workers)
+            self._make_room(entry)
+            print(f"Loading model {entry.key} (~{entry.memory_bytes // (1024 * 1024)}MB, {entry.workers} workers)")
+            entry.service = service
+            await service.warm_up()
+            entry.state = "ready"
+            entry.load_seconds = round(time.monotonic() - started, 2)
+            metrics.MODEL_LOAD_SECONDS.observe(entry.load_seconds, engine=entry.key.engine, model=entry.key.size)
+            entry.last_used = time.monotonic()
+            self._released.set()
+            print(f"Model {entry.key} ready in {entry.load_seconds}s")
+        except asyncio.CancelledError:
+            self._unload(entry)
+            raise
+        except Exception as e:
+            print(f"Model {entry.key} failed to load: {e}")
+            self._unload(entry)
+            entry.state = "failed"
+            entry.error = str(e)
+
+    def _loaded_bytes(self) -> int:
+        return sum(entry.memory_bytes for entry in self._entries.values() if entry.state in ("loading", "ready"))
+
+    def _loaded_workers(self) -> int:
+        return sum(entry.workers for entry in self._entries.values())
+
+    async def _reserve_workers(self, loading: _Entry, workers: int):
+        """
+        워커 프로세스 합계 상한 안에서 새 워커 풀 자리 확보
+
+        사용 중이 아닌 풀을 _make_room과 같은 순서로 내리고, 그래도 모자라면
+        다른 모델이 반납될 때까지 기다립니다 (다른 풀이 모두 비면 항상 들어갈 수 있음).
+        """
+        def fits() -> bool:
+            loaded = self._loaded_workers()
+            return not self.max_workers or not loaded or loaded + workers <= self.max_workers
+
+        while not fits():
+            candidates = sorted(
+                (e for e in self._entries.values() if e is not loading and e.state == "ready" and e.in_use == 0),
+                key=lambda e: (e.pinned, e.last_used)
+            )
+            for entry in candidates:
+                if fits():
+                    break
+                print(f"Unloading model {entry.key} to stay within {self.max_workers} STT workers")
+                self._unload(entry)
+            if fits():
+                break
+            self._released.clear()
+            await self._released.wait()
+        loading.workers = workers
+
+    def _make_room(self, loading: _Entry):
+        """메모리 상한을 넘으면 사용 중이 아닌 모델을 내림 (미리 로드하지 않은 모델, 오래된 순)"""
+        if not self.memory_budget_bytes:
+            return
+        candidates = sorted(
+            (e for e in self._entries.values() if e is not loading and e.state == "ready" and e.in_use == 0),
+            key=lambda e: (e.pinned, e.last_used)
+        )
+        for entry in candidates:
+            if self._loaded_bytes() <= self.memory_budget_bytes:
+                break
+            print(f"Unloading model {entry.key} to stay within memory budget")
+            self._unload(entry)
+
+        if self._loaded_bytes() > self.memory_budget_bytes:
+            print(f"[WARN] Loaded models exceed memory budget: {self._loaded_bytes():,} > {self.memory_budget_bytes:,} bytes")
+
+    def _unload(self, entry: _Entry):
+        if entry.service is not None:
+            entry.service.shutdown()
+            entry.service = None
+        entry.workers = 0
+        entry.state = "unloaded"
+        self._released.set()
+
+    async def _evict_loop(self):
+        """유휴 시간이 지난 모델 주기적 언로드"""
+        while True:
+            await asyncio.sleep(max(1.0, min(60.0, self.idle_timeout / 2)))
+            now = time.monotonic()
+            for entry in list(self._entries.values()):
+                if (
+                    entry.state == "ready"
+                    and not entry.pinned
+                    and entry.in_use == 0
+                    and now - entry.last_used > self.idle_timeout
+                ):
+                    print(f"Unloading idle model {entry.key}")
+                    self._unload(entry)
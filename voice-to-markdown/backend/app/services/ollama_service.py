@@ -1,151 +1,738 @@
-import requests
+import asyncio
 import json
-from typing import Optional
+import time
+import httpx
+from dataclasses import dataclass
+from typing import AsyncContextManager, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from .. import config
+from . import metrics
+from .content_cache import ContentCache, make_cache_key, sha256_text
+from .progress import ProgressCallback, report_progress, scaled_progress
+from .text_chunker import ChunkAccumulator, estimate_tokens, split_into_chunks
+
+# 스트리밍 생성 콜백: (새로 생성된 조각, 지금까지 생성된 토큰 수)
+ChunkCallback = Callable[[str, int], Awaitable[None]]
+# 요청 하나 동안 잡아 둘 실행 슬롯 (스케줄러의 요약 단계 슬롯 등)
+SlotFactory = Callable[[], AsyncContextManager]
+
+
+# 프롬프트 템플릿 버전 (프롬프트를 바꾸면 올려서 요약 캐시를 무효화)
+PROMPT_VERSION = "3"
+
+
+@dataclass(frozen=True)
+class ChatPrompt:
+    """
+    작업마다 같은 지시문(system)과 작업별 텍스트(user)로 나눈 프롬프트
+
+    지시문이 메시지 맨 앞에 글자 하나 다르지 않게 반복되므로 모델이 메모리에 남아 있는 동안
+    Ollama가 공통 접두사의 KV 캐시를 재사용하고 전사 텍스트 부분만 새로 평가합니다.
+    """
+    system: str
+    user: str
+
+
+# 작업마다 바뀌지 않는 지시문 (system 메시지)
+# 모델이 메모리에 남아 있는 동안 이 접두사의 KV 캐시가 재사용되므로 작업별 값(부분 번호 등)은 넣지 않음
+LECTURE_SYSTEM_PROMPT = """다음에 주어지는 텍스트는 강의 내용을 음성 인식으로 변환한 것입니다. 이를 체계적으로 정리하여 Markdown 형식의 강의 노트로 만들어주세요.
+
+학생이 직접 필기한 것처럼 상세하고 완전한 강의 노트를 작성해주세요.
+
+# 작성 원칙:
+1. **내용 보존**: 원본 강의의 모든 중요 내용을 빠짐없이 포함
+   - 핵심 개념뿐만 아니라 부연 설명, 예시, 세부사항도 모두 기록
+   - 교수님이 언급한 팁, 주의사항, 강조 포인트 반드시 포함
+   - "시험에 나올 수 있다", "중요하다" 등의 언급은 특별 표시
+
+2. **오류 수정**: STT 변환 과정의 오류를 문맥에 맞게 자연스럽게 수정
+   - 잘못 인식된 전문용어나 고유명사 교정
+   - 문장 부호와 띄어쓰기 정리
+   - 의미가 불분명한 부분은 문맥으로 추론하여 보완
+
+3. **구조화 방식**:
+   - 계층적 헤딩 사용 (##, ###, ####)
+   - 핵심 키워드와 용어는 **굵게** 표시
+   - 정의나 공식은 > 인용 블록으로 강조
+   - 예시는 - 또는 번호 리스트로 정리
+   - 관련 내용끼리 논리적으로 그룹화
+
+4. **추가 요소**:
+   - 📌 중요 표시: 시험 출제 가능성이 높거나 특별히 강조된 내용
+   - 💡 팁/참고: 교수님이 언급한 추가 설명이나 학습 팁
+   - ⚠️ 주의사항: 실수하기 쉬운 부분이나 주의점
+   - 📝 예제: 구체적인 예시나 문제
+
+5. **상세도**: 
+   - 나중에 이 노트만 보고도 강의 내용을 완전히 이해할 수 있도록 상세히 작성
+   - 암기가 필요한 부분은 별도로 정리
+   - 이해를 돕는 부연 설명 포함
+
+학생이 수업을 들으며 꼼꼼히 필기한 것처럼 완전하고 상세한 강의 노트를 작성해주세요.
+내용을 요약하거나 생략하지 말고, 최대한 풍부하게 작성해주세요."""
+
+MEETING_SYSTEM_PROMPT = """다음에 주어지는 텍스트는 회의 내용을 음성 인식으로 변환한 것입니다. 이를 체계적으로 정리하여 Markdown 형식의 회의록으로 만들어주세요.
+
+# 중요 지시사항:
+- 이것은 회의록입니다. "강의"라는 단어를 절대 사용하지 마세요.
+- 반드시 "회의록", "회의 내용", "논의 사항" 등의 회의 관련 용어만 사용하세요.
+
+# 요구사항:
+1. 회의의 주요 안건과 논의 사항을 중심으로 구조화
+2. 결정 사항과 액션 아이템을 명확히 구분
+3. 참여자별 발언 내용이 명확한 경우 정리
+4. 계층적 헤딩 사용 (## 회의 안건, ### 주요 논의사항, #### 세부 내용 등)
+5. 중요한 결정사항은 **굵게** 표시
+6. 액션 아이템은 체크리스트 형태로 표시
+7. 한국어로 자연스럽게 정리
+8. 제목은 "# 회의록" 또는 "## 회의 내용" 형태로 시작"""
+
+LECTURE_CHUNK_SYSTEM_PROMPT = """다음에 주어지는 텍스트는 긴 강의를 음성 인식으로 변환한 텍스트 중 한 부분입니다.
+앞뒤 부분과 일부 문장이 겹칠 수 있습니다. 이 부분의 내용을 Markdown 강의 노트로 정리해주세요.
+
+# 작성 원칙:
+- 핵심 개념, 부연 설명, 예시, 세부사항을 빠짐없이 기록 (요약하거나 생략하지 말 것)
+- 교수님이 강조한 내용, 팁, 주의사항, "시험에 나온다" 등의 언급은 📌, 💡, ⚠️로 표시
+- STT 오류(전문용어, 고유명사)는 문맥에 맞게 수정
+- 핵심 키워드는 **굵게**, 정의나 공식은 > 인용 블록으로 표시
+- ### 이하의 헤딩만 사용 (다른 부분과 나중에 합쳐집니다)"""
+
+MEETING_CHUNK_SYSTEM_PROMPT = """다음에 주어지는 텍스트는 긴 회의를 음성 인식으로 변환한 텍스트 중 한 부분입니다.
+앞뒤 부분과 일부 문장이 겹칠 수 있습니다. 이 부분의 내용을 Markdown 회의록 초안으로 정리해주세요.
+
+# 중요 지시사항:
+- 이것은 회의록입니다. "강의"라는 단어를 절대 사용하지 마세요.
+- 논의된 안건, 의견, 결정 사항, 액션 아이템을 빠짐없이 기록
+- 참여자별 발언이 명확하면 구분하여 정리
+- 결정 사항은 **굵게**, 액션 아이템은 - [ ] 체크리스트로 표시
+- ### 이하의 헤딩만 사용 (다른 부분과 나중에 합쳐집니다)"""
+
+LECTURE_REDUCE_PRINCIPLES = """# 통합 원칙:
+- 부분 사이에 겹치는 내용은 한 번만 남기고, 강의 흐름 순서를 유지
+- 각 부분의 세부 내용, 예시, 📌/💡/⚠️/📝 표시를 생략하지 말 것
+- 계층적 헤딩 (##, ###, ####), 핵심 키워드는 **굵게**, 정의나 공식은 > 인용 블록
+- 관련 내용끼리 논리적으로 그룹화"""
+
+MEETING_REDUCE_PRINCIPLES = """# 중요 지시사항:
+- 이것은 회의록입니다. "강의"라는 단어를 절대 사용하지 마세요.
+- 부분 사이에 겹치는 내용은 한 번만 남기고, 안건별로 논의 사항을 묶어 정리
+- 결정 사항은 **굵게**, 액션 아이템은 체크리스트로 한곳에 모아 정리
+- 한국어로 자연스럽게 정리"""
+
+LECTURE_REDUCE_SYSTEM_PROMPTS = {
+    final: f"""다음에 주어지는 것은 하나의 강의를 여러 부분으로 나누어 순서대로 정리한 노트들입니다.
+{goal}
+
+{LECTURE_REDUCE_PRINCIPLES}"""
+    for final, goal in (
+        (True, "하나의 완전하고 상세한 강의 노트로 통합해주세요. 최상위 제목은 ## 로 시작하세요."),
+        (False, "하나의 노트로 통합해주세요. 이 결과는 다른 부분과 다시 합쳐지므로 ### 이하의 헤딩만 사용하세요.")
+    )
+}
+
+MEETING_REDUCE_SYSTEM_PROMPTS = {
+    final: f"""다음에 주어지는 것은 하나의 회의를 여러 부분으로 나누어 순서대로 정리한 회의록 초안들입니다.
+{goal}
+
+{MEETING_REDUCE_PRINCIPLES}"""
+    for final, goal in (
+        (True, "하나의 체계적인 회의록으로 통합해주세요. 제목은 \"# 회의록\" 또는 \"## 회의 내용\" 형태로 시작하세요."),
+        (False, "하나의 회의록 초안으로 통합해주세요. 이 결과는 다른 부분과 다시 합쳐지므로 ### 이하의 헤딩만 사용하세요.")
+    )
+}
+
+
+def _keep_alive_value(value: str) -> Union[int, str]:
+    """keep_alive 설정값 (숫자면 초 단위 정수, 그 외에는 "30m" 같은 기간 문자열 그대로)"""
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def _full_model_name(model_name: str) -> str:
+    """Ollama 모델 이름을 이름:태그 형태로 (태그가 없으면 Ollama와 같이 :latest)"""
+    return model_name if ":" in model_name else f"{model_name}:latest"
+
 
 class OllamaService:
-    def __init__(self, base_url: str = "http://localhost:11434"):
+    engine_name = "ollama"
+    prompt_version = PROMPT_VERSION
+    
+    def __init__(self, base_url: str = config.OLLAMA_BASE_URL, cache: Optional[ContentCache] = None):
         """
         Ollama 서비스 초기화
         
         Args:
             base_url: Ollama 서버 URL
+            cache: 청크 요약 결과를 저장할 캐시 (없으면 캐시하지 않음)
         """
         self.base_url = base_url
-        self.model_name = "llama3.1:8b"
+        self.model_name = config.OLLAMA_MODEL
+        self.cache = cache
+        self.availability_ttl = config.OLLAMA_AVAILABILITY_TTL
+        self.stream = config.OLLAMA_STREAM
+        self.num_predict = config.OLLAMA_NUM_PREDICT
+        self.num_ctx = config.OLLAMA_NUM_CTX
+        self.keep_alive = _keep_alive_value(config.OLLAMA_KEEP_ALIVE)
+        # (모델, 지시문 해시) -> [토큰 추정 보정 배율, 프롬프트 토큰당 평가 시간] - 접두사 캐시로 아낀 시간 추정용
+        self._prefix_profiles: Dict[Tuple[str, str], List[float]] = {}
         
-    async def check_model_availability(self) -> bool:
-        """모델이 사용 가능한지 확인"""
+        # 긴 텍스트의 계층적(map-reduce) 요약 설정
+        self.chunk_tokens = config.SUMMARY_CHUNK_TOKENS
+        self.chunk_overlap_tokens = config.SUMMARY_CHUNK_OVERLAP_TOKENS
+        self.chunk_num_predict = config.SUMMARY_CHUNK_NUM_PREDICT
+        self.map_concurrency = config.SUMMARY_MAP_CONCURRENCY
+        self._client: Optional[httpx.AsyncClient] = None
+        
+        # 모델 가용성 캐시 (/api/tags 결과)
+        self._available: Optional[bool] = None
+        self._models: List[str] = []
+        self._checked_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Ollama 서버와의 커넥션 풀을 유지하는 비동기 HTTP 클라이언트"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(300.0, connect=5.0),  # 생성은 최대 5분
+                limits=httpx.Limits(
+                    max_connections=config.OLLAMA_MAX_CONNECTIONS,
+                    max_keepalive_connections=config.OLLAMA_MAX_CONNECTIONS
+                )
+            )
+        return self._client
+    
+    async def close(self):
+        """HTTP 클라이언트와 백그라운드 갱신 작업 정리"""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def refresh_model_availability(self) -> bool:
+        """/api/tags를 조회하여 모델 가용성 캐시를 갱신"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags")
+            response = await self.client.get("/api/tags", timeout=10.0)
             if response.status_code == 200:
-                models = response.json().get("models", [])
-                return any(model["name"].startswith("llama3.1") for model in models)
-            return False
+                self._models = [_full_model_name(model["name"]) for model in response.json().get("models", [])]
+                self._available = self.has_model(self.model_name)
+            else:
+                self._available = False
         except Exception as e:
             print(f"Error checking Ollama availability: {e}")
-            return False
+            self._available = False
+        
+        self._checked_at = time.monotonic()
+        return self._available
     
-    async def generate_summary(self, text: str, content_type: str = "lecture") -> str:
+    async def check_model_availability(self) -> bool:
+        """
+        모델이 사용 가능한지 확인 (TTL 캐시)
+        
+        캐시가 만료되었으면 현재 값을 바로 반환하고 백그라운드에서 갱신합니다.
+        사용 불가로 캐시된 경우에는 Ollama가 방금 시작되었을 수 있으므로 즉시 다시 확인합니다.
+        """
+        if not self._available:
+            return await self.refresh_model_availability()
+        
+        is_stale = time.monotonic() - self._checked_at > self.availability_ttl
+        if is_stale and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self.refresh_model_availability())
+        
+        return self._available
+    
+    def get_available_models(self) -> List[str]:
+        """마지막으로 조회된 Ollama 모델 목록"""
+        return list(self._models)
+    
+    def has_model(self, model_name: str) -> bool:
+        """마지막으로 조회된 모델 목록에 같은 모델(이름:태그)이 있는지 (태그가 없으면 :latest)"""
+        return _full_model_name(model_name) in self._models
+    
+    async def ensure_model(self, model_name: str) -> bool:
+        """
+        모델 보유 여부 확인 (캐시에 없으면 /api/tags를 한 번 다시 조회)
+        
+        서버 시작 때 Ollama에 연결하지 못했거나 그 뒤에 모델을 받은 경우에도 잘못 거부하지 않도록
+        캐시에 없을 때만 목록을 갱신한 뒤 다시 확인합니다.
+        """
+        if self.has_model(model_name):
+            return True
+        await self.refresh_model_availability()
+        return self.has_model(model_name)
+    
+    def start_incremental_summary(
+        self,
+        content_type: str = "lecture",
+        model_name: Optional[str] = None,
+        usage: Optional[dict] = None,
+        slot: Optional[SlotFactory] = None
+    ) -> "IncrementalSummary":
+        """
+        전사와 겹쳐 진행하는 요약 시작 (feed로 확정된 전사를 넘기고 generate_summary에 incremental로 전달)
+        
+        Args:
+            content_type: 요약 유형 (lecture 또는 meeting)
+            model_name: 요약에 사용할 모델 (없으면 OLLAMA_MODEL)
+            usage: 요청별 사용량을 더해 넣을 dict
+            slot: 전사 중에 보내는 부분 요약 요청마다 잡아 둘 실행 슬롯
+        """
+        return IncrementalSummary(self, content_type, model_name or self.model_name, usage, slot)
+    
+    async def generate_summary(
+        self,
+        text: str,
+        content_type: str = "lecture",
+        on_chunk: Optional[ChunkCallback] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        model_name: Optional[str] = None,
+        usage: Optional[dict] = None,
+        incremental: Optional["IncrementalSummary"] = None
+    ) -> str:
         """
         텍스트를 요약하여 Markdown 형식으로 변환
         
+        텍스트가 한 번에 처리하기 긴 경우(SUMMARY_CHUNK_TOKENS 초과) 청크별 요약 후
+        병합하는 계층적(map-reduce) 요약을 사용합니다.
+        
         Args:
             text: 요약할 텍스트
             content_type: "lecture" 또는 "meeting"
+            on_chunk: 스트리밍 모드에서 생성된 조각마다 호출되는 콜백 (조각, 누적 토큰 수)
+            on_progress: 생성된 토큰 수 / num_predict (계층적 요약은 완료된 청크 수 포함)로 계산한 진행률 콜백
+            model_name: 요약에 사용할 모델 (없으면 OLLAMA_MODEL)
+            usage: 요청별 사용량을 더해 넣을 dict (prompt_tokens, cached_prompt_tokens,
+                prompt_eval_seconds, prompt_eval_saved_seconds, eval_tokens, eval_seconds)
+            incremental: 전사 중에 부분 요약을 미리 시작해 둔 경우 (start_incremental_summary)
         
         Returns:
             Markdown 형식의 요약
         """
-        if not await self.check_model_availability():
-            raise Exception("Ollama 모델을 사용할 수 없습니다. 'ollama run llama3.1:8b' 명령으로 모델을 실행해주세요.")
-        
-        # 프롬프트 템플릿 선택
-        if content_type == "lecture":
-            prompt = self._get_lecture_prompt(text)
-        else:  # meeting
-            prompt = self._get_meeting_prompt(text)
+        model_name = model_name or self.model_name
+        available = await self.check_model_availability()
+        if model_name != self.model_name:
+            available = await self.ensure_model(model_name)
+        if not available:
+            raise Exception(f"Ollama 모델을 사용할 수 없습니다. 'ollama run {model_name}' 명령으로 모델을 실행해주세요.")
         
         try:
-            print(f"Generating summary with Ollama for {content_type}")
-            
-            payload = {
-                "model": self.model_name,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.7,
-                    "top_p": 0.9,
-                    "max_tokens": 2048
-                }
-            }
-            
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json=payload,
-                timeout=300  # 5분 타임아웃
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                summary = result.get("response", "").strip()
+            if estimate_tokens(text) > self.chunk_tokens:
+                summary = await self._generate_hierarchical(text, content_type, model_name, on_chunk, on_progress, usage, incremental)
+            else:
+                if incremental is not None:
+                    incremental.cancel()
+                print(f"Generating summary with Ollama for {content_type} ({model_name}, stream={self.stream})")
+                
+                # 프롬프트 템플릿 선택
+                if content_type == "lecture":
+                    prompt = self._get_lecture_prompt(text)
+                else:  # meeting
+                    prompt = self._get_meeting_prompt(text)
                 
-                if summary:
-                    print(f"Summary generated successfully. Length: {len(summary)} characters")
-                    return summary
-                else:
-                    raise Exception("빈 응답을 받았습니다.")
+                summary = await self._generate(prompt, model_name, on_chunk=on_chunk, on_progress=on_progress, usage=usage)
+            
+            if summary:
+                print(f"Summary generated successfully. Length: {len(summary)} characters")
+                return summary
             else:
-                raise Exception(f"Ollama API 오류: {response.status_code} - {response.text}")
+                raise Exception("빈 응답을 받았습니다.")
                 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             raise Exception("요약 생성 시간이 초과되었습니다. 다시 시도해주세요.")
         except Exception as e:
             print(f"Summary generation error: {e}")
             raise Exception(f"요약 생성 중 오류가 발생했습니다: {str(e)}")
     
-    def _get_lecture_prompt(self, text: str) -> str:
+    async def _generate(
+        self,
+        prompt: ChatPrompt,
+        model_name: str,
+        on_chunk: Optional[ChunkCallback] = None,
+        stream: Optional[bool] = None,
+        num_predict: Optional[int] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        usage: Optional[dict] = None
+    ) -> str:
+        """프롬프트 하나를 Ollama chat API로 생성 (stream이 None이면 설정값 사용)"""
+        stream = self.stream if stream is None else stream
+        payload = {
+            "model": model_name,
+            "messages": [
+                {"role": "system", "content": prompt.system},
+                {"role": "user", "content": prompt.user}
+            ],
+            "stream": stream,
+            "keep_alive": self.keep_alive,
+            "options": {
+                "temperature": 0.7,
+                "top_p": 0.9,
+                "num_predict": num_predict or self.num_predict,
+                "num_ctx": self.num_ctx
+            }
+        }
+        
+        try:
+            if stream:
+                response, final = await self._generate_streaming(payload, on_chunk, on_progress)
+            else:
+                response, final = await self._generate_blocking(payload)
+                await report_progress(on_progress, 1.0, "AI 요약 생성 완료")
+        except Exception:
+            metrics.OLLAMA_REQUESTS.inc(model=model_name, outcome="error")
+            raise
+        metrics.OLLAMA_REQUESTS.inc(model=model_name, outcome="ok")
+        self._record_usage(model_name, prompt, final, usage)
+        return response
+    
+    def _record_usage(self, model_name: str, prompt: ChatPrompt, data: dict, usage: Optional[dict]):
+        """
+        응답의 토큰 수/소요 시간을 지표와 작업 사용량에 기록
+        
+        Ollama는 캐시된 접두사를 뺀 실제 평가 토큰 수만 prompt_eval_count로 알려주므로,
+        지시문별로 "실제 평가 토큰 / 추정 토큰"의 최댓값(캐시 없이 전부 평가한 요청)을 추정치 보정 배율로 두고
+        "보정된 전체 프롬프트 토큰 - 실제 평가 토큰"(지시문 길이 이하)을 캐시된 토큰으로 봅니다.
+        """
+        metrics.observe_ollama_response(model_name, data)
+        evaluated = data.get("prompt_eval_count") or 0
+        evaluated_ns = data.get("prompt_eval_duration") or 0
+        system_tokens = estimate_tokens(prompt.system)
+        estimated = system_tokens + estimate_tokens(prompt.user)
+        
+        cached = 0
+        saved_seconds = 0.0
+        if evaluated and evaluated_ns and estimated:
+            profile = self._prefix_profiles.setdefault((model_name, sha256_text(prompt.system)), [0.0, 0.0])
+            profile[0] = max(profile[0], evaluated / estimated)
+            profile[1] = evaluated_ns / 1e9 / evaluated
+            scale, seconds_per_token = profile
+            cached = int(min(scale * system_tokens, max(0.0, scale * estimated - evaluated)))
+            saved_seconds = cached * seconds_per_token
+            metrics.OLLAMA_PROMPT_CACHED_TOKENS.inc(cached, model=model_name)
+            metrics.OLLAMA_PROMPT_EVAL_SAVED_SECONDS.inc(saved_seconds, model=model_name)
+        
+        if usage is not None:
+            for name, value in (
+                ("prompt_tokens", evaluated),
+                ("cached_prompt_tokens", cached),
+                ("prompt_eval_seconds", evaluated_ns / 1e9),
+                ("prompt_eval_saved_seconds", saved_seconds),
+                ("eval_tokens", data.get("eval_count") or 0),
+                ("eval_seconds", (data.get("eval_duration") or 0) / 1e9)
+            ):
+                usage[name] = usage.get(name, 0) + value
+    
+    async def _generate_hierarchical(
+        self,
+        text: str,
+        content_type: str,
+        model_name: str,
+        on_chunk: Optional[ChunkCallback] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        usage: Optional[dict] = None,
+        incremental: Optional["IncrementalSummary"] = None
+    ) -> str:
+        """
+        긴 텍스트의 계층적 요약
+        
+        1. map: 토큰 상한 이하의 겹치는 청크로 나누어 동시에 요약 (동시 실행 수 제한)
+        2. reduce: 부분 노트가 여전히 길면 그룹별로 중간 병합을 반복
+        3. 최종 병합 결과만 스트리밍으로 생성
+        
+        청크/중간 병합 결과는 캐시되므로 병합 단계가 실패해도 재시도 시 map을 다시 하지 않습니다.
+        incremental이 있으면 전사 중에 이미 시작한 부분 요약을 이어받고 남은 청크만 새로 요약합니다.
+        진행률은 map 단계(완료된 청크 수)에 0~60%, 최종 병합(생성 토큰 수)에 70~100%를 배분합니다.
+        """
+        pending = incremental.complete(text) if incremental is not None else None
+        if pending is None:
+            semaphore = asyncio.Semaphore(self.map_concurrency)
+            chunks = split_into_chunks(text, self.chunk_tokens, self.chunk_overlap_tokens)
+            pending = [
+                self._generate_cached(self._get_chunk_prompt(chunk, content_type, index + 1), model_name, semaphore, usage)
+                for index, chunk in enumerate(chunks)
+            ]
+            print(f"Generating hierarchical summary for {content_type}: {len(chunks)} chunks")
+        else:
+            semaphore = incremental.semaphore
+            print(f"Finishing overlapped summary for {content_type}: {len(pending)} chunks ({incremental.done_count()} already done)")
+        
+        completed = 0
+        
+        async def summarize_chunk(note: Awaitable[str]) -> str:
+            nonlocal completed
+            note = await note
+            completed += 1
+            await report_progress(on_progress, 0.6 * completed / len(pending), f"부분 요약 중... ({completed}/{len(pending)})")
+            return note
+        
+        notes = await asyncio.gather(*(summarize_chunk(note) for note in pending))
+        
+        # 부분 노트를 합쳐도 한 번에 병합하기 길면 그룹별 중간 병합
+        while len(notes) > 1 and estimate_tokens("\n\n".join(notes)) > self.chunk_tokens:
+            groups = self._group_notes(notes, self.chunk_tokens)
+            if len(groups) == len(notes):
+                break  # 더 이상 묶을 수 없음 (노트 하나하나가 상한에 가까움)
+            print(f"Merging {len(notes)} partial notes into {len(groups)} groups")
+            await report_progress(on_progress, 0.65, f"부분 요약 병합 중... ({len(notes)}개 → {len(groups)}개)")
+            notes = await asyncio.gather(*(
+                self._generate_cached(self._get_reduce_prompt(group, content_type, final=False), model_name, semaphore, usage)
+                if len(group) > 1 else self._passthrough(group[0])
+                for group in groups
+            ))
+        
+        return await self._generate(
+            self._get_reduce_prompt(notes, content_type, final=True),
+            model_name,
+            on_chunk=on_chunk,
+            on_progress=scaled_progress(on_progress, 0.7, 1.0),
+            usage=usage
+        )
+    
+    async def _generate_cached(
+        self,
+        prompt: ChatPrompt,
+        model_name: str,
+        semaphore: asyncio.Semaphore,
+        usage: Optional[dict] = None
+    ) -> str:
+        """중간 단계 생성 (결과를 모델 + 프롬프트 해시로 캐시)"""
+        key = make_cache_key(model_name, prompt.system, prompt.user)
+        if self.cache is not None:
+            cached = await asyncio.to_thread(self.cache.get, "summary_chunk", key)
+            if cached:
+                return cached
+        
+        async with semaphore:
+            note = await self._generate(prompt, model_name, stream=False, num_predict=self.chunk_num_predict, usage=usage)
+        if not note:
+            raise Exception("부분 요약 결과가 비어있습니다.")
+        
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.put, "summary_chunk", key, note)
+        return note
+    
+    @staticmethod
+    async def _passthrough(note: str) -> str:
+        return note
+    
+    @staticmethod
+    def _group_notes(notes: List[str], max_tokens: int) -> List[List[str]]:
+        """부분 노트를 순서대로 토큰 상한 이하의 그룹으로 묶음"""
+        groups: List[List[str]] = []
+        current: List[str] = []
+        current_tokens = 0
+        for note in notes:
+            note_tokens = estimate_tokens(note)
+            if current and current_tokens + note_tokens > max_tokens:
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(note)
+            current_tokens += note_tokens
+        if current:
+            groups.append(current)
+        return groups
+    
+    async def _generate_blocking(self, payload: dict) -> Tuple[str, dict]:
+        """전체 응답을 한 번에 받는 생성 요청 (생성 텍스트, 응답 전체)"""
+        response = await self.client.post("/api/chat", json=payload)
+        
+        if response.status_code != 200:
+            raise Exception(f"Ollama API 오류: {response.status_code} - {response.text}")
+        
+        data = response.json()
+        return data.get("message", {}).get("content", "").strip(), data
+    
+    async def _generate_streaming(
+        self,
+        payload: dict,
+        on_chunk: Optional[ChunkCallback],
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Tuple[str, dict]:
+        """NDJSON 스트림을 한 줄씩 읽으며 생성된 조각을 즉시 전달 (생성 텍스트, 마지막 줄)"""
+        parts = []
+        final = {}
+        token_count = 0
+        # 생성 토큰 상한 대비 비율로 진행률 추정
+        token_budget = payload["options"]["num_predict"]
+        
+        async with self.client.stream("POST", "/api/chat", json=payload) as response:
+            if response.status_code != 200:
+                body = (await response.aread()).decode("utf-8", errors="replace")
+                raise Exception(f"Ollama API 오류: {response.status_code} - {body}")
+            
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                
+                data = json.loads(line)
+                if "error" in data:
+                    raise Exception(f"Ollama API 오류: {data['error']}")
+                
+                chunk = data.get("message", {}).get("content", "")
+                if chunk:
+                    parts.append(chunk)
+                    # 스트림의 각 줄은 토큰 하나에 해당
+                    token_count += 1
+                    if on_chunk is not None:
+                        await on_chunk(chunk, token_count)
+                    await report_progress(on_progress, token_count / token_budget, f"AI 요약 생성 중... ({token_count} 토큰)")
+                
+                if data.get("done"):
+                    # 마지막 줄에 생성/프롬프트 처리 토큰 수와 소요 시간이 포함됨
+                    final = data
+                    break
+        
+        return "".join(parts).strip(), final
+    
+
+    def _get_lecture_prompt(self, text: str) -> ChatPrompt:
         """강의용 프롬프트 템플릿"""
-        return f"""다음은 강의 내용을 음성 인식으로 변환한 텍스트입니다. 이를 체계적으로 정리하여 Markdown 형식의 강의 노트로 만들어주세요.
+        return ChatPrompt(LECTURE_SYSTEM_PROMPT, f"""원본 텍스트:
+{text}
 
-학생이 직접 필기한 것처럼 상세하고 완전한 강의 노트를 작성해주세요.
+---
 
-# 작성 원칙:
-1. **내용 보존**: 원본 강의의 모든 중요 내용을 빠짐없이 포함
-   - 핵심 개념뿐만 아니라 부연 설명, 예시, 세부사항도 모두 기록
-   - 교수님이 언급한 팁, 주의사항, 강조 포인트 반드시 포함
-   - "시험에 나올 수 있다", "중요하다" 등의 언급은 특별 표시
+위 강의 내용을 바탕으로 강의 노트를 작성해주세요:""")
 
-2. **오류 수정**: STT 변환 과정의 오류를 문맥에 맞게 자연스럽게 수정
-   - 잘못 인식된 전문용어나 고유명사 교정
-   - 문장 부호와 띄어쓰기 정리
-   - 의미가 불분명한 부분은 문맥으로 추론하여 보완
+    def _get_meeting_prompt(self, text: str) -> ChatPrompt:
+        """회의용 프롬프트 템플릿"""
+        return ChatPrompt(MEETING_SYSTEM_PROMPT, f"""회의 내용:
+{text}
 
-3. **구조화 방식**:
-   - 계층적 헤딩 사용 (##, ###, ####)
-   - 핵심 키워드와 용어는 **굵게** 표시
-   - 정의나 공식은 > 인용 블록으로 강조
-   - 예시는 - 또는 번호 리스트로 정리
-   - 관련 내용끼리 논리적으로 그룹화
+위 내용을 바탕으로 체계적인 **회의록**을 Markdown 형식으로 작성해주세요:""")
 
-4. **추가 요소**:
-   - 📌 중요 표시: 시험 출제 가능성이 높거나 특별히 강조된 내용
-   - 💡 팁/참고: 교수님이 언급한 추가 설명이나 학습 팁
-   - ⚠️ 주의사항: 실수하기 쉬운 부분이나 주의점
-   - 📝 예제: 구체적인 예시나 문제
+    def _get_chunk_prompt(self, text: str, content_type: str, index: int) -> ChatPrompt:
+        """
+        긴 텍스트의 한 부분(청크)을 정리하는 map 단계 프롬프트
 
-5. **상세도**: 
-   - 나중에 이 노트만 보고도 강의 내용을 완전히 이해할 수 있도록 상세히 작성
-   - 암기가 필요한 부분은 별도로 정리
-   - 이해를 돕는 부연 설명 포함
+        전사 중에 시작하는 부분 요약은 전체 청크 수를 알 수 없으므로 순번만 넣습니다
+        (전사가 끝난 뒤 요약해도 같은 프롬프트가 되어 부분 요약 캐시를 공유).
+        """
+        if content_type == "lecture":
+            return ChatPrompt(LECTURE_CHUNK_SYSTEM_PROMPT, f"""원본 텍스트 ({index}번째 부분):
+{text}
 
-원본 텍스트:
+---
+
+위 부분의 강의 노트:""")
+        return ChatPrompt(MEETING_CHUNK_SYSTEM_PROMPT, f"""회의 내용 ({index}번째 부분):
 {text}
 
 ---
 
-위 강의 내용을 바탕으로 학생이 수업을 들으며 꼼꼼히 필기한 것처럼 
-완전하고 상세한 강의 노트를 작성해주세요. 
-내용을 요약하거나 생략하지 말고, 최대한 풍부하게 작성해주세요:"""
+위 부분의 회의록 초안:""")
 
-    def _get_meeting_prompt(self, text: str) -> str:
-        """회의용 프롬프트 템플릿"""
-        return f"""다음은 회의 내용을 음성 인식으로 변환한 텍스트입니다. 이를 체계적으로 정리하여 Markdown 형식의 회의록으로 만들어주세요.
+    def _get_reduce_prompt(self, notes: List[str], content_type: str, final: bool = True) -> ChatPrompt:
+        """부분 노트들을 하나로 합치는 reduce 단계 프롬프트"""
+        joined = "\n\n".join(f"[부분 {i}]\n{note}" for i, note in enumerate(notes, start=1))
+        
+        if content_type == "lecture":
+            return ChatPrompt(LECTURE_REDUCE_SYSTEM_PROMPTS[final], f"""{joined}
 
-# 중요 지시사항:
-- 이것은 회의록입니다. "강의"라는 단어를 절대 사용하지 마세요.
-- 반드시 "회의록", "회의 내용", "논의 사항" 등의 회의 관련 용어만 사용하세요.
+---
 
-# 요구사항:
-1. 회의의 주요 안건과 논의 사항을 중심으로 구조화
-2. 결정 사항과 액션 아이템을 명확히 구분
-3. 참여자별 발언 내용이 명확한 경우 정리
-4. 계층적 헤딩 사용 (## 회의 안건, ### 주요 논의사항, #### 세부 내용 등)
-5. 중요한 결정사항은 **굵게** 표시
-6. 액션 아이템은 체크리스트 형태로 표시
-7. 한국어로 자연스럽게 정리
-8. 제목은 "# 회의록" 또는 "## 회의 내용" 형태로 시작
+통합된 강의 노트:""")
+        return ChatPrompt(MEETING_REDUCE_SYSTEM_PROMPTS[final], f"""{joined}
 
-회의 내용:
-{text}
+---
+
+통합된 회의록:""")
 
-위 내용을 바탕으로 체계적인 **회의록**을 Markdown 형식으로 작성해주세요:"""
\ No newline at end of file
+
+class IncrementalSummary:
+    def __init__(
+        self,
+        service: OllamaService,
+        content_type: str,
+        model_name: str,
+        usage: Optional[dict] = None,
+        slot: Optional[SlotFactory] = None
+    ):
+        """
+        전사가 앞에서부터 확정되는 대로 청크별 부분 요약(map)을 미리 시작해 두는 요약
+        
+        청크 분할과 부분 요약 프롬프트가 전사가 끝난 뒤 한 번에 나누는 경우와 같으므로
+        결과와 부분 요약 캐시를 계층적 요약과 그대로 공유합니다.
+        전사가 끝나면 generate_summary(incremental=...)가 남은 청크를 요약하고 병합합니다.
+        
+        Args:
+            service: 요청을 보낼 OllamaService
+            content_type: 요약 유형 (lecture 또는 meeting)
+            model_name: 요약 모델
+            usage: 요청별 사용량을 더해 넣을 dict
+            slot: 전사 중에 보내는 부분 요약 요청마다 잡아 둘 실행 슬롯 (없으면 제한 없음)
+        """
+        self.service = service
+        self.content_type = content_type
+        self.model_name = model_name
+        self.usage = usage
+        self.slot = slot
+        self.semaphore = asyncio.Semaphore(service.map_concurrency)
+        self._accumulator = ChunkAccumulator(service.chunk_tokens, service.chunk_overlap_tokens)
+        self._text = ""
+        self._notes: List[asyncio.Task] = []
+        self._diverged = False
+    
+    async def feed(self, partial: dict):
+        """지금까지 확정된 전사({"text", ...})를 받아 다 찬 청크의 부분 요약 시작 (STT on_partial 콜백)"""
+        text = partial["text"]
+        if self._diverged:
+            return
+        if not text.startswith(self._text):
+            # 확정된 앞부분이 바뀌면 미리 한 요약을 버리고 전사가 끝난 뒤 처음부터 요약
+            print("Overlapped summary: transcript prefix changed, falling back to full summary")
+            self._diverged = True
+            self.cancel()
+            return
+        new_text, self._text = text[len(self._text):], text
+        for chunk in self._accumulator.add(new_text):
+            self._start_chunk(chunk, self.slot)
+    
+    def complete(self, text: str) -> Optional[List[asyncio.Task]]:
+        """
+        전사가 끝났을 때 남은 청크의 부분 요약까지 시작하고 전체 부분 요약 목록 반환
+        
+        이후 요청은 이미 잡은 요약 단계 슬롯 안에서 실행되므로 slot 없이 보냅니다.
+        미리 받은 전사가 최종 전사의 앞부분이 아니면 None (처음부터 요약해야 함).
+        """
+        if self._diverged or not text.startswith(self._text):
+            self.cancel()
+            return None
+        chunks = self._accumulator.add(text[len(self._text):]) + self._accumulator.flush()
+        self._text = text
+        for chunk in chunks:
+            self._start_chunk(chunk, None)
+        return list(self._notes)
+    
+    def done_count(self) -> int:
+        """끝난 부분 요약 수"""
+        return sum(1 for note in self._notes if note.done())
+    
+    async def drain(self):
+        """지금까지 시작한 부분 요약이 끝날 때까지 대기 (실패는 complete 이후 gather에서 전달)"""
+        if self._notes:
+            await asyncio.wait(list(self._notes))
+    
+    def cancel(self):
+        """진행 중인 부분 요약 취소 (전사 실패, 요약 캐시 적중 등)"""
+        for note in self._notes:
+            if not note.done():
+                note.cancel()
+            elif not note.cancelled():
+                note.exception()  # 확인하지 않은 예외 경고 방지
+    
+    def _start_chunk(self, chunk: str, slot: Optional[SlotFactory]):
+        index = len(self._notes) + 1
+        if index == 1 and slot is not None:
+            print(f"Starting overlapped summary for {self.content_type} ({self.model_name}) while transcribing")
+        self._notes.append(asyncio.create_task(self._summarize_chunk(index, chunk, slot)))
+    
+    async def _summarize_chunk(self, index: int, chunk: str, slot: Optional[SlotFactory]) -> str:
+        prompt = self.service._get_chunk_prompt(chunk, self.content_type, index)
+        if slot is None:
+            return await self.service._generate_cached(prompt, self.model_name, self.semaphore, self.usage)
+        async with slot():
+            return await self.service._generate_cached(prompt, self.model_name, self.semaphore, self.usage)
@@ -1,13 +1,25 @@
 import asyncio
-from typing import Optional
+from typing import Awaitable, Callable, Optional
+
+from .progress import ProgressCallback, report_progress
 
 class OllamaService:
-    def __init__(self, base_url: str = "http://localhost:11434"):
+    engine_name = "dummy"
+    prompt_version = "dummy"
+    
+    def __init__(self, base_url: str = "http://localhost:11434", cache=None):
         """
         Ollama 서비스 더미 구현 (테스트용)
         """
         self.base_url = base_url
+        self.cache = cache
         self.model_name = "llama3.1:8b"
+        self.stream = True
+        self.num_predict = 200  # 더미 요약의 대략적인 토큰 수
+    
+    async def close(self):
+        """리소스 정리 (더미)"""
+        pass
         
     async def check_model_availability(self) -> bool:
         """모델이 사용 가능한지 확인 (더미)"""
@@ -15,20 +27,43 @@ class OllamaService:
         await asyncio.sleep(0.2)
         return True  # 항상 사용 가능하다고 가정
     
-    async def generate_summary(self, text: str, content_type: str = "lecture") -> str:
+    def get_available_models(self):
+        """Ollama 모델 목록 (더미)"""
+        return [self.model_name]
+    
+    def has_model(self, model_name: str) -> bool:
+        """모델 보유 여부 (더미는 모든 모델이 있다고 가정)"""
+        return True
+    
+    async def ensure_model(self, model_name: str) -> bool:
+        """모델 보유 여부 확인 (더미는 모든 모델이 있다고 가정)"""
+        return True
+    
+    def start_incremental_summary(self, content_type: str = "lecture", model_name: Optional[str] = None, usage=None, slot=None):
+        """전사와 겹친 요약 (더미는 지원하지 않으므로 None, 전사가 끝난 뒤 한 번에 요약)"""
+        return None
+    
+    async def generate_summary(
+        self,
+        text: str,
+        content_type: str = "lecture",
+        on_chunk: Optional[Callable[[str, int], Awaitable[None]]] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        model_name: Optional[str] = None,
+        usage: Optional[dict] = None,
+        incremental=None
+    ) -> str:
         """
-        텍스트를 요약하여 Markdown 형식으로 변환 (더미)
+        텍스트를 요약하여 Markdown 형식으로 변환 (더미, usage와 incremental은 사용하지 않음)
         """
         if not await self.check_model_availability():
             raise Exception("Ollama 모델을 사용할 수 없습니다.")
         
         try:
-            print(f"[DUMMY] Generating summary with Ollama for {content_type}")
+            print(f"[DUMMY] Generating summary with Ollama for {content_type} ({model_name or self.model_name})")
             
-            # AI 처리 시뮬레이션 (더 긴 시간)
-            await asyncio.sleep(1.5)  # 초기 분석
-            await asyncio.sleep(1.5)  # 요약 생성
-            await asyncio.sleep(1)    # 최종 포맷팅
+            # AI 처리 시뮬레이션 (첫 토큰까지의 지연)
+            await asyncio.sleep(1.5)
             
             # 더미 요약 생성
             if content_type == "lecture":
@@ -36,6 +71,16 @@ class OllamaService:
             else:  # meeting
                 summary = self._generate_dummy_meeting_summary()
             
+            # 줄 단위로 스트리밍 시뮬레이션 (단어 수를 토큰 수로 간주)
+            token_count = 0
+            lines = summary.splitlines(keepends=True)
+            for line in lines:
+                await asyncio.sleep(2.5 / len(lines))
+                token_count += max(1, len(line.split()))
+                if on_chunk is not None:
+                    await on_chunk(line, token_count)
+                await report_progress(on_progress, token_count / self.num_predict, f"AI 요약 생성 중... ({token_count} 토큰)")
+            
             print(f"[DUMMY] Summary generated successfully. Length: {len(summary)} characters")
             return summary
                 
@@ -1,60 +1,342 @@
 import asyncio
-from .whisper_service import WhisperService
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple
 from .ollama_service import OllamaService
+from .. import config
+from . import audio_ingest
 from ..models.schemas import ProcessingType
+from . import metrics
+from .content_cache import ContentCache, make_cache_key, sha256_file, sha256_text
+from .model_policy import ModelChoice, ModelPolicy
+from .model_registry import ModelKey, ModelRegistry
+from .progress import ProgressCallback
+from .scheduler import ESTIMATED_BYTES_PER_SECOND
+from .stt_engines import available_engines, compute_type_for, load_engine_class
 
 class AudioProcessor:
     def __init__(self):
         """오디오 처리 서비스 통합 클래스"""
-        self.whisper_service = WhisperService(model_size="base")
-        self.ollama_service = OllamaService()
+        self.cache = ContentCache(config.CACHE_DIR, config.CACHE_MAX_BYTES)
+        # STT 모델은 레지스트리가 (엔진, 크기, 장치, 연산 타입)별로 한 번만 로드하여 공유
+        self.default_stt_engine = config.STT_ENGINE
+        self.model_key = self._model_key(config.STT_ENGINE)
+        self.models = ModelRegistry(
+            factory=lambda key: self._stt_service_class(key.engine)(
+                model_size=key.size,
+                device=key.device,
+                compute_type=key.compute_type
+            ),
+            preload=[self._model_key(config.STT_ENGINE, size) for size in config.WHISPER_PRELOAD],
+            idle_timeout=config.MODEL_IDLE_TIMEOUT_SECONDS,
+            memory_budget_bytes=config.MODEL_MEMORY_BUDGET_BYTES,
+            max_workers=config.STT_MAX_WORKERS
+        )
+        self.ollama_service = OllamaService(cache=self.cache)
+        # 작업마다 오디오 길이/대기열/품질 힌트로 STT 모델 크기와 요약 모델 선택
+        self.model_policy = ModelPolicy(
+            stt_ladder=config.WHISPER_MODEL_LADDER,
+            default_stt_size=config.WHISPER_MODEL_SIZE,
+            default_llm=self.ollama_service.model_name,
+            fast_llm=config.OLLAMA_FAST_MODEL,
+            backlog=config.MODEL_POLICY_BACKLOG,
+            long_audio_seconds=config.MODEL_POLICY_LONG_AUDIO_SECONDS,
+            enabled=config.MODEL_POLICY_ENABLED
+        )
         
-    async def transcribe_audio(self, audio_file_path: str) -> str:
+    async def shutdown(self):
+        """STT 워커 풀, Ollama 커넥션 풀 등 리소스 정리"""
+        await self.models.shutdown()
+        await self.ollama_service.close()
+        
+    def stt_engines(self) -> List[str]:
+        """이 서버에서 사용할 수 있는 STT 엔진 목록"""
+        return available_engines()
+    
+    def _model_key(self, engine: str, size: str = config.WHISPER_MODEL_SIZE) -> ModelKey:
+        """엔진의 기본 연산 타입으로 모델 키 생성"""
+        return ModelKey(engine, size, config.WHISPER_DEVICE, compute_type_for(engine))
+    
+    def _stt_service_class(self, engine: str):
+        """STT 엔진 서비스 클래스 (설치되지 않은 엔진이면 예외)"""
+        return load_engine_class(engine)
+        
+    @asynccontextmanager
+    async def stt_session(self, stt_engine: Optional[str] = None, model_size: Optional[str] = None) -> AsyncIterator[Any]:
+        """
+        STT 서비스를 빌려 씀 (실시간 전사처럼 여러 번 인식하는 동안 모델을 내리지 않음)
+        
+        Args:
+            stt_engine: STT 엔진 이름 (없으면 STT_ENGINE 설정값)
+            model_size: 모델 크기 (없으면 WHISPER_MODEL_SIZE)
+        """
+        model_key = self._model_key(stt_engine or self.default_stt_engine, model_size or config.WHISPER_MODEL_SIZE)
+        async with self.models.use(model_key) as stt_service:
+            yield stt_service
+    
+    async def audio_duration(self, audio_file_path: str) -> float:
+        """오디오 길이 (초, 디코딩하지 않고 헤더로 확인하며 알 수 없으면 파일 크기로 추정)"""
+        duration = await asyncio.to_thread(audio_ingest.probe_duration, audio_file_path)
+        if duration is None:
+            duration = os.path.getsize(audio_file_path) / ESTIMATED_BYTES_PER_SECOND
+        return duration
+    
+    def choose_stt_model(self, duration: float, queue_depth: int, quality: Optional[str] = None) -> ModelChoice:
+        """
+        이 작업의 STT 모델 크기 선택
+        
+        Args:
+            duration: 오디오 길이 (초, audio_duration)
+            queue_depth: 음성 인식을 기다리는 작업 수
+            quality: 품질 힌트 (fast, balanced, accurate)
+        """
+        return self.model_policy.choose_stt_size(duration, queue_depth, quality)
+    
+    async def cached_transcript(
+        self,
+        audio_file_path: str,
+        duration: float,
+        audio_hash: Optional[str] = None,
+        quality: Optional[str] = None,
+        stt_engine: Optional[str] = None,
+        language: str = "ko"
+    ) -> Optional[Tuple[ModelChoice, dict]]:
+        """
+        STT 슬롯을 잡고 모델을 고르기 전에 전사 캐시 조회
+        
+        대기열 길이를 빼고 정책이 고를 크기(또는 그보다 큰 모델)로 만든 전사가 있으면 재사용하므로
+        같은 파일은 부하와 관계없이 같은 결과로 적중합니다.
+        
+        Returns:
+            (전사한 모델 크기, transcribe_audio_segments와 같은 형식의 결과), 없으면 None
+        """
+        engine = stt_engine or self.default_stt_engine
+        service_class = self._stt_service_class(engine)
+        if audio_hash is None:
+            audio_hash = await asyncio.to_thread(sha256_file, audio_file_path)
+        
+        preferred = self.model_policy.choose_stt_size(duration, 0, quality).model
+        ladder = self.model_policy.stt_ladder
+        sizes = [preferred] + (ladder[ladder.index(preferred) + 1:] if preferred in ladder else [])
+        for size in sizes:
+            cache_key = self._transcript_cache_key(self._model_key(engine, size), service_class, audio_hash, language)
+            if not self.cache.contains("segments", cache_key):
+                continue
+            cached = await asyncio.to_thread(self.cache.get, "segments", cache_key)
+            if cached is not None:
+                print(f"Transcript cache hit: {audio_hash[:12]} ({engine} {size})")
+                return ModelChoice(size, "전사 캐시"), json.loads(cached)
+        return None
+    
+    def _transcript_cache_key(self, model_key: ModelKey, service_class, audio_hash: str, language: str) -> str:
+        """같은 오디오 + 엔진/모델 + 언어의 전사 캐시 키"""
+        return make_cache_key(
+            audio_hash,
+            service_class.engine_name,
+            model_key.size,
+            model_key.compute_type,
+            service_class.vad_options,
+            language
+        )
+    
+    def choose_llm_model(
+        self,
+        queue_depth: int,
+        quality: Optional[str] = None,
+        requested: Optional[str] = None
+    ) -> ModelChoice:
+        """
+        이 작업의 요약 모델 선택 (정책이 고른 모델이 Ollama에 없으면 기본 모델)
+        
+        Args:
+            queue_depth: 요약을 기다리는 작업 수
+            quality: 품질 힌트 (fast, balanced, accurate)
+            requested: 사용자가 지정한 모델 (있으면 정책 대신 그대로 사용)
+        """
+        if requested:
+            return ModelChoice(requested, "요청")
+        choice = self.model_policy.choose_llm_model(queue_depth, quality)
+        if choice.model != self.ollama_service.model_name and not self.ollama_service.has_model(choice.model):
+            return ModelChoice(self.ollama_service.model_name, f"기본 ({choice.model} 없음)")
+        return choice
+        
+    async def transcribe_audio(
+        self,
+        audio_file_path: str,
+        audio_hash: Optional[str] = None,
+        language: str = "ko",
+        on_progress: Optional[ProgressCallback] = None,
+        stt_engine: Optional[str] = None,
+        model_size: Optional[str] = None
+    ) -> str:
         """
         오디오 파일을 텍스트로 변환
         
         Args:
             audio_file_path: 오디오 파일 경로
+            audio_hash: 오디오 파일 sha256 (없으면 계산)
+            language: 언어 코드
+            on_progress: 음성 인식 진행률 콜백 (완료 비율, 메시지)
+            stt_engine: STT 엔진 이름 (없으면 STT_ENGINE 설정값)
+            model_size: 모델 크기 (없으면 WHISPER_MODEL_SIZE)
             
         Returns:
             변환된 텍스트
         """
+        result = await self.transcribe_audio_segments(audio_file_path, audio_hash, language, on_progress, stt_engine, model_size)
+        return result["text"]
+    
+    async def transcribe_audio_segments(
+        self,
+        audio_file_path: str,
+        audio_hash: Optional[str] = None,
+        language: str = "ko",
+        on_progress: Optional[ProgressCallback] = None,
+        stt_engine: Optional[str] = None,
+        model_size: Optional[str] = None,
+        on_partial: Optional[Callable[[dict], Awaitable[None]]] = None,
+        release_slot: Optional[Callable[[], None]] = None
+    ) -> dict:
+        """
+        오디오 파일을 시각/신뢰도가 포함된 세그먼트 단위로 변환
+        
+        Args는 transcribe_audio와 같고, on_partial은 앞에서부터 확정된 전사({"text", "segments"})가
+        늘어날 때마다 호출됩니다 (전사 캐시 적중 시에는 호출하지 않음).
+        release_slot은 짧은 오디오가 배치 대기열로 넘어가 STT 실행 슬롯이 더 필요 없을 때 호출됩니다.
+            
+        Returns:
+            {"text", "segments": [{"start", "end", "text", "confidence"}], "duration", "skipped_fraction"}
+        """
         try:
-            # Whisper를 사용하여 음성 인식
-            transcript = await self.whisper_service.transcribe(audio_file_path)
+            model_key = self._model_key(stt_engine or self.default_stt_engine, model_size or config.WHISPER_MODEL_SIZE)
+            service_class = self._stt_service_class(model_key.engine)
+            
+            # 같은 오디오 + 엔진/모델 + 언어의 전사 결과가 있으면 재사용
+            if audio_hash is None:
+                audio_hash = await asyncio.to_thread(sha256_file, audio_file_path)
+            cache_key = self._transcript_cache_key(model_key, service_class, audio_hash, language)
+            cached = await asyncio.to_thread(self.cache.get, "segments", cache_key)
+            if cached is not None:
+                print(f"Transcript cache hit: {audio_hash[:12]}")
+                return json.loads(cached)
+            
+            # 선택한 STT 엔진으로 음성 인식
+            async with self.models.use(model_key) as stt_service:
+                started = time.perf_counter()
+                result = await stt_service.transcribe_segments(
+                    audio_file_path,
+                    language=language,
+                    on_progress=on_progress,
+                    on_partial=on_partial,
+                    release_slot=release_slot
+                )
+                self._observe_stt(model_key, time.perf_counter() - started, result.get("duration"))
             
-            if not transcript or len(transcript.strip()) == 0:
+            if not result["text"] or len(result["text"].strip()) == 0:
                 raise Exception("음성 인식 결과가 비어있습니다. 오디오 파일을 확인해주세요.")
             
-            return transcript
+            await asyncio.to_thread(self.cache.put, "segments", cache_key, json.dumps(result, ensure_ascii=False))
+            return result
             
         except Exception as e:
             print(f"Audio transcription error: {e}")
             raise
     
-    async def generate_summary(self, text: str, processing_type: ProcessingType) -> str:
+    def _observe_stt(self, model_key: ModelKey, seconds: float, audio_seconds: Optional[float]):
+        """음성 인식 시간과 실시간 대비 처리 속도 기록"""
+        metrics.STT_SECONDS.observe(seconds, engine=model_key.engine, model=model_key.size)
+        if audio_seconds:
+            metrics.STT_RTF.observe(seconds / audio_seconds, engine=model_key.engine, model=model_key.size)
+            metrics.AUDIO_SECONDS.inc(audio_seconds, engine=model_key.engine, model=model_key.size)
+    
+    def start_incremental_summary(
+        self,
+        processing_type: ProcessingType,
+        llm_model: Optional[str] = None,
+        usage: Optional[dict] = None,
+        slot: Optional[Callable[[], Any]] = None
+    ) -> Any:
+        """
+        전사와 겹쳐 진행하는 요약 시작 (요약 서비스가 지원하지 않으면 None)
+        
+        반환값의 feed를 transcribe_audio_segments의 on_partial로 넘기면 전사 중에 청크별 부분 요약이 시작되고,
+        전사가 끝난 뒤 generate_summary의 incremental로 넘기면 남은 청크 요약과 병합을 진행합니다.
+        
+        Args:
+            processing_type: 처리 유형 (lecture 또는 meeting)
+            llm_model: 요약 모델 (없으면 OLLAMA_MODEL)
+            usage: Ollama 토큰 사용량을 더해 넣을 dict
+            slot: 전사 중에 보내는 부분 요약 요청마다 잡아 둘 실행 슬롯 (async context manager를 만드는 함수)
+        """
+        return self.ollama_service.start_incremental_summary(processing_type.value, llm_model, usage, slot)
+    
+    async def generate_summary(
+        self,
+        text: str,
+        processing_type: ProcessingType,
+        on_chunk: Optional[Callable[[str, int], Awaitable[None]]] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        llm_model: Optional[str] = None,
+        stt_engine: Optional[str] = None,
+        stt_model_size: Optional[str] = None,
+        usage: Optional[dict] = None,
+        incremental: Any = None
+    ) -> str:
         """
         텍스트를 요약하여 Markdown으로 변환
         
         Args:
             text: 요약할 텍스트
             processing_type: 처리 유형 (lecture 또는 meeting)
+            on_chunk: 스트리밍 생성 시 조각마다 호출되는 콜백 (조각, 누적 토큰 수)
+            on_progress: 요약 진행률 콜백 (완료 비율, 메시지)
+            llm_model: 요약 모델 (없으면 OLLAMA_MODEL)
+            stt_engine, stt_model_size: 전사에 사용한 STT 엔진/모델 크기 (메타데이터 기록용)
+            usage: Ollama 토큰 사용량/접두사 캐시로 아낀 프롬프트 처리 시간을 더해 넣을 dict
+            incremental: 전사 중에 시작해 둔 요약 (start_incremental_summary, 요약 캐시 적중 시 취소)
             
         Returns:
             Markdown 형식의 요약
         """
         try:
-            # Ollama를 사용하여 요약 생성
-            summary = await self.ollama_service.generate_summary(
-                text, 
-                content_type=processing_type.value
+            llm_model = llm_model or self.ollama_service.model_name
+            # 같은 전사 + 유형 + 프롬프트 버전 + 모델의 요약이 있으면 재사용
+            cache_key = make_cache_key(
+                sha256_text(text),
+                processing_type.value,
+                self.ollama_service.prompt_version,
+                self.ollama_service.engine_name,
+                llm_model
             )
+            summary = await asyncio.to_thread(self.cache.get, "summary", cache_key)
             
-            if not summary or len(summary.strip()) == 0:
-                raise Exception("요약 생성 결과가 비어있습니다.")
+            if summary is None:
+                # Ollama를 사용하여 요약 생성
+                with metrics.LLM_SECONDS.time(model=llm_model):
+                    summary = await self.ollama_service.generate_summary(
+                        text, 
+                        content_type=processing_type.value,
+                        on_chunk=on_chunk,
+                        on_progress=on_progress,
+                        model_name=llm_model,
+                        usage=usage,
+                        incremental=incremental
+                    )
+                
+                if not summary or len(summary.strip()) == 0:
+                    raise Exception("요약 생성 결과가 비어있습니다.")
+                
+                await asyncio.to_thread(self.cache.put, "summary", cache_key, summary)
+            else:
+                print(f"Summary cache hit for {processing_type.value}")
+                if incremental is not None:
+                    incremental.cancel()
             
             # 기본 메타데이터 추가
-            metadata = self._generate_metadata(processing_type, len(text))
+            stt_model = f"{stt_engine or self.default_stt_engine} {stt_model_size or config.WHISPER_MODEL_SIZE}"
+            metadata = self._generate_metadata(processing_type, len(text), stt_model, llm_model)
             final_summary = f"{metadata}\n\n---\n\n{summary}"
             
             return final_summary
@@ -93,7 +375,7 @@ class AudioProcessor:
             print(f"Complete audio processing error: {e}")
             raise
     
-    def _generate_metadata(self, processing_type: ProcessingType, text_length: int) -> str:
+    def _generate_metadata(self, processing_type: ProcessingType, text_length: int, stt_model: str, llm_model: str) -> str:
         """요약 메타데이터 생성"""
         from datetime import datetime
         
@@ -105,4 +387,4 @@ class AudioProcessor:
 **생성 일시**: {current_time}  
 **처리 유형**: {type_name}  
 **원본 텍스트 길이**: {text_length:,} 글자  
-**처리 엔진**: Whisper + Llama 3.1 8B"""
\ No newline at end of file
+**처리 엔진**: {stt_model} + {llm_model}"""
\ No newline at end of file
@@ -0,0 +1,35 @@
+from typing import Awaitable, Callable, Optional
+
+# 단계 진행률 콜백: (완료 비율 0.0 ~ 1.0, 상태 메시지)
+ProgressCallback = Callable[[float, str], Awaitable[None]]
+
+
+def format_seconds(seconds: float) -> str:
+    """초를 m:ss 형식으로 변환"""
+    seconds = int(seconds)
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+async def report_progress(on_progress: Optional[ProgressCallback], fraction: float, message: str):
+    """콜백이 있으면 진행률 전달 (비율은 0.0 ~ 1.0으로 제한)"""
+    if on_progress is not None:
+        await on_progress(min(1.0, max(0.0, fraction)), message)
+
+
+def scaled_progress(
+    on_progress: Optional[ProgressCallback],
+    start: float,
+    end: float
+) -> Optional[ProgressCallback]:
+    """
+    하위 작업의 진행률(0~1)을 상위 진행률의 [start, end] 구간으로 변환하는 콜백 생성
+
+    예: 계층적 요약에서 map 단계를 0.0~0.6, 최종 병합을 0.6~1.0으로 배분
+    """
+    if on_progress is None:
+        return None
+
+    async def scaled(fraction: float, message: str):
+        await report_progress(on_progress, start + (end - start) * fraction, message)
+
+    return scaled
@@ -0,0 +1,270 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+# 파일 크기로 오디오 길이를 추정할 때 사용하는 평균 비트레이트 (약 128kbps)
+ESTIMATED_BYTES_PER_SECOND = 16000
+
+
+def size_priority(file_size: int) -> float:
+    """
+    짧은 파일 우선 + 에이징 우선순위 (값이 작을수록 먼저 실행)
+
+    제출 시각에 추정 오디오 길이(초)를 더하므로 짧은 파일이 먼저 처리되지만,
+    긴 파일도 추정 길이만큼 기다리면 새로 들어오는 짧은 파일보다 앞서게 됩니다.
+    """
+    return time.time() + file_size / ESTIMATED_BYTES_PER_SECOND
+
+
+class QueueFullError(Exception):
+    """작업 대기열이 가득 참"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Job queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class PriorityLimiter:
+    def __init__(self, limit: int, on_change: Optional[Callable[[], None]] = None):
+        """
+        우선순위 순서로 슬롯을 배정하는 동시 실행 제한기
+
+        asyncio.Semaphore와 비슷하지만 대기자는 FIFO가 아니라 priority 값이 작은 순서로 깨어납니다.
+        on_change는 대기열 순서가 바뀔 때마다 호출됩니다.
+        """
+        self.limit = limit
+        self.on_change = on_change
+        self.active = 0
+        self._waiters: List[list] = []  # heap: [priority, seq, key, future]
+        self._seq = itertools.count()
+
+    async def acquire(self, key: str, priority: float):
+        # 대기자가 있으면 release()가 슬롯을 직접 넘겨주므로 active < limit이면 바로 실행 가능
+        if self.active < self.limit:
+            self.active += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, [priority, next(self._seq), key, future])
+        self._changed()
+        try:
+            await future
+        except asyncio.CancelledError:
+            # 슬롯을 넘겨받은 직후 취소되었다면 슬롯을 반납
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                self._changed()
+            raise
+
+    def release(self):
+        # 대기자가 있으면 슬롯을 바로 넘겨줌 (active 수는 그대로)
+        while self._waiters:
+            _, _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                self._changed()
+                return
+        self.active -= 1
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change()
+
+    def waiting_keys(self) -> List[str]:
+        """대기 중인 키 (실행될 순서대로)"""
+        return [key for _, _, key, future in sorted(self._waiters, key=lambda w: (w[0], w[1])) if not future.done()]
+
+    def position(self, key: str) -> Optional[int]:
+        """대기 순번 (0부터, 대기 중이 아니면 None)"""
+        try:
+            return self.waiting_keys().index(key)
+        except ValueError:
+            return None
+
+
+class StageSlot:
+    """stage()가 넘겨주는 실행 슬롯 (단계가 끝나기 전에 슬롯만 먼저 반납할 수 있음)"""
+
+    def __init__(self, limiter: PriorityLimiter):
+        self._limiter = limiter
+        self.released = False
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self._limiter.release()
+
+
+class JobScheduler:
+    def __init__(
+        self,
+        stt_concurrency: int,
+        llm_concurrency: int,
+        max_queue: int,
+        on_queue_change: Optional[Callable[[Dict[str, List[str]]], None]] = None,
+        max_summary_queue: Optional[int] = None
+    ):
+        """
+        STT/LLM 단계별 동시 실행 수를 제한하는 작업 스케줄러
+
+        Args:
+            stt_concurrency: 동시에 실행할 음성 인식 작업 수
+            llm_concurrency: 동시에 실행할 요약 작업 수
+            max_queue: 음성 인식을 기다릴 수 있는 최대 작업 수 (초과 시 QueueFullError)
+            on_queue_change: 대기 순서가 바뀔 때 단계별 대기 작업 목록과 함께 호출
+            max_summary_queue: 요약만 하는 작업(needs_stt=False)이 요약을 기다릴 수 있는 최대 수 (기본값: max_queue)
+        """
+        self.max_queue = max_queue
+        self.max_summary_queue = max_summary_queue or max_queue
+        self.on_queue_change = on_queue_change
+        self._limiters = {
+            "stt": PriorityLimiter(stt_concurrency, on_change=self._queue_changed),
+            "llm": PriorityLimiter(llm_concurrency, on_change=self._queue_changed),
+        }
+        # 단계별 평균 소요 시간 (지수 이동 평균, 초) - 예상 시작 시각 계산용
+        self._avg_duration = {"stt": 30.0, "llm": 30.0}
+        self._priorities: Dict[str, float] = {}
+        self._queued: Set[str] = set()  # 아직 STT를 시작하지 못한 작업
+        self._summary_queued: Set[str] = set()  # 요약만 하는 작업 중 아직 요약을 시작하지 못한 작업
+        self._jobs: Dict[str, asyncio.Task] = {}
+
+    def is_full(self, needs_stt: bool = True) -> bool:
+        """needs_stt=False이면 요약만 하는 작업의 대기열 기준"""
+        if needs_stt:
+            return len(self._queued) >= self.max_queue
+        return len(self._summary_queued) >= self.max_summary_queue
+
+    def retry_after(self, needs_stt: bool = True) -> int:
+        """대기열이 빌 때까지의 대략적인 시간 (초)"""
+        stage, queued = ("stt", self._queued) if needs_stt else ("llm", self._summary_queued)
+        return max(1, math.ceil(self._avg_duration[stage] * len(queued) / self._limiters[stage].limit))
+
+    def submit(
+        self,
+        task_id: str,
+        job: Callable[[], Awaitable[None]],
+        priority: float = 0.0,
+        force: bool = False,
+        needs_stt: bool = True
+    ):
+        """
+        작업 제출 (job 안에서 stage()로 각 단계의 슬롯을 얻음)
+        
+        force=True이면 대기열 크기 제한을 무시합니다 (재시작 후 복구되는 작업 등).
+        needs_stt=False이면 이미 전사를 마치고 요약만 남은 작업으로 보고 STT 대기열 대신
+        요약 대기열(max_summary_queue)에 셉니다.
+
+        Raises:
+            QueueFullError: 대기열이 가득 찬 경우
+        """
+        if self.is_full(needs_stt) and not force:
+            raise QueueFullError(self.retry_after(needs_stt))
+
+        self._priorities[task_id] = priority
+        if needs_stt:
+            self._queued.add(task_id)
+        else:
+            self._summary_queued.add(task_id)
+        task = asyncio.create_task(job())
+        self._jobs[task_id] = task
+        # 같은 ID로 다시 제출된 작업의 기록을 이전 작업의 완료 콜백이 지우지 않도록 작업 객체로 확인
+        task.add_done_callback(lambda done: self._forget(task_id, done))
+
+    def queue_depth(self, stage: str = "stt") -> int:
+        """단계를 기다리는 작업 수 (stt는 아직 음성 인식을 시작하지 못한 작업 전체)"""
+        if stage == "stt":
+            return len(self._queued)
+        return len(self._limiters[stage].waiting_keys())
+
+    def skip_stt(self, task_id: str):
+        """STT 단계를 건너뛰는 작업(전사 캐시 적중 등)을 STT 대기열에서 제외"""
+        if task_id in self._queued:
+            self._queued.discard(task_id)
+            self._queue_changed()
+
+    def is_running(self, task_id: str) -> bool:
+        """이 프로세스에서 실행(또는 대기) 중인 작업인지 (끝났지만 완료 콜백이 아직 실행되지 않은 작업은 제외)"""
+        task = self._jobs.get(task_id)
+        return task is not None and not task.done()
+
+    def _queue_changed(self):
+        if self.on_queue_change is not None:
+            self.on_queue_change({name: limiter.waiting_keys() for name, limiter in self._limiters.items()})
+
+    def _forget(self, task_id: str, task: asyncio.Task):
+        if self._jobs.get(task_id) is not task:
+            return  # 같은 ID로 다시 제출된 작업이 이미 있음
+        self._jobs.pop(task_id, None)
+        self._priorities.pop(task_id, None)
+        self._queued.discard(task_id)
+        self._summary_queued.discard(task_id)
+
+    @asynccontextmanager
+    async def stage(self, name: str, task_id: str, record_duration: bool = True, priority: Optional[float] = None):
+        """
+        단계("stt" 또는 "llm") 실행 슬롯 획득
+
+        record_duration=False이면 단계 일부만 실행하는 짧은 점유(전사 중의 부분 요약 요청 등)로 보고
+        예상 시작 시각 계산용 평균 소요 시간에 넣지 않습니다.
+        with 블록에는 StageSlot이 넘어가며, 슬롯이 더 필요 없어지면(배치 대기열로 넘어간 짧은 오디오 등)
+        블록이 끝나기 전에 release()로 먼저 반납할 수 있습니다.
+        priority를 주면 제출할 때의 우선순위 대신 사용합니다 (submit하지 않는 실시간 전사 구간 등).
+        """
+        limiter = self._limiters[name]
+        if priority is None:
+            priority = self._priorities.get(task_id, 0.0)
+        await limiter.acquire(task_id, priority)
+        if name == "stt":
+            self._queued.discard(task_id)
+        else:
+            self._summary_queued.discard(task_id)
+
+        slot = StageSlot(limiter)
+        started = time.monotonic()
+        try:
+            yield slot
+        finally:
+            slot.release()
+            if record_duration:
+                elapsed = time.monotonic() - started
+                self._avg_duration[name] = 0.8 * self._avg_duration[name] + 0.2 * elapsed
+
+    def queue_position(self, task_id: str) -> Optional[int]:
+        """대기 순번 (1부터, 실행 중이거나 없는 작업이면 None)"""
+        for limiter in self._limiters.values():
+            position = limiter.position(task_id)
+            if position is not None:
+                return position + 1
+        return None
+
+    def estimated_start(self, task_id: str) -> Optional[datetime]:
+        """대기 중인 단계의 예상 시작 시각"""
+        for name, limiter in self._limiters.items():
+            position = limiter.position(task_id)
+            if position is not None:
+                rounds = position // limiter.limit + 1
+                return datetime.now() + timedelta(seconds=rounds * self._avg_duration[name])
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "queued": len(self._queued),
+            "max_queue": self.max_queue,
+            "summary_queued": len(self._summary_queued),
+            "max_summary_queue": self.max_summary_queue,
+            "stages": {
+                name: {
+                    "limit": limiter.limit,
+                    "active": limiter.active,
+                    "waiting": len(limiter.waiting_keys()),
+                    "avg_duration_seconds": round(self._avg_duration[name], 2)
+                }
+                for name, limiter in self._limiters.items()
+            }
+        }
@@ -0,0 +1,127 @@
+import functools
+import math
+import os
+import shutil
+import tempfile
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# 작업별 세그먼트 파일 확장자 (results/<task_id>.segments.npz)
+SEGMENTS_SUFFIX = ".segments.npz"
+
+
+def segments_path(results_dir: str, task_id: str) -> str:
+    """작업의 세그먼트 파일 경로"""
+    return os.path.join(results_dir, f"{task_id}{SEGMENTS_SUFFIX}")
+
+
+def save_segments(path: str, segments: List[dict]):
+    """
+    세그먼트를 열 단위 배열로 저장
+
+    시각과 신뢰도는 float32 배열, 텍스트는 UTF-8 바이트를 이어 붙인 배열과 세그먼트별 시작 위치로 저장하므로
+    세그먼트 수와 무관하게 파일 하나에 압축 없이 담기고, 구간 조회 시 필요한 텍스트만 디코딩합니다.
+    신뢰도가 없는 세그먼트는 NaN으로 저장합니다.
+    """
+    encoded = [segment["text"].encode("utf-8") for segment in segments]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(text) for text in encoded])
+    confidence = [segment.get("confidence") for segment in segments]
+
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(
+                f,
+                start=np.array([segment["start"] for segment in segments], dtype=np.float32),
+                end=np.array([segment["end"] for segment in segments], dtype=np.float32),
+                confidence=np.array([math.nan if value is None else value for value in confidence], dtype=np.float32),
+                text_offsets=offsets,
+                text=np.frombuffer(b"".join(encoded), dtype=np.uint8)
+            )
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def share_segments(source_path: str, path: str):
+    """
+    다른 작업의 세그먼트 파일을 이 작업 경로에서도 조회할 수 있게 연결
+
+    파일은 저장 후 바뀌지 않으므로 하드 링크로 공유하고 (원래 작업이 먼저 삭제되어도 남음),
+    하드 링크를 만들 수 없는 파일 시스템에서는 복사합니다.
+    """
+    try:
+        os.link(source_path, path)
+    except OSError:
+        shutil.copyfile(source_path, path)
+
+
+def load_segments(path: str) -> "SegmentTable":
+    """세그먼트 파일 열기 (같은 파일은 바뀌지 않는 한 다시 읽지 않음)"""
+    return _load(path, os.stat(path).st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=32)
+def _load(path: str, mtime_ns: int) -> "SegmentTable":
+    with np.load(path) as data:
+        return SegmentTable(data["start"], data["end"], data["confidence"], data["text_offsets"], data["text"])
+
+
+class SegmentTable:
+    def __init__(
+        self,
+        start: np.ndarray,
+        end: np.ndarray,
+        confidence: np.ndarray,
+        text_offsets: np.ndarray,
+        text: np.ndarray
+    ):
+        """
+        열 단위로 저장된 세그먼트 조회
+
+        세그먼트는 시작 시각 순서이므로 시각 구간은 이진 탐색으로 세그먼트 번호 구간으로 바꿉니다.
+        """
+        self.start = start
+        self.end = end
+        self.confidence = confidence
+        self.text_offsets = text_offsets
+        self.text = text
+        # 겹치는 세그먼트가 있어도 이진 탐색할 수 있도록 끝 시각의 누적 최댓값 사용
+        self._end_max = np.maximum.accumulate(end) if len(end) else end
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    @property
+    def duration(self) -> float:
+        """마지막 세그먼트가 끝나는 시각 (초)"""
+        return round(float(self._end_max[-1]), 2) if len(self) else 0.0
+
+    def time_range(self, start_time: Optional[float] = None, end_time: Optional[float] = None) -> Tuple[int, int]:
+        """
+        [start_time, end_time) 시각 구간과 겹치는 세그먼트 번호 구간
+
+        Returns:
+            (첫 세그먼트 번호, 마지막 세그먼트 번호 + 1)
+        """
+        first = 0 if start_time is None else int(np.searchsorted(self._end_max, start_time, side="right"))
+        last = len(self) if end_time is None else int(np.searchsorted(self.start, end_time, side="left"))
+        return first, max(first, last)
+
+    def rows(self, first: int, last: int) -> List[dict]:
+        """[first, last) 세그먼트를 {"index", "start", "end", "text", "confidence"} 목록으로 변환"""
+        rows = []
+        for index in range(max(0, first), min(last, len(self))):
+            confidence = float(self.confidence[index])
+            text = self.text[self.text_offsets[index]:self.text_offsets[index + 1]].tobytes().decode("utf-8")
+            rows.append({
+                "index": index,
+                "start": round(float(self.start[index]), 2),
+                "end": round(float(self.end[index]), 2),
+                "text": text,
+                "confidence": None if math.isnan(confidence) else round(confidence, 3)
+            })
+        return rows
@@ -0,0 +1,575 @@
+import asyncio
+import itertools
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .. import config
+from . import audio_ingest, vad
+from .micro_batch import MicroBatcher
+from .progress import ProgressCallback, format_seconds, report_progress
+
+# 무음이 이 비율 이상일 때만 음성 구간을 잘라 붙여서 인식
+VAD_MIN_SKIP_FRACTION = 0.05
+# 이 길이(초) 이하의 오디오는 다른 요청과 묶어 배치로 인식 (Whisper 입력 창 하나)
+BATCH_MAX_CLIP_SECONDS = 30.0
+# 긴 오디오 모드: 강제로 자른 청크 경계의 겹침 길이, 최소 청크 길이 (초)
+CHUNK_OVERLAP_SECONDS = 2.0
+MIN_CHUNK_SECONDS = 60.0
+
+# 음성 구간 검출 설정 (None이면 사용 안 함)
+VAD_OPTIONS = {
+    "threshold_db": config.VAD_THRESHOLD_DB,
+    "min_silence_ms": config.VAD_MIN_SILENCE_MS,
+    "pad_ms": config.VAD_PAD_MS
+} if config.VAD_ENABLED else None
+
+# 엔진별 모델 추론 함수: (16kHz PCM, 언어, 진행 보고(위치 초, 전체 초)) -> [{"start", "end", "text", "avg_logprob"(선택)}]
+ModelTranscribe = Callable[[np.ndarray, str, Callable[[float, float], None]], List[dict]]
+# 엔진별 배치 추론 함수: (클립 목록, 언어) -> 클립별 세그먼트 목록
+ModelTranscribeBatch = Callable[[List[np.ndarray], str], List[List[dict]]]
+# 앞에서부터 확정된 전사가 늘어날 때마다 호출: {"text", "segments"} (최종 결과의 앞부분과 같음)
+PartialCallback = Callable[[dict], Awaitable[None]]
+
+
+def _load_speech(
+    pcm_path: str,
+    start: int,
+    end: int,
+    vad_options: Optional[dict]
+) -> Tuple[Optional[np.ndarray], vad.TimestampMap, float, float]:
+    """
+    PCM 구간을 읽고 vad_options가 있으면 음성 구간만 이어 붙임
+
+    Returns:
+        (인식할 오디오 - 음성이 없으면 None, 시각 변환표, 구간 길이(초), 건너뛴 비율)
+    """
+    # 메모리 맵 구간 슬라이스 (VAD는 복사 없이 읽음)
+    audio = audio_ingest.open_pcm(pcm_path)[start:end]
+    duration = len(audio) / vad.SAMPLE_RATE
+    timestamp_map = vad.TimestampMap([])
+    skipped = 0.0
+
+    if vad_options is not None:
+        regions = vad.detect_speech(audio, **vad_options)
+        skipped = 1.0 - vad.speech_fraction(regions, len(audio))
+        if not regions:
+            return None, timestamp_map, duration, 1.0
+        # 잘라낼 무음이 거의 없으면 원본 그대로 인식 (이어 붙인 경계의 영향 방지)
+        if skipped >= VAD_MIN_SKIP_FRACTION:
+            audio, timestamp_map = vad.compact_audio(audio, regions)
+        else:
+            skipped = 0.0
+        print(f"[worker {os.getpid()}] VAD: {len(regions)} speech regions, skipped {skipped:.1%} of {duration:.1f}s")
+
+    if isinstance(audio, np.memmap):
+        # 무음을 잘라내지 않았으면 모델에 넘길 구간만 메모리로 복사 (모델은 쓰기 가능한 배열을 요구)
+        audio = np.array(audio)
+    return audio, timestamp_map, duration, skipped
+
+
+def _confidence(segment: dict) -> Optional[float]:
+    """세그먼트 토큰 평균 로그 확률을 0~1 신뢰도로 변환 (엔진이 주지 않으면 None)"""
+    avg_logprob = segment.get("avg_logprob")
+    if avg_logprob is None:
+        return None
+    return round(math.exp(min(0.0, avg_logprob)), 3)
+
+
+def _build_result(raw_segments: List[dict], timestamp_map: vad.TimestampMap, duration: float, skipped: float) -> dict:
+    """엔진이 반환한 세그먼트의 시각을 구간 기준으로 되돌려 공통 결과 구조로 만듦"""
+    segments = [
+        {
+            "start": round(timestamp_map.to_original(segment["start"]), 2),
+            "end": round(timestamp_map.to_original(segment["end"]), 2),
+            "text": segment["text"].strip(),
+            "confidence": _confidence(segment)
+        }
+        for segment in raw_segments
+    ]
+    return {
+        "text": " ".join(segment["text"] for segment in segments if segment["text"]),
+        "segments": segments,
+        "duration": duration,
+        "skipped_fraction": skipped
+    }
+
+
+def transcribe_pcm_range(
+    pcm_path: str,
+    start: int,
+    end: int,
+    language: str,
+    progress_queue,
+    vad_options: Optional[dict],
+    model_transcribe: ModelTranscribe
+) -> dict:
+    """
+    워커 프로세스에서 디코딩된 PCM의 [start, end) 샘플 구간 인식 (엔진 공통 부분)
+
+    vad_options가 있으면 음성 구간만 이어 붙여 model_transcribe에 넘기고,
+    세그먼트 시각을 구간 기준으로 되돌립니다. 진행률은 (완료 비율, 메시지)로 progress_queue에 보냅니다.
+
+    Returns:
+        {"text", "segments": [{"start", "end", "text", "confidence"}], "duration", "skipped_fraction"}
+    """
+    audio, timestamp_map, duration, skipped = _load_speech(pcm_path, start, end, vad_options)
+    if audio is None:
+        return _build_result([], timestamp_map, duration, skipped)
+    if vad_options is not None and progress_queue is not None:
+        progress_queue.put((0.0, f"무음 {skipped:.0%} 제외, 음성 구간 인식 중..."))
+
+    def report(position: float, total: float):
+        if progress_queue is not None and total:
+            progress_queue.put((
+                position / total,
+                f"음성 인식 중... ({format_seconds(timestamp_map.to_original(position))} / {format_seconds(duration)})"
+            ))
+
+    return _build_result(model_transcribe(audio, language, report), timestamp_map, duration, skipped)
+
+
+def transcribe_pcm_batch(
+    clips: List[Tuple[str, int, int]],
+    language: str,
+    vad_options: Optional[dict],
+    model_transcribe_batch: ModelTranscribeBatch
+) -> List[dict]:
+    """
+    워커 프로세스에서 짧은 클립 여러 개를 한 번의 배치 추론으로 인식
+
+    Args:
+        clips: (PCM 파일 경로, 시작 샘플, 끝 샘플) 목록 - 각각 BATCH_MAX_CLIP_SECONDS 이하
+        language: 언어 코드 (배치의 모든 클립이 같은 언어)
+
+    Returns:
+        클립별 {"text", "segments", "duration", "skipped_fraction"} (clips와 같은 순서)
+    """
+    prepared = [_load_speech(pcm_path, start, end, vad_options) for pcm_path, start, end in clips]
+    speech = [audio for audio, _, _, _ in prepared if audio is not None]
+    batch_segments = iter(model_transcribe_batch(speech, language) if speech else [])
+    print(f"[worker {os.getpid()}] Batched {len(speech)} clips")
+    return [
+        _build_result(next(batch_segments) if audio is not None else [], timestamp_map, duration, skipped)
+        for audio, timestamp_map, duration, skipped in prepared
+    ]
+
+
+def stitch_chunks(chunks: List[Tuple[int, int]], results: List[dict], duration: float) -> dict:
+    """
+    청크별 인식 결과를 원본 시각 기준으로 이어 붙임
+
+    겹치는 청크 경계에서는 겹친 구간의 가운데를 기준으로 앞 청크와 뒤 청크의 세그먼트를 나누어 쓰고,
+    경계에서 같은 문장이 연속으로 인식되면 한 번만 남깁니다.
+    """
+    segments: List[dict] = []
+    skipped_seconds = 0.0
+    for index, ((start, end), result) in enumerate(zip(chunks, results)):
+        offset = start / vad.SAMPLE_RATE
+        keep_from, keep_until = -math.inf, math.inf
+        if index > 0 and start < chunks[index - 1][1]:
+            keep_from = (start + chunks[index - 1][1]) / 2 / vad.SAMPLE_RATE
+        if index + 1 < len(chunks) and chunks[index + 1][0] < end:
+            keep_until = (chunks[index + 1][0] + end) / 2 / vad.SAMPLE_RATE
+
+        for segment in result["segments"]:
+            segment_start = segment["start"] + offset
+            segment_end = segment["end"] + offset
+            if not keep_from <= (segment_start + segment_end) / 2 < keep_until:
+                continue
+            if not segment["text"] or (segments and segment["text"] == segments[-1]["text"]):
+                continue
+            segments.append({
+                "start": round(segment_start, 2),
+                "end": round(segment_end, 2),
+                "text": segment["text"],
+                "confidence": segment.get("confidence")
+            })
+
+        skipped_seconds += result["skipped_fraction"] * result["duration"]
+
+    return {
+        "text": " ".join(segment["text"] for segment in segments),
+        "segments": segments,
+        "duration": duration,
+        "skipped_fraction": min(1.0, skipped_seconds / duration) if duration else 0.0
+    }
+
+
+class _ProgressChannel:
+    """
+    워커 -> 부모 진행률 전달 통로
+
+    한 워커 풀의 모든 작업이 매니저 큐 하나를 함께 쓰고, 부모의 전달 스레드 하나가
+    작업 번호로 구분해 해당 작업에 넘깁니다. 워커 쪽에서는 큐처럼 put((완료 비율, 메시지))만 호출합니다.
+    """
+
+    def __init__(self, progress_queue, job_id: int):
+        self.progress_queue = progress_queue
+        self.job_id = job_id
+
+    def put(self, item: Tuple[float, str]):
+        self.progress_queue.put((self.job_id, item))
+
+
+class STTService:
+    """
+    STT 엔진 공통 구현
+
+    워커 프로세스 풀 관리, 디코딩, VAD, 긴 오디오 병렬 처리, 진행률 전달은 엔진과 무관하게 여기서 처리하고,
+    엔진별 클래스는 워커 프로세스에서 실행될 모듈 수준 함수 세 가지와 메모리 추정치만 지정합니다.
+
+    - worker_init(model_size, num_threads, device, compute_type): 워커 프로세스에서 모델 로드
+    - worker_warm_up() -> pid: 짧은 입력으로 한 번 추론
+    - worker_transcribe(pcm_path, start, end, language, progress_queue, vad_options) -> dict
+      (progress_queue는 put((완료 비율, 메시지))만 지원하는 진행률 통로, 진행률이 필요 없으면 None)
+    - worker_transcribe_batch(clips, language, vad_options) -> List[dict] (선택, 짧은 클립 배치 인식)
+    """
+    engine_name = ""
+    vad_options = VAD_OPTIONS
+    # 워커 프로세스 하나가 모델을 로드했을 때의 대략적인 메모리 사용량 (MB)
+    model_memory_mb: Dict[str, int] = {}
+    worker_init: Callable = None
+    worker_warm_up: Callable = None
+    worker_transcribe: Callable = None
+    worker_transcribe_batch: Optional[Callable] = None
+
+    def __init__(
+        self,
+        model_size: str = config.WHISPER_MODEL_SIZE,
+        num_workers: Optional[int] = None,
+        device: str = config.WHISPER_DEVICE,
+        compute_type: str = "float32"
+    ):
+        """
+        Args:
+            model_size: tiny, base, small, medium, large
+            num_workers: STT 워커 프로세스 수 (기본값: WHISPER_WORKERS 환경 변수)
+            device: cpu 또는 cuda
+            compute_type: 엔진별 연산 타입 (float32, float16, int8 등)
+        """
+        self.model_size = model_size
+        self.num_workers = num_workers or config.WHISPER_WORKERS
+        self.device = device
+        self.compute_type = compute_type
+        # 이 길이 이상의 오디오는 청크로 나누어 여러 워커에서 동시에 인식
+        self.long_audio_min_seconds = config.LONG_AUDIO_MIN_SECONDS
+        self.long_audio_chunk_seconds = config.LONG_AUDIO_CHUNK_SECONDS
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # 워커 -> 부모 진행률 전달: 매니저 프로세스의 큐 하나와 이를 읽는 전달 스레드 하나 (작업마다 만들지 않음)
+        self._manager = None
+        self._progress_queue = None
+        self._progress_thread: Optional[threading.Thread] = None
+        self._progress_listeners: Dict[int, Callable[[float, str], None]] = {}
+        self._job_ids = itertools.count()
+        # 짧은 오디오를 모아서 한 번에 인식 (엔진이 배치 추론을 지원할 때만)
+        self._batcher: Optional[MicroBatcher] = None
+        if config.WHISPER_BATCH_SIZE > 1 and type(self).worker_transcribe_batch is not None:
+            # 배치로 묶을 짧은 오디오는 스케줄러의 STT 슬롯 대신 배처가 워커 수 x 배치 크기까지 받음
+            self._batcher = MicroBatcher(
+                self._run_batch,
+                config.WHISPER_BATCH_SIZE,
+                config.WHISPER_BATCH_WAIT_MS / 1000,
+                max_pending=self.num_workers * config.WHISPER_BATCH_SIZE
+            )
+
+    async def load_model(self):
+        """워커 풀 시작 (각 워커가 모델을 로드)"""
+        if self._executor is None:
+            print(f"Starting {self.engine_name} worker pool: {self.num_workers} workers, model {self.model_size} ({self.compute_type})")
+            # torch/CTranslate2는 fork 이후 안전하지 않으므로 spawn 사용
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=type(self).worker_init,
+                initargs=(
+                    self.model_size,
+                    max(1, config.CPU_COUNT // self.num_workers),
+                    self.device,
+                    self.compute_type
+                )
+            )
+            self._manager = multiprocessing.get_context("spawn").Manager()
+            self._progress_queue = self._manager.Queue()
+            self._progress_thread = threading.Thread(
+                target=self._relay_progress_loop,
+                args=(self._progress_queue, asyncio.get_running_loop()),
+                name=f"{self.engine_name}-progress",
+                daemon=True
+            )
+            self._progress_thread.start()
+
+    async def warm_up(self):
+        """모든 워커 프로세스를 띄워 모델을 로드하고 한 번씩 추론"""
+        await self.load_model()
+        loop = asyncio.get_running_loop()
+        # 워커 수만큼 동시에 제출하면 풀이 워커를 모두 띄움
+        pids = await asyncio.gather(*(
+            loop.run_in_executor(self._executor, type(self).worker_warm_up)
+            for _ in range(self.num_workers)
+        ))
+        print(f"{self.engine_name} workers warmed up: {sorted(set(pids))}")
+
+    def estimated_memory_bytes(self) -> int:
+        """워커 풀 전체의 대략적인 메모리 사용량"""
+        per_worker_mb = self.model_memory_mb.get(self.model_size.split(".")[0].split("-")[0], 1000)
+        return per_worker_mb * self.num_workers * 1024 * 1024
+
+    def shutdown(self):
+        """워커 풀 종료"""
+        if self._batcher is not None:
+            self._batcher.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._progress_thread is not None:
+            # 전달 스레드 종료 신호 (매니저를 내리기 전에 보내야 큐가 살아 있음)
+            try:
+                self._progress_queue.put(None)
+            except Exception:
+                pass
+            self._progress_thread.join(timeout=1)
+            self._progress_thread = None
+            self._progress_queue = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+    async def transcribe(
+        self,
+        audio_file_path: str,
+        language: str = "ko",
+        on_progress: Optional[ProgressCallback] = None
+    ) -> str:
+        """
+        오디오 파일을 텍스트로 변환
+
+        Args:
+            audio_file_path: 오디오 파일 경로
+            language: 언어 코드 (ko: 한국어, en: 영어)
+            on_progress: 디코딩한 오디오 길이 / 전체 길이로 계산한 진행률 콜백
+
+        Returns:
+            변환된 텍스트
+        """
+        result = await self.transcribe_segments(audio_file_path, language, on_progress)
+        return result["text"]
+
+    async def transcribe_segments(
+        self,
+        audio_file_path: str,
+        language: str = "ko",
+        on_progress: Optional[ProgressCallback] = None,
+        on_partial: Optional[PartialCallback] = None,
+        release_slot: Optional[Callable[[], None]] = None
+    ) -> dict:
+        """
+        오디오 파일을 세그먼트(원본 오디오 기준 시각 포함) 단위로 변환
+
+        VAD가 켜져 있으면 무음 구간을 건너뛰고 음성 구간만 인식합니다.
+        on_partial이 있으면 긴 오디오는 워커가 하나여도 청크로 나누어 앞 청크부터 확정된 전사를 넘기고
+        (요약을 전사와 겹쳐 시작하는 용도), 그 외에는 끝난 뒤 전체 결과로 한 번 호출합니다.
+        release_slot은 짧은 오디오가 배치 대기열로 넘어갈 때 호출됩니다 (스케줄러의 STT 슬롯을 먼저 반납해
+        다른 짧은 오디오가 같은 배치에 합류하도록, 배치 대기열은 배처가 따로 제한).
+
+        Returns:
+            {"text", "segments": [{"start", "end", "text", "confidence"}], "duration", "skipped_fraction"}
+        """
+        if not os.path.exists(audio_file_path):
+            raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
+
+        await self.load_model()
+
+        try:
+            print(f"Transcribing audio file: {audio_file_path} ({self.engine_name})")
+
+            # 업로드 파일 옆에 한 번만 디코딩해 두고 워커들은 같은 PCM 파일의 구간을 메모리 맵으로 읽음
+            pcm_path = await asyncio.to_thread(audio_ingest.ensure_pcm, audio_file_path)
+            audio = audio_ingest.open_pcm(pcm_path)
+            duration = len(audio) / vad.SAMPLE_RATE
+            if duration >= self.long_audio_min_seconds and (self.num_workers > 1 or on_partial is not None):
+                result = await self._transcribe_long(pcm_path, audio, language, on_progress, on_partial)
+            else:
+                if duration <= BATCH_MAX_CLIP_SECONDS and self._batcher is not None:
+                    if release_slot is not None:
+                        release_slot()
+                    result = await self._transcribe_batched(pcm_path, len(audio), language, on_progress)
+                else:
+                    result = await self._transcribe_range(pcm_path, 0, len(audio), language, on_progress)
+                if on_partial is not None:
+                    await on_partial(result)
+            del audio
+
+            print(
+                f"Transcription completed. Length: {len(result['text'])} characters, "
+                f"silence skipped: {result['skipped_fraction']:.1%}"
+            )
+
+            return result
+
+        except Exception as e:
+            print(f"Transcription error: {e}")
+            raise Exception(f"음성 인식 중 오류가 발생했습니다: {str(e)}")
+
+    async def transcribe_pcm(self, pcm_path: str, start: int, end: int, language: str = "ko") -> dict:
+        """
+        이미 디코딩된 PCM 파일의 [start, end) 샘플 구간 인식 (실시간 전사용)
+
+        Returns:
+            {"text", "segments": [{"start", "end", "text", "confidence"}], "duration", "skipped_fraction"}
+            세그먼트 시각은 구간 시작 기준
+        """
+        await self.load_model()
+        return await self._transcribe_range(pcm_path, start, end, language)
+
+    async def _transcribe_range(
+        self,
+        pcm_path: str,
+        start: int,
+        end: int,
+        language: str,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> dict:
+        """워커 프로세스 하나에서 PCM 구간 인식 (이벤트 루프를 막지 않음)"""
+        loop = asyncio.get_running_loop()
+        channel = None
+        updates: asyncio.Queue = asyncio.Queue()
+        if on_progress is not None:
+            channel = _ProgressChannel(self._progress_queue, next(self._job_ids))
+            self._progress_listeners[channel.job_id] = lambda fraction, message: updates.put_nowait((fraction, message))
+        try:
+            future = loop.run_in_executor(
+                self._executor,
+                type(self).worker_transcribe,
+                pcm_path,
+                start,
+                end,
+                language,
+                channel,
+                self.vad_options
+            )
+            if channel is not None:
+                await self._relay_progress(future, updates, on_progress)
+            return await future
+        finally:
+            if channel is not None:
+                self._progress_listeners.pop(channel.job_id, None)
+
+    async def _transcribe_batched(
+        self,
+        pcm_path: str,
+        samples: int,
+        language: str,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> dict:
+        """짧은 오디오를 같은 시기에 들어온 다른 짧은 오디오와 묶어 한 번의 배치 추론으로 인식"""
+        await report_progress(on_progress, 0.0, "짧은 녹음을 묶어서 인식 중...")
+        result = await self._batcher.submit(language, (pcm_path, 0, samples))
+        await report_progress(on_progress, 1.0, "음성 인식 완료")
+        return result
+
+    async def _run_batch(self, language: str, clips: List[Tuple[str, int, int]]) -> List[dict]:
+        """모인 클립을 워커 프로세스 하나에서 배치로 인식"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            type(self).worker_transcribe_batch,
+            clips,
+            language,
+            self.vad_options
+        )
+
+    async def _transcribe_long(
+        self,
+        pcm_path: str,
+        audio: np.ndarray,
+        language: str,
+        on_progress: Optional[ProgressCallback] = None,
+        on_partial: Optional[PartialCallback] = None
+    ) -> dict:
+        """
+        긴 오디오를 무음 지점에서 청크로 나누어 여러 워커에서 동시에 인식한 뒤 순서대로 이어 붙임
+
+        청크 길이는 LONG_AUDIO_CHUNK_SECONDS 이하이면서 워커 수 이상의 청크가 나오도록 정해지므로
+        한 작업의 처리 시간이 워커(코어) 수에 반비례하여 줄어듭니다.
+        첫 청크부터 끊김 없이 끝난 청크가 늘어날 때마다 그 앞부분을 이어 붙여 on_partial로 넘깁니다.
+        """
+        duration = len(audio) / vad.SAMPLE_RATE
+        chunk_seconds = min(self.long_audio_chunk_seconds, max(MIN_CHUNK_SECONDS, duration / self.num_workers))
+        chunks = await asyncio.to_thread(
+            vad.plan_chunks,
+            audio,
+            chunk_seconds,
+            CHUNK_OVERLAP_SECONDS,
+            threshold_db=config.VAD_THRESHOLD_DB
+        )
+        print(f"Long audio mode: {duration:.0f}s split into {len(chunks)} chunks for {self.num_workers} workers")
+
+        completed = 0
+        completed_seconds = 0.0
+        results: List[Optional[dict]] = [None] * len(chunks)
+        reported = 0  # on_partial로 넘긴 앞쪽 청크 수
+
+        async def transcribe_chunk(index: int, start: int, end: int) -> dict:
+            nonlocal completed, completed_seconds, reported
+            result = await self._transcribe_range(pcm_path, start, end, language)
+            results[index] = result
+            completed += 1
+            completed_seconds += (end - start) / vad.SAMPLE_RATE
+            await report_progress(
+                on_progress,
+                completed_seconds / duration,
+                f"음성 인식 중... (청크 {completed}/{len(chunks)}, {format_seconds(min(completed_seconds, duration))} / {format_seconds(duration)})"
+            )
+            if on_partial is not None:
+                ready = reported
+                while ready < len(chunks) and results[ready] is not None:
+                    ready += 1
+                if ready > reported:
+                    reported = ready
+                    # 경계 처리는 전체 청크 계획 기준이므로 최종 결과의 앞부분과 같음
+                    await on_partial(stitch_chunks(chunks, results[:ready], duration))
+            return result
+
+        await asyncio.gather(*(transcribe_chunk(index, start, end) for index, (start, end) in enumerate(chunks)))
+        return stitch_chunks(chunks, results, duration)
+
+    def _relay_progress_loop(self, progress_queue, loop: asyncio.AbstractEventLoop):
+        """
+        전달 스레드: 모든 작업의 진행률을 읽어 작업별 리스너에 넘김 (None을 받으면 종료)
+
+        리스너는 이벤트 루프에서 실행되도록 call_soon_threadsafe로 넘깁니다.
+        """
+        while True:
+            try:
+                item = progress_queue.get()
+            except (EOFError, OSError):
+                return  # 매니저가 먼저 종료됨
+            if item is None:
+                return
+            job_id, (fraction, message) = item
+            listener = self._progress_listeners.get(job_id)
+            if listener is None:
+                continue  # 이미 끝난 작업
+            try:
+                loop.call_soon_threadsafe(listener, fraction, message)
+            except RuntimeError:
+                return  # 이벤트 루프가 닫힘
+
+    @staticmethod
+    async def _relay_progress(future: asyncio.Future, updates: asyncio.Queue, on_progress: ProgressCallback):
+        """전달 스레드가 넘긴 (완료 비율, 메시지)를 작업이 끝날 때까지 콜백으로 전달"""
+        while not future.done():
+            # 인식이 끝나면 다음 진행률을 기다리지 않고 바로 반환
+            getter = asyncio.ensure_future(updates.get())
+            await asyncio.wait({getter, future}, return_when=asyncio.FIRST_COMPLETED)
+            if not getter.done():
+                getter.cancel()
+                break
+            fraction, message = getter.result()
+            await report_progress(on_progress, fraction, message)
@@ -0,0 +1,43 @@
+import importlib
+import importlib.util
+from typing import Dict, List, Tuple
+
+from .. import config
+
+# 엔진 이름 -> (필요한 패키지, 서비스 모듈, 서비스 클래스)
+# 서비스 모듈은 엔진을 실제로 사용할 때 import (설치되지 않은 엔진이 있어도 서버는 시작됨)
+STT_ENGINES: Dict[str, Tuple[str, str, str]] = {
+    "openai-whisper": ("whisper", ".whisper_service", "WhisperService"),
+    "faster-whisper": ("faster_whisper", ".faster_whisper_service", "FasterWhisperService"),
+}
+
+
+def available_engines() -> List[str]:
+    """설치된 패키지로 사용할 수 있는 STT 엔진 목록"""
+    return [
+        name for name, (package, _, _) in STT_ENGINES.items()
+        if importlib.util.find_spec(package) is not None
+    ]
+
+
+def load_engine_class(name: str):
+    """
+    STT 엔진 서비스 클래스 로드
+
+    Raises:
+        Exception: 알 수 없는 엔진이거나 패키지가 설치되지 않은 경우
+    """
+    if name not in STT_ENGINES:
+        raise Exception(f"알 수 없는 STT 엔진입니다: {name} (사용 가능: {', '.join(STT_ENGINES)})")
+    package, module_name, class_name = STT_ENGINES[name]
+    if importlib.util.find_spec(package) is None:
+        raise Exception(f"STT 엔진 {name}을(를) 사용하려면 {package} 패키지를 설치해주세요.")
+    module = importlib.import_module(module_name, __package__)
+    return getattr(module, class_name)
+
+
+def compute_type_for(name: str) -> str:
+    """엔진별 기본 연산 타입"""
+    if name == "faster-whisper":
+        return config.FASTER_WHISPER_COMPUTE_TYPE
+    return config.WHISPER_COMPUTE_TYPE
@@ -0,0 +1,344 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional
+
+# 파이프라인이 아직 끝나지 않은 상태 (재시작 시 복구 대상)
+ACTIVE_STATUSES = ("pending", "uploading", "transcribing", "summarizing")
+# 끝난 상태 (TTL 만료 시 삭제 대상)
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+class TaskStore:
+    """
+    작업 상태 저장소 인터페이스
+
+    상태 변경(update)은 즉시 기록하고, 진행률처럼 자주 바뀌는 값(update_progress)은
+    모아서 주기적으로 기록합니다. 같은 프로세스에서의 get()은 아직 기록되지 않은 값도 반영합니다.
+    """
+
+    def __init__(self):
+        self.worker_id = uuid.uuid4().hex
+
+    async def start(self):
+        """백그라운드 작업 시작"""
+
+    async def close(self):
+        """남은 변경 사항 기록 후 종료"""
+
+    async def create(self, task_id: str, task: dict):
+        raise NotImplementedError
+
+    async def get(self, task_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    async def update(self, task_id: str, **fields):
+        raise NotImplementedError
+
+    async def update_progress(self, task_id: str, **fields):
+        raise NotImplementedError
+
+    async def delete(self, task_id: str):
+        raise NotImplementedError
+
+    async def list_by_status(self, statuses: Iterable[str]) -> List[dict]:
+        raise NotImplementedError
+
+    async def purge_expired(self, ttl_seconds: float) -> List[dict]:
+        """끝난 지 ttl_seconds가 지난 작업을 삭제하고 삭제된 작업 목록 반환"""
+        raise NotImplementedError
+
+    async def claim_interrupted(self, lease_seconds: float) -> List[dict]:
+        """
+        중단된 작업을 이 워커 소유로 가져옴
+
+        진행 중 상태인데 lease_seconds 동안 갱신되지 않은 작업(다른 워커가 죽었거나 서버가 재시작됨)을
+        원자적으로 가져오므로 여러 워커가 같은 작업을 중복 복구하지 않습니다.
+        """
+        raise NotImplementedError
+
+
+class MemoryTaskStore(TaskStore):
+    """프로세스 메모리 저장소 (단일 워커, 재시작 시 유실)"""
+
+    def __init__(self):
+        super().__init__()
+        self._tasks: Dict[str, dict] = {}
+
+    async def create(self, task_id: str, task: dict):
+        self._tasks[task_id] = dict(task, updated_at=time.time())
+
+    async def get(self, task_id: str) -> Optional[dict]:
+        task = self._tasks.get(task_id)
+        return dict(task) if task is not None else None
+
+    async def update(self, task_id: str, **fields):
+        if task_id in self._tasks:
+            self._tasks[task_id].update(fields, updated_at=time.time())
+
+    async def update_progress(self, task_id: str, **fields):
+        await self.update(task_id, **fields)
+
+    async def delete(self, task_id: str):
+        self._tasks.pop(task_id, None)
+
+    async def list_by_status(self, statuses: Iterable[str]) -> List[dict]:
+        statuses = set(statuses)
+        return [dict(task, task_id=task_id) for task_id, task in self._tasks.items() if task["status"] in statuses]
+
+    async def purge_expired(self, ttl_seconds: float) -> List[dict]:
+        cutoff = time.time() - ttl_seconds
+        expired = [
+            task_id for task_id, task in self._tasks.items()
+            if task["status"] in TERMINAL_STATUSES and task["updated_at"] < cutoff
+        ]
+        return [dict(self._tasks.pop(task_id), task_id=task_id) for task_id in expired]
+
+    async def claim_interrupted(self, lease_seconds: float) -> List[dict]:
+        # 메모리 저장소의 작업은 모두 이 프로세스가 실행 중
+        return []
+
+
+class SQLiteTaskStore(TaskStore):
+    def __init__(self, db_path: str, flush_interval: float = 0.5, heartbeat_interval: float = 10.0):
+        """
+        SQLite(WAL) 저장소 - 여러 uvicorn 워커가 같은 DB 파일을 공유
+
+        Args:
+            db_path: DB 파일 경로
+            flush_interval: 진행률 변경을 모아 기록하는 주기 (초)
+            heartbeat_interval: 이 워커가 실행 중인 작업의 updated_at 갱신 주기 (초)
+        """
+        super().__init__()
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.heartbeat_interval = heartbeat_interval
+        # DB 연결 잠금: busy_timeout 동안 기다릴 수 있으므로 asyncio.to_thread로 실행하는 함수 안에서만 잡음
+        self._lock = threading.Lock()
+        # 진행률 일괄 기록과 즉시 기록의 순서 보장 (오래된 진행률이 최신 상태를 덮어쓰지 않도록)
+        self._flush_lock = threading.Lock()
+        # 메모리의 진행률 변경 잠금: DB 작업 중에는 잡지 않으므로 이벤트 루프에서 잡아도 막히지 않음
+        self._pending_lock = threading.Lock()
+        self._pending: Dict[str, dict] = {}  # 아직 기록하지 않은 진행률 변경
+        self._flushing: Dict[str, dict] = {}  # 기록 중인 진행률 변경 (기록이 끝날 때까지 get()에 반영)
+        self._owned: set = set()  # 이 워커가 실행 중인 작업
+        self._flush_task: Optional[asyncio.Task] = None
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                task_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                owner TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_tasks_status_updated ON tasks (status, updated_at);
+        """)
+
+    async def start(self):
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await asyncio.to_thread(self._flush)
+        self._conn.close()
+
+    async def _flush_loop(self):
+        last_heartbeat = time.monotonic()
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await asyncio.to_thread(self._flush)
+                if time.monotonic() - last_heartbeat >= self.heartbeat_interval:
+                    await asyncio.to_thread(self._heartbeat)
+                    last_heartbeat = time.monotonic()
+            except Exception as e:
+                print(f"Task store flush error: {e}")
+
+    # --- 동기 DB 작업 (asyncio.to_thread로 실행) ---
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _load(self, task_id: str) -> Optional[dict]:
+        rows = self._execute("SELECT * FROM tasks WHERE task_id = ?", (task_id,))
+        return self._row_to_task(rows[0]) if rows else None
+
+    @staticmethod
+    def _row_to_task(row: sqlite3.Row) -> dict:
+        task = json.loads(row["data"])
+        task.update(task_id=row["task_id"], status=row["status"], updated_at=row["updated_at"])
+        return task
+
+    def _write(self, updates: Dict[str, dict]):
+        """여러 작업의 필드 병합을 한 트랜잭션으로 기록 (읽기-수정-쓰기)"""
+        if not updates:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                for task_id, fields in updates.items():
+                    row = self._conn.execute("SELECT status, data FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+                    if row is None:
+                        continue
+                    data = json.loads(row["data"])
+                    data.update(fields)
+                    status = data.pop("status", row["status"])
+                    self._conn.execute(
+                        "UPDATE tasks SET status = ?, owner = ?, updated_at = ?, data = ? WHERE task_id = ?",
+                        (status, self.worker_id, now, json.dumps(data, ensure_ascii=False), task_id)
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _flush(self):
+        """모아둔 진행률 변경을 한 번에 기록"""
+        with self._flush_lock:
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+                self._flushing = pending
+            try:
+                self._write(pending)
+            finally:
+                with self._pending_lock:
+                    self._flushing = {}
+
+    def _update_now(self, task_id: str, fields: dict):
+        """아직 기록하지 않은 진행률과 합쳐 즉시 기록"""
+        with self._flush_lock:
+            with self._pending_lock:
+                fields = {**self._pending.pop(task_id, {}), **fields}
+            self._write({task_id: fields})
+
+    def _heartbeat(self):
+        """이 워커가 실행 중인 작업의 updated_at 갱신 (다른 워커가 복구해가지 않도록)"""
+        owned = list(self._owned)
+        if not owned:
+            return
+        placeholders = ",".join("?" * len(owned))
+        self._execute(
+            f"UPDATE tasks SET updated_at = ? WHERE owner = ? AND task_id IN ({placeholders})",
+            (time.time(), self.worker_id, *owned)
+        )
+
+    # --- 비동기 인터페이스 ---
+
+    async def create(self, task_id: str, task: dict):
+        data = dict(task)
+        status = data.pop("status", "pending")
+        now = time.time()
+        self._owned.add(task_id)
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT INTO tasks (task_id, status, owner, created_at, updated_at, data) VALUES (?, ?, ?, ?, ?, ?)",
+            (task_id, status, self.worker_id, now, now, json.dumps(data, ensure_ascii=False))
+        )
+
+    async def get(self, task_id: str) -> Optional[dict]:
+        task = await asyncio.to_thread(self._load, task_id)
+        if task is not None:
+            with self._pending_lock:
+                task.update(self._flushing.get(task_id, {}))
+                task.update(self._pending.get(task_id, {}))
+        return task
+
+    async def update(self, task_id: str, **fields):
+        await asyncio.to_thread(self._update_now, task_id, fields)
+        if fields.get("status") in TERMINAL_STATUSES:
+            self._owned.discard(task_id)
+        else:
+            self._owned.add(task_id)
+
+    async def update_progress(self, task_id: str, **fields):
+        with self._pending_lock:
+            self._pending.setdefault(task_id, {}).update(fields)
+
+    async def delete(self, task_id: str):
+        with self._pending_lock:
+            self._pending.pop(task_id, None)
+        self._owned.discard(task_id)
+        await asyncio.to_thread(self._execute, "DELETE FROM tasks WHERE task_id = ?", (task_id,))
+
+    async def list_by_status(self, statuses: Iterable[str]) -> List[dict]:
+        statuses = tuple(statuses)
+        placeholders = ",".join("?" * len(statuses))
+        rows = await asyncio.to_thread(
+            self._execute, f"SELECT * FROM tasks WHERE status IN ({placeholders})", statuses
+        )
+        return [self._row_to_task(row) for row in rows]
+
+    async def purge_expired(self, ttl_seconds: float) -> List[dict]:
+        cutoff = time.time() - ttl_seconds
+        placeholders = ",".join("?" * len(TERMINAL_STATUSES))
+
+        def purge() -> List[dict]:
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    rows = self._conn.execute(
+                        f"SELECT * FROM tasks WHERE status IN ({placeholders}) AND updated_at < ?",
+                        (*TERMINAL_STATUSES, cutoff)
+                    ).fetchall()
+                    self._conn.executemany("DELETE FROM tasks WHERE task_id = ?", [(row["task_id"],) for row in rows])
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            return [self._row_to_task(row) for row in rows]
+
+        return await asyncio.to_thread(purge)
+
+    async def claim_interrupted(self, lease_seconds: float) -> List[dict]:
+        cutoff = time.time() - lease_seconds
+        placeholders = ",".join("?" * len(ACTIVE_STATUSES))
+
+        def claim() -> List[dict]:
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    rows = self._conn.execute(
+                        f"SELECT * FROM tasks WHERE status IN ({placeholders}) AND updated_at < ?",
+                        (*ACTIVE_STATUSES, cutoff)
+                    ).fetchall()
+                    now = time.time()
+                    self._conn.executemany(
+                        "UPDATE tasks SET owner = ?, updated_at = ? WHERE task_id = ?",
+                        [(self.worker_id, now, row["task_id"]) for row in rows]
+                    )
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            return [self._row_to_task(row) for row in rows]
+
+        tasks = await asyncio.to_thread(claim)
+        self._owned.update(task["task_id"] for task in tasks)
+        return tasks
+
+
+def create_task_store(backend: str, db_path: str, flush_interval: float, lease_seconds: float) -> TaskStore:
+    """설정에 따라 작업 저장소 생성 ("sqlite" 또는 "memory")"""
+    if backend == "memory":
+        return MemoryTaskStore()
+    if backend == "sqlite":
+        # 임대 시간 안에 여러 번 heartbeat를 보내 실행 중인 작업을 다른 워커가 가져가지 않도록 함
+        return SQLiteTaskStore(db_path, flush_interval=flush_interval, heartbeat_interval=lease_seconds / 3)
+    raise ValueError(f"Unknown task store backend: {backend}")
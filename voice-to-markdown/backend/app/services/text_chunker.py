@@ -0,0 +1,170 @@
+import math
+import re
+from typing import List
+
+# 문장 경계: 마침표/물음표/느낌표 뒤 공백 또는 줄바꿈
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.?!。？！])\s+|\n+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토크나이저 없이 토큰 수를 대략 추정
+
+    영문/숫자 등 ASCII는 약 4글자당 1토큰, 한글 등 비 ASCII 문자는 글자당 1토큰으로
+    보수적으로 계산합니다. (Llama 3 토크나이저 기준 실제보다 약간 크게 잡힘)
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128 and not ch.isspace())
+    other_chars = sum(1 for ch in text if ord(ch) >= 128)
+    return math.ceil(ascii_chars / 4 + other_chars)
+
+
+def _char_tokens(ch: str) -> float:
+    """estimate_tokens와 같은 기준의 글자 하나의 토큰 수"""
+    return 0.0 if ch.isspace() else (0.25 if ord(ch) < 128 else 1.0)
+
+
+def _hard_split(sentence: str, max_tokens: int) -> List[str]:
+    """
+    한 문장이 토큰 상한을 넘으면 강제 분할
+
+    앞에서부터 상한까지 채우며 가능하면 마지막 공백에서, 공백이 없으면 글자 단위로 자릅니다.
+    각 조각의 위치는 그 앞의 텍스트로만 정해지므로 텍스트가 뒤에 더 이어 붙어도 앞 조각은 바뀌지 않습니다.
+    """
+    pieces = []
+    start = 0
+    tokens = 0.0
+    for i, ch in enumerate(sentence):
+        cost = _char_tokens(ch)
+        if i > start and tokens + cost > max_tokens:
+            cut, tokens = i, 0.0
+            space = sentence.rfind(" ", start + 1, i)
+            if space > start:
+                rest = sum(_char_tokens(c) for c in sentence[space:i])
+                if rest + cost <= max_tokens:
+                    cut, tokens = space, rest
+            pieces.append(sentence[start:cut])
+            start = cut
+        tokens += cost
+    if start < len(sentence):
+        pieces.append(sentence[start:])
+    return pieces
+
+
+def _tail(text: str, max_tokens: float) -> str:
+    """텍스트 끝에서 토큰 상한 이하만큼 (가능하면 단어 경계에서 시작)"""
+    tokens = 0.0
+    start = len(text)
+    while start > 0 and tokens + _char_tokens(text[start - 1]) <= max_tokens:
+        start -= 1
+        tokens += _char_tokens(text[start])
+    if start > 0 and not text[start - 1].isspace() and " " in text:
+        # 단어 중간에서 시작하지 않도록 다음 공백으로 (들어갈 단어가 없으면 빈 문자열)
+        space = text.find(" ", start)
+        start = space if space != -1 else len(text)
+    return text[start:].strip()
+
+
+class ChunkAccumulator:
+    def __init__(self, max_tokens: int, overlap_tokens: int = 0):
+        """
+        이어 붙는 텍스트를 받으며 다 찬 청크부터 내보내는 분할기
+
+        전체 텍스트를 한 번에 split_into_chunks로 나눈 것과 같은 청크를 만듭니다.
+        마지막 문장은 다음 텍스트가 이어 붙을 수 있으므로 문장 경계가 나오거나 flush()할 때까지 보류하되,
+        문장 부호 없이 이어지는 전사(구두점을 붙이지 않은 Whisper 출력 등)도 청크가 나오도록
+        보류 중인 텍스트가 max_tokens를 넘으면 그 앞부분을 토큰 상한에서 잘라 문장처럼 넣습니다.
+
+        Args:
+            max_tokens: 청크당 최대 토큰 수
+            overlap_tokens: 앞 청크의 마지막 문장들을 다음 청크 앞에 겹쳐 넣을 토큰 수
+        """
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        # 강제 분할 조각 크기 (앞 청크 끝부분을 겹쳐 넣을 자리를 남김)
+        self._piece_tokens = max(max_tokens - overlap_tokens, max_tokens // 2)
+        self._pending = ""  # 아직 끝나지 않았을 수 있는 마지막 문장
+        self._pending_split = False  # 보류 중인 문장의 앞부분을 이미 강제 분할해 넣었는지
+        self._current: List[str] = []
+        self._current_tokens = 0
+        self._new_in_current = 0  # 겹침이 아닌 새 문장 수
+
+    def add(self, text: str) -> List[str]:
+        """텍스트를 이어 붙이고 다 찬 청크 목록 반환"""
+        pieces = _SENTENCE_BOUNDARY.split(self._pending + text)
+        self._pending = pieces.pop()
+        chunks: List[str] = []
+        for sentence in pieces:
+            self._add_sentence(sentence.strip(), chunks, self._pending_split)
+            self._pending_split = False
+        if self._pending_split or estimate_tokens(self._pending) > self.max_tokens:
+            # 상한을 넘긴 문장은 어차피 강제 분할되므로 다 찬 조각부터 넣음 (한 번에 나눌 때와 같은 조각)
+            parts = _hard_split(self._pending.lstrip(), self._piece_tokens)
+            self._pending = parts.pop()
+            for part in parts:
+                self._add_sentence(part.strip(), chunks, True)
+            self._pending_split = self._pending_split or bool(parts)
+        return chunks
+
+    def flush(self) -> List[str]:
+        """보류 중인 문장까지 넣고 남은 청크 목록 반환"""
+        chunks: List[str] = []
+        self._add_sentence(self._pending.strip(), chunks, self._pending_split)
+        self._pending, self._pending_split = "", False
+        if self._current and self._new_in_current > 0:
+            chunks.append(" ".join(self._current))
+        self._current, self._current_tokens, self._new_in_current = [], 0, 0
+        return chunks
+
+    def _add_sentence(self, sentence: str, chunks: List[str], split: bool = False):
+        if not sentence:
+            return
+        if split or estimate_tokens(sentence) > self.max_tokens:
+            parts = [part.strip() for part in _hard_split(sentence, self._piece_tokens)]
+        else:
+            parts = [sentence]
+
+        for part in filter(None, parts):
+            part_tokens = estimate_tokens(part)
+
+            if self._current and self._current_tokens + part_tokens > self.max_tokens:
+                chunks.append(" ".join(self._current))
+
+                # 다음 청크 앞에 붙일 겹침 문장 선택 (뒤에서부터)
+                overlap: List[str] = []
+                overlap_size = 0
+                for prev in reversed(self._current):
+                    prev_tokens = estimate_tokens(prev)
+                    if overlap_size + prev_tokens > self.overlap_tokens or overlap_size + prev_tokens + part_tokens > self.max_tokens:
+                        break
+                    overlap.insert(0, prev)
+                    overlap_size += prev_tokens
+                if not overlap and self.overlap_tokens > 0:
+                    # 겹칠 문장이 통째로 들어가지 않으면 (강제 분할된 긴 조각 등) 끝부분만 겹침
+                    tail = _tail(self._current[-1], min(self.overlap_tokens, self.max_tokens - part_tokens))
+                    if tail:
+                        overlap = [tail]
+                        overlap_size = estimate_tokens(tail)
+
+                self._current = overlap
+                self._current_tokens = overlap_size
+                self._new_in_current = 0
+
+            self._current.append(part)
+            self._current_tokens += part_tokens
+            self._new_in_current += 1
+
+
+def split_into_chunks(text: str, max_tokens: int, overlap_tokens: int = 0) -> List[str]:
+    """
+    텍스트를 토큰 상한 이하의 청크로 분할 (문장 경계 유지)
+
+    Args:
+        text: 분할할 텍스트
+        max_tokens: 청크당 최대 토큰 수
+        overlap_tokens: 앞 청크의 마지막 문장들을 다음 청크 앞에 겹쳐 넣을 토큰 수
+
+    Returns:
+        순서대로 정렬된 청크 목록
+    """
+    accumulator = ChunkAccumulator(max_tokens, overlap_tokens)
+    return accumulator.add(text) + accumulator.flush()
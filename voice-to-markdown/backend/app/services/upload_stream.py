@@ -0,0 +1,266 @@
+import asyncio
+import hashlib
+import os
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+# 업로드 허용 조건 (Content-Type 접두어 또는 확장자 중 하나만 맞으면 허용)
+ALLOWED_CONTENT_TYPES = [
+    'audio/', 'video/webm', 'video/mp4', 'video/quicktime',
+    'application/octet-stream'  # 일부 브라우저에서 오디오 파일을 이렇게 전송
+]
+ALLOWED_EXTENSIONS = ['.mp3', '.wav', '.webm', '.m4a', '.mp4', '.aac', '.ogg', '.flac']
+
+# 컨테이너 판별에 필요한 앞부분 바이트 수
+SNIFF_BYTES = 16
+# 디스크 쓰기 단위 (이만큼 모이면 스레드에서 한 번에 기록)
+WRITE_BUFFER_BYTES = 1024 * 1024
+# 파일이 아닌 폼 필드의 최대 크기
+MAX_FIELD_BYTES = 64 * 1024
+
+
+class UploadRejected(Exception):
+    """업로드 거부 (HTTP 상태 코드와 사용자 메시지 포함)"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass
+class StreamedUpload:
+    file_path: str
+    filename: str
+    content_type: Optional[str]
+    size: int
+    sha256: str
+    audio_format: str
+    fields: Dict[str, str] = field(default_factory=dict)
+
+
+def detect_audio_format(head: bytes) -> Optional[str]:
+    """파일 앞부분의 매직 바이트로 오디오/비디오 컨테이너 판별"""
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "wav"
+    if head[:4] == b"OggS":
+        return "ogg"
+    if head[:4] == b"fLaC":
+        return "flac"
+    if head[:4] == b"\x1a\x45\xdf\xa3":  # EBML (webm/mkv)
+        return "webm"
+    if head[4:8] == b"ftyp":  # ISO BMFF (mp4/m4a/mov)
+        return "mp4"
+    if head[:3] == b"ID3":
+        return "mp3"
+    if len(head) >= 2 and head[0] == 0xFF:
+        if head[1] & 0xF6 == 0xF0:  # ADTS AAC
+            return "aac"
+        if head[1] & 0xE0 == 0xE0:  # MPEG 오디오 프레임 동기
+            return "mp3"
+    return None
+
+
+def _validate_file_part(filename: str, content_type: Optional[str]):
+    """파일 파트의 헤더(Content-Type, 확장자) 검증"""
+    extension = os.path.splitext(filename or '')[1].lower()
+    is_valid_type = any(content_type.startswith(t) for t in ALLOWED_CONTENT_TYPES) if content_type else False
+    is_valid_extension = extension in ALLOWED_EXTENSIONS
+
+    if not (is_valid_type or is_valid_extension):
+        print(f"Invalid file - Content-Type: {content_type}, Extension: {extension}, Filename: {filename}")
+        raise UploadRejected(400, f"지원하지 않는 파일 형식입니다. 업로드된 파일: {content_type or 'Unknown'} (.{extension})")
+
+
+class _MultipartEvents:
+    """python-multipart 콜백을 (이벤트, 값) 목록으로 모으는 어댑터"""
+
+    def __init__(self, file_field: str):
+        self.file_field = file_field
+        self.events: List[Tuple[str, object]] = []
+        self.fields: Dict[str, str] = {}
+        self._headers: Dict[str, str] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._part_name: Optional[str] = None
+        self._is_file = False
+        self._field_value = bytearray()
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        }
+
+    def _on_part_begin(self):
+        self._headers = {}
+        self._part_name = None
+        self._is_file = False
+        self._field_value = bytearray()
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        name = self._header_field.decode("latin-1").lower()
+        self._headers[name] = self._header_value.decode("latin-1")
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get("content-disposition", ""))
+        self._part_name = options.get(b"name", b"").decode("utf-8", errors="replace")
+        filename = options.get(b"filename")
+        if self._part_name == self.file_field and filename is not None:
+            self._is_file = True
+            self.events.append(("file_begin", (
+                filename.decode("utf-8", errors="replace"),
+                self._headers.get("content-type")
+            )))
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        if self._is_file:
+            self.events.append(("file_data", bytes(data[start:end])))
+        elif len(self._field_value) + (end - start) <= MAX_FIELD_BYTES:
+            self._field_value += data[start:end]
+
+    def _on_part_end(self):
+        if self._is_file:
+            self.events.append(("file_end", None))
+        elif self._part_name:
+            self.fields[self._part_name] = self._field_value.decode("utf-8", errors="replace")
+
+
+async def receive_upload(
+    content_type_header: str,
+    body: AsyncIterator[bytes],
+    dest_dir: str,
+    file_stem: str,
+    max_bytes: int,
+    file_field: str = "file"
+) -> StreamedUpload:
+    """
+    multipart/form-data 요청 본문을 스트리밍으로 디스크에 저장
+
+    본문 전체를 메모리에 올리지 않고 받은 조각을 바로 파싱/기록하며,
+    sha256 계산과 최대 크기 검사를 동시에 수행합니다.
+    컨테이너 형식은 파일의 첫 바이트로 판별하므로 잘못된 파일은 본문을 끝까지 받기 전에 거부됩니다.
+
+    Args:
+        content_type_header: 요청의 Content-Type 헤더
+        body: 요청 본문 스트림 (request.stream())
+        dest_dir: 저장 디렉토리
+        file_stem: 저장할 파일 이름 (확장자 제외, 보통 task ID)
+        max_bytes: 파일 최대 크기
+        file_field: 파일이 담긴 폼 필드 이름
+
+    Returns:
+        저장된 파일 정보
+    """
+    mime, options = parse_options_header(content_type_header or "")
+    boundary = options.get(b"boundary")
+    if mime != b"multipart/form-data" or not boundary:
+        raise UploadRejected(400, "multipart/form-data 형식으로 파일을 업로드해주세요.")
+
+    events = _MultipartEvents(file_field)
+    parser = MultipartParser(boundary, events.callbacks())
+
+    hasher = hashlib.sha256()
+    out = None
+    file_path = None
+    filename = ""
+    file_content_type = None
+    audio_format = None
+    head = b""
+    size = 0
+    pending: List[bytes] = []
+    pending_bytes = 0
+    completed = False
+
+    async def flush():
+        nonlocal pending, pending_bytes
+        if pending:
+            data = b"".join(pending)
+            pending, pending_bytes = [], 0
+            await asyncio.to_thread(out.write, data)
+
+    try:
+        async for chunk in body:
+            parser.write(chunk)
+
+            for event, value in events.events:
+                if event == "file_begin":
+                    if out is not None:
+                        raise UploadRejected(400, "파일은 하나만 업로드할 수 있습니다.")
+                    filename, file_content_type = value
+                    _validate_file_part(filename, file_content_type)
+                    extension = os.path.splitext(filename)[1].lower()
+                    file_path = os.path.join(dest_dir, f"{file_stem}{extension}")
+                    out = await asyncio.to_thread(open, file_path, "wb")
+
+                elif event == "file_data":
+                    size += len(value)
+                    if size > max_bytes:
+                        raise UploadRejected(413, f"파일이 너무 큽니다. 최대 {max_bytes // (1024 * 1024)}MB까지 업로드할 수 있습니다.")
+
+                    if audio_format is None:
+                        head += value[:SNIFF_BYTES]
+                        if len(head) >= SNIFF_BYTES:
+                            audio_format = detect_audio_format(head)
+                            if audio_format is None:
+                                raise UploadRejected(415, "오디오/비디오 파일이 아닙니다. 지원 형식: MP3, WAV, WebM, M4A, MP4, AAC, OGG, FLAC")
+
+                    hasher.update(value)
+                    pending.append(value)
+                    pending_bytes += len(value)
+                    if pending_bytes >= WRITE_BUFFER_BYTES:
+                        await flush()
+
+                elif event == "file_end":
+                    if audio_format is None:
+                        audio_format = detect_audio_format(head)
+                        if audio_format is None:
+                            raise UploadRejected(415, "오디오/비디오 파일이 아닙니다. 지원 형식: MP3, WAV, WebM, M4A, MP4, AAC, OGG, FLAC")
+                    await flush()
+                    completed = True
+
+            events.events.clear()
+
+        parser.finalize()
+
+        if out is None or not completed:
+            raise UploadRejected(400, "업로드된 파일이 없습니다.")
+
+        await asyncio.to_thread(out.close)
+        out = None
+
+        return StreamedUpload(
+            file_path=file_path,
+            filename=filename,
+            content_type=file_content_type,
+            size=size,
+            sha256=hasher.hexdigest(),
+            audio_format=audio_format,
+            fields=events.fields
+        )
+
+    except BaseException:
+        # 중단/거부된 업로드의 부분 파일 삭제
+        if out is not None:
+            out.close()
+        if file_path and os.path.exists(file_path):
+            os.remove(file_path)
+        raise
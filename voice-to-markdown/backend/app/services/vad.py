@@ -0,0 +1,197 @@
+import bisect
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+# 에너지 계산 프레임 길이 (ms)
+FRAME_MS = 30
+# 이보다 조용한 프레임은 잡음 바닥과 관계없이 무음 (dBFS)
+ABSOLUTE_SILENCE_DB = -60.0
+# 이어 붙인 음성 구간 사이에 넣는 무음 길이 (초) - 서로 다른 구간의 단어가 붙지 않도록
+JOIN_GAP_SECONDS = 0.2
+
+
+@dataclass
+class SpeechRegion:
+    start: int  # 시작 샘플 (포함)
+    end: int    # 끝 샘플 (제외)
+
+
+class TimestampMap:
+    """
+    무음을 잘라내고 이어 붙인 오디오의 시각을 원본 오디오의 시각으로 변환
+
+    이어 붙인 오디오의 각 조각이 원본의 어디에서 왔는지 (압축본 시작, 원본 시작, 길이)로 기록합니다.
+    """
+
+    def __init__(self, pieces: List[Tuple[float, float, float]]):
+        self.pieces = pieces
+        self._starts = [compact_start for compact_start, _, _ in pieces]
+
+    def to_original(self, seconds: float) -> float:
+        if not self.pieces:
+            return seconds
+        index = max(0, bisect.bisect_right(self._starts, seconds) - 1)
+        compact_start, original_start, length = self.pieces[index]
+        # 조각 사이에 넣은 무음 구간은 다음 조각의 시작으로 보정
+        if seconds > compact_start + length and index + 1 < len(self.pieces):
+            return self.pieces[index + 1][1]
+        return original_start + min(max(0.0, seconds - compact_start), length)
+
+
+def frame_energy_db(audio: np.ndarray, frame_size: int) -> np.ndarray:
+    """프레임별 평균 에너지 (dBFS)"""
+    count = len(audio) // frame_size
+    if count == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = np.asarray(audio[:count * frame_size], dtype=np.float32).reshape(count, frame_size)
+    # 제곱 배열을 따로 만들지 않도록 einsum으로 프레임별 제곱합 계산 (긴 오디오의 메모리 사용 억제)
+    power = np.einsum("ij,ij->i", frames, frames) / frame_size
+    return 10.0 * np.log10(power + 1e-10)
+
+
+def speech_threshold_db(energy: np.ndarray, threshold_db: float) -> float:
+    """
+    음성 판단 기준 에너지: 잡음 바닥(하위 10% 프레임) + threshold_db
+
+    무음 없이 계속 말하는 오디오는 하위 10%도 음성이므로, 상위 10% 프레임보다
+    threshold_db / 2 이상 높아지지 않게 제한하여 음성 전체가 무음으로 판단되지 않게 합니다.
+    """
+    noise_floor, loud = np.percentile(energy, [10, 90])
+    threshold = min(float(noise_floor) + threshold_db, float(loud) - threshold_db / 2)
+    return max(threshold, ABSOLUTE_SILENCE_DB)
+
+
+def detect_speech(
+    audio: np.ndarray,
+    threshold_db: float = 12.0,
+    min_silence_ms: int = 700,
+    pad_ms: int = 200,
+    sample_rate: int = SAMPLE_RATE
+) -> List[SpeechRegion]:
+    """
+    에너지 기반 음성 구간 검출
+
+    하위 10% 프레임의 에너지를 잡음 바닥으로 보고 그보다 threshold_db 이상 큰 프레임을 음성으로 판단합니다.
+    min_silence_ms보다 짧은 무음(단어/문장 사이 쉼)은 음성 구간에 포함하고,
+    각 구간 앞뒤에 pad_ms 만큼 여유를 두어 말의 시작/끝이 잘리지 않게 합니다.
+
+    Args:
+        audio: 16kHz mono float32 PCM (-1.0 ~ 1.0)
+        threshold_db: 잡음 바닥 대비 음성 판단 기준 (dB)
+        min_silence_ms: 잘라낼 최소 무음 길이 (ms)
+        pad_ms: 음성 구간 앞뒤 여유 (ms)
+        sample_rate: 샘플링 레이트
+
+    Returns:
+        음성 구간 목록 (샘플 단위, 시간순)
+    """
+    frame_size = sample_rate * FRAME_MS // 1000
+    energy = frame_energy_db(audio, frame_size)
+    if len(energy) == 0:
+        return []
+
+    voiced = np.flatnonzero(energy > speech_threshold_db(energy, threshold_db))
+    if len(voiced) == 0:
+        return []
+
+    # 음성 프레임 사이 간격이 min_silence보다 짧으면 같은 구간으로 병합
+    max_gap = max(1, min_silence_ms // FRAME_MS)
+    breaks = np.flatnonzero(np.diff(voiced) > max_gap)
+    starts = np.concatenate(([voiced[0]], voiced[breaks + 1]))
+    ends = np.concatenate((voiced[breaks], [voiced[-1]])) + 1
+
+    pad = pad_ms * sample_rate // 1000
+    regions: List[SpeechRegion] = []
+    for start_frame, end_frame in zip(starts, ends):
+        start = max(0, int(start_frame) * frame_size - pad)
+        end = min(len(audio), int(end_frame) * frame_size + pad)
+        if regions and start <= regions[-1].end:
+            regions[-1].end = max(regions[-1].end, end)
+        else:
+            regions.append(SpeechRegion(start, end))
+    return regions
+
+
+def compact_audio(
+    audio: np.ndarray,
+    regions: List[SpeechRegion],
+    sample_rate: int = SAMPLE_RATE
+) -> Tuple[np.ndarray, TimestampMap]:
+    """
+    음성 구간만 이어 붙인 오디오와 원본 시각 변환표 생성
+
+    Returns:
+        (이어 붙인 오디오, TimestampMap)
+    """
+    gap = np.zeros(int(JOIN_GAP_SECONDS * sample_rate), dtype=audio.dtype)
+    parts: List[np.ndarray] = []
+    pieces: List[Tuple[float, float, float]] = []
+    position = 0
+    for region in regions:
+        if parts:
+            parts.append(gap)
+            position += len(gap)
+        parts.append(audio[region.start:region.end])
+        pieces.append((position / sample_rate, region.start / sample_rate, (region.end - region.start) / sample_rate))
+        position += region.end - region.start
+
+    if not parts:
+        return np.zeros(0, dtype=audio.dtype), TimestampMap([])
+    return np.concatenate(parts), TimestampMap(pieces)
+
+
+def speech_fraction(regions: List[SpeechRegion], total_samples: int) -> float:
+    """전체 길이 중 음성 구간 비율"""
+    if total_samples <= 0:
+        return 0.0
+    return sum(region.end - region.start for region in regions) / total_samples
+
+
+def plan_chunks(
+    audio: np.ndarray,
+    max_seconds: float,
+    overlap_seconds: float = 2.0,
+    search_seconds: float = 30.0,
+    threshold_db: float = 12.0,
+    sample_rate: int = SAMPLE_RATE
+) -> List[Tuple[int, int]]:
+    """
+    긴 오디오를 max_seconds 이하의 청크로 분할 (가능하면 무음 지점에서 자름)
+
+    각 청크 끝 직전 search_seconds 범위에서 가장 조용한 프레임을 찾아 무음이면 그 지점에서 자르고,
+    무음이 없으면(쉬지 않고 말하는 구간) max_seconds 지점에서 자르되 다음 청크가
+    overlap_seconds 만큼 겹치게 시작하여 경계의 단어가 잘리지 않게 합니다.
+
+    Returns:
+        (시작 샘플, 끝 샘플) 목록 - 겹치는 청크는 다음 청크의 시작이 이전 청크의 끝보다 앞섬
+    """
+    frame_size = sample_rate * FRAME_MS // 1000
+    max_samples = int(max_seconds * sample_rate)
+    overlap = int(overlap_seconds * sample_rate)
+    search = int(search_seconds * sample_rate)
+    energy = frame_energy_db(audio, frame_size)
+    if len(energy) == 0:
+        return [(0, len(audio))]
+    threshold = speech_threshold_db(energy, threshold_db)
+
+    chunks: List[Tuple[int, int]] = []
+    start = 0
+    while len(audio) - start > max_samples:
+        target = start + max_samples
+        # 청크가 너무 짧아지지 않도록 청크 후반부에서만 자를 지점 탐색
+        low_frame = max(start + max_samples // 2, target - search) // frame_size
+        high_frame = min(target // frame_size, len(energy))
+        best = low_frame + int(np.argmin(energy[low_frame:high_frame])) if high_frame > low_frame else None
+
+        if best is not None and energy[best] <= threshold:
+            cut = best * frame_size + frame_size // 2
+            chunks.append((start, cut))
+            start = cut
+        else:
+            chunks.append((start, target))
+            start = target - overlap
+    chunks.append((start, len(audio)))
+    return chunks
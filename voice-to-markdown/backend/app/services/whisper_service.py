@@ -1,86 +1,175 @@
-import whisper
 import os
-import subprocess
-import shutil
-from typing import Optional
+import importlib
+from types import SimpleNamespace
+from typing import Callable, List, Optional, Tuple
 
-class WhisperService:
-    def __init__(self, model_size: str = "base"):
+import numpy as np
+
+from .. import config
+from . import vad
+from .stt_base import STTService, transcribe_pcm_batch, transcribe_pcm_range
+
+# Whisper mel 스펙트로그램 프레임 수 / 초 (hop length 160, 16kHz)
+FRAMES_PER_SECOND = 100
+# whisper.transcribe 기본값과 같은 결과 품질 판단 기준 (배치 디코딩 결과 검사용)
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+
+# 워커 프로세스 하나가 모델을 로드했을 때의 대략적인 메모리 사용량 (MB, torch 포함)
+MODEL_MEMORY_MB = {
+    "tiny": 300,
+    "base": 400,
+    "small": 1000,
+    "medium": 2500,
+    "large": 5000,
+    "turbo": 3000,
+}
+
+# 워커 프로세스마다 한 번만 로드되는 Whisper 모델
+# whisper/torch는 워커 함수 안에서만 import (API 프로세스가 이 모듈을 import해도 torch를 로드하지 않음)
+_worker_model = None
+_worker_fp16 = False
+
+
+def _init_worker(model_size: str, num_threads: int, device: str = "cpu", compute_type: str = "float32"):
+    """워커 프로세스 초기화: 프로세스 전용 모델 로드"""
+    global _worker_model, _worker_fp16
+    import torch
+    import whisper
+
+    # 워커끼리 CPU 코어를 나눠 쓰도록 스레드 수 제한
+    torch.set_num_threads(num_threads)
+    print(f"[worker {os.getpid()}] Loading Whisper model: {model_size} ({device}, {compute_type})")
+    _worker_model = whisper.load_model(model_size, device=device)
+    _worker_fp16 = compute_type == "float16"
+    print(f"[worker {os.getpid()}] Whisper model loaded successfully")
+
+
+def _warm_up_worker() -> int:
+    """워커 프로세스를 띄우고 짧은 무음으로 한 번 추론하여 첫 요청의 지연을 없앰"""
+    _worker_model.transcribe(np.zeros(vad.SAMPLE_RATE, dtype=np.float32), language="en", fp16=_worker_fp16)
+    return os.getpid()
+
+
+class _ProgressBar:
+    """
+    whisper.transcribe가 사용하는 tqdm 대신 들어가는 진행 표시
+
+    Whisper는 30초 창을 디코딩할 때마다 처리한 mel 프레임 수(=세그먼트 끝 타임스탬프)를
+    update()로 알려주므로, 이를 (위치 초, 전체 초)로 바꾸어 report에 전달합니다.
+    """
+
+    def __init__(self, report: Callable[[float, float], None], total: int = 0, **kwargs):
+        self.report = report
+        self.total = total
+        self.n = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def update(self, n: int = 1):
+        self.n += n
+        self.report(self.n / FRAMES_PER_SECOND, self.total / FRAMES_PER_SECOND)
+
+
+def _model_transcribe(audio: np.ndarray, language: str, report: Callable[[float, float], None]) -> List[dict]:
+    """openai-whisper로 인식 (진행률은 whisper.transcribe 내부의 tqdm을 바꿔 끼워 받음)"""
+    transcribe_module = importlib.import_module("whisper.transcribe")
+    original_tqdm = transcribe_module.tqdm
+    transcribe_module.tqdm = SimpleNamespace(tqdm=lambda *args, **kwargs: _ProgressBar(report, **kwargs))
+    try:
+        result = _worker_model.transcribe(
+            audio,
+            language=language,
+            task="transcribe",
+            fp16=_worker_fp16,
+            verbose=False  # 진행 표시(update 호출) 활성화
+        )
+    finally:
+        transcribe_module.tqdm = original_tqdm
+    return result["segments"]
+
+
+def _model_transcribe_batch(audios: List[np.ndarray], language: str) -> List[List[dict]]:
+    """
+    30초 이하 클립 여러 개를 패딩해 인코더/디코더를 한 번에 실행
+
+    whisper.decode는 온도 폴백을 하지 않으므로 반복되거나 신뢰도가 낮은 결과는
+    whisper.transcribe(폴백 포함)로 다시 인식합니다.
+    """
+    import torch
+    import whisper
+
+    mels = torch.stack([
+        whisper.log_mel_spectrogram(whisper.pad_or_trim(torch.from_numpy(audio)), _worker_model.dims.n_mels)
+        for audio in audios
+    ]).to(_worker_model.device)
+    options = whisper.DecodingOptions(language=language, task="transcribe", fp16=_worker_fp16, without_timestamps=True)
+    results = whisper.decode(_worker_model, mels, options)
+
+    batch_segments = []
+    for audio, result in zip(audios, results):
+        if result.no_speech_prob > NO_SPEECH_THRESHOLD and result.avg_logprob < LOGPROB_THRESHOLD:
+            batch_segments.append([])
+        elif result.compression_ratio > COMPRESSION_RATIO_THRESHOLD or result.avg_logprob < LOGPROB_THRESHOLD:
+            batch_segments.append(_model_transcribe(audio, language, lambda position, total: None))
+        else:
+            batch_segments.append([{
+                "start": 0.0,
+                "end": len(audio) / vad.SAMPLE_RATE,
+                "text": result.text,
+                "avg_logprob": result.avg_logprob
+            }])
+    return batch_segments
+
+
+def _transcribe_in_worker(
+    pcm_path: str,
+    start: int,
+    end: int,
+    language: str,
+    progress_queue=None,
+    vad_options: Optional[dict] = None
+) -> dict:
+    """워커 프로세스에서 실행되는 음성 인식 (디코딩된 PCM의 [start, end) 샘플 구간)"""
+    return transcribe_pcm_range(pcm_path, start, end, language, progress_queue, vad_options, _model_transcribe)
+
+
+def _transcribe_batch_in_worker(clips: List[Tuple[str, int, int]], language: str, vad_options: Optional[dict] = None) -> List[dict]:
+    """워커 프로세스에서 실행되는 짧은 클립 배치 인식"""
+    return transcribe_pcm_batch(clips, language, vad_options, _model_transcribe_batch)
+
+
+class WhisperService(STTService):
+    """openai-whisper (PyTorch) 엔진"""
+    engine_name = "openai-whisper"
+    model_memory_mb = MODEL_MEMORY_MB
+    worker_init = staticmethod(_init_worker)
+    worker_warm_up = staticmethod(_warm_up_worker)
+    worker_transcribe = staticmethod(_transcribe_in_worker)
+    worker_transcribe_batch = staticmethod(_transcribe_batch_in_worker)
+
+    def __init__(
+        self,
+        model_size: str = config.WHISPER_MODEL_SIZE,
+        num_workers: Optional[int] = None,
+        device: str = config.WHISPER_DEVICE,
+        compute_type: str = config.WHISPER_COMPUTE_TYPE
+    ):
         """
         Whisper 서비스 초기화
         model_size: tiny, base, small, medium, large
+        num_workers: STT 워커 프로세스 수 (기본값: WHISPER_WORKERS 환경 변수)
+        device: cpu 또는 cuda
+        compute_type: float32 또는 float16 (float16은 GPU에서만 의미 있음)
         """
-        self.model_size = model_size
-        self.model = None
-        self.ffmpeg_path = self._find_ffmpeg_path()
-        
-    async def load_model(self):
-        """Whisper 모델 로드"""
-        if self.model is None:
-            print(f"Loading Whisper model: {self.model_size}")
-            self.model = whisper.load_model(self.model_size)
-            print("Whisper model loaded successfully")
-    
-    async def transcribe(self, audio_file_path: str, language: str = "ko") -> str:
-        """
-        오디오 파일을 텍스트로 변환
-        
-        Args:
-            audio_file_path: 오디오 파일 경로
-            language: 언어 코드 (ko: 한국어, en: 영어)
-        
-        Returns:
-            변환된 텍스트
-        """
-        if not os.path.exists(audio_file_path):
-            raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
-        
-        await self.load_model()
-        
-        # FFmpeg 경로 설정
-        if self.ffmpeg_path:
-            os.environ['PATH'] = f"{os.path.dirname(self.ffmpeg_path)}:{os.environ.get('PATH', '')}"
-            print(f"Using FFmpeg at: {self.ffmpeg_path}")
-        else:
-            raise Exception("FFmpeg를 찾을 수 없습니다. brew install ffmpeg로 설치해주세요.")
-        
-        try:
-            print(f"Transcribing audio file: {audio_file_path}")
-            
-            # Whisper로 음성 인식
-            result = self.model.transcribe(
-                audio_file_path,
-                language=language,
-                task="transcribe"
-            )
-            
-            transcript = result["text"].strip()
-            print(f"Transcription completed. Length: {len(transcript)} characters")
-            
-            return transcript
-            
-        except Exception as e:
-            print(f"Transcription error: {e}")
-            raise Exception(f"음성 인식 중 오류가 발생했습니다: {str(e)}")
-    
-    def _find_ffmpeg_path(self) -> Optional[str]:
-        """FFmpeg 실행파일 경로를 찾습니다"""
-        # 일반적인 FFmpeg 설치 경로들
-        common_paths = [
-            "/opt/homebrew/bin/ffmpeg",     # Apple Silicon Mac Homebrew
-            "/usr/local/bin/ffmpeg",        # Intel Mac Homebrew
-            "/usr/bin/ffmpeg",              # Linux 시스템 경로
-            shutil.which("ffmpeg")          # PATH에서 찾기
-        ]
-        
-        for path in common_paths:
-            if path and os.path.exists(path) and os.path.isfile(path):
-                print(f"Found FFmpeg at: {path}")
-                return path
-        
-        print("FFmpeg not found in common paths")
-        return None
-    
+        super().__init__(model_size, num_workers, device, compute_type)
+
     def get_supported_languages(self):
         """지원되는 언어 목록 반환"""
-        return whisper.tokenizer.LANGUAGES
\ No newline at end of file
+        from whisper.tokenizer import LANGUAGES
+        return LANGUAGES
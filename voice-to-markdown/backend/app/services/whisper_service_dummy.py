@@ -1,14 +1,28 @@
 import os
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 import time
 import asyncio
 
+from .progress import ProgressCallback, report_progress
+
 class WhisperService:
-    def __init__(self, model_size: str = "base"):
+    engine_name = "dummy"
+    vad_options = None
+    
+    def __init__(
+        self,
+        model_size: str = "base",
+        num_workers: Optional[int] = None,
+        device: str = "cpu",
+        compute_type: str = "float32"
+    ):
         """
         Whisper 서비스 더미 구현 (테스트용)
         """
         self.model_size = model_size
+        self.num_workers = num_workers or 1
+        self.device = device
+        self.compute_type = compute_type
         self.model = None
         
     async def load_model(self):
@@ -19,10 +33,41 @@ class WhisperService:
             self.model = "dummy_model"
             print("[DUMMY] Whisper model loaded successfully")
     
-    async def transcribe(self, audio_file_path: str, language: str = "ko") -> str:
+    async def warm_up(self):
+        """모델 로드 (더미)"""
+        await self.load_model()
+    
+    def estimated_memory_bytes(self) -> int:
+        """메모리 사용량 (더미는 모델이 없음)"""
+        return 0
+    
+    def shutdown(self):
+        """워커 풀 종료 (더미)"""
+        self.model = None
+    
+    async def transcribe(
+        self,
+        audio_file_path: str,
+        language: str = "ko",
+        on_progress: Optional[ProgressCallback] = None
+    ) -> str:
         """
         오디오 파일을 텍스트로 변환 (더미)
         """
+        result = await self.transcribe_segments(audio_file_path, language, on_progress)
+        return result["text"]
+    
+    async def transcribe_segments(
+        self,
+        audio_file_path: str,
+        language: str = "ko",
+        on_progress: Optional[ProgressCallback] = None,
+        on_partial: Optional[Callable[[dict], Awaitable[None]]] = None,
+        release_slot: Optional[Callable[[], None]] = None
+    ) -> dict:
+        """
+        오디오 파일을 세그먼트 단위로 변환 (더미, on_partial은 끝난 뒤 전체 결과로 한 번 호출, 배치가 없으므로 release_slot은 호출하지 않음)
+        """
         if not os.path.exists(audio_file_path):
             raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
         
@@ -31,10 +76,10 @@ class WhisperService:
         try:
             print(f"[DUMMY] Transcribing audio file: {audio_file_path}")
             
-            # 더미 음성 인식 시뮬레이션 (더 긴 시간)
-            await asyncio.sleep(1)  # 초기 처리
-            await asyncio.sleep(1)  # 중간 처리
-            await asyncio.sleep(1)  # 최종 처리
+            # 더미 음성 인식 시뮬레이션 (30초 창 3개를 처리하는 것처럼 진행률 보고)
+            for window in range(1, 4):
+                await asyncio.sleep(1)
+                await report_progress(on_progress, window / 3, f"음성 인식 중... ({window * 30}초 / 90초)")
             
             # 더미 텍스트 반환 (강의/회의 예시)
             dummy_transcript = """
@@ -53,12 +98,51 @@ class WhisperService:
             
             print(f"[DUMMY] Transcription completed. Length: {len(dummy_transcript)} characters")
             
-            return dummy_transcript
+            # 문장 줄마다 세그먼트 하나 (90초를 고르게 나눔)
+            lines = [line.strip() for line in dummy_transcript.splitlines() if line.strip()]
+            segment_seconds = 90.0 / len(lines)
+            segments = [
+                {
+                    "start": round(index * segment_seconds, 2),
+                    "end": round((index + 1) * segment_seconds, 2),
+                    "text": line,
+                    "confidence": 0.9
+                }
+                for index, line in enumerate(lines)
+            ]
+            
+            result = {
+                "text": dummy_transcript,
+                "segments": segments,
+                "duration": 90.0,
+                "skipped_fraction": 0.0
+            }
+            if on_partial is not None:
+                await on_partial(result)
+            return result
             
         except Exception as e:
             print(f"[DUMMY] Transcription error: {e}")
             raise Exception(f"음성 인식 중 오류가 발생했습니다: {str(e)}")
     
+    async def transcribe_pcm(self, pcm_path: str, start: int, end: int, language: str = "ko") -> dict:
+        """
+        PCM 구간을 세그먼트 단위로 변환 (더미, 5초마다 문장 하나)
+        """
+        await self.load_model()
+        await asyncio.sleep(0.2)  # 인식 시간 시뮬레이션
+        duration = (end - start) / 16000
+        segments = [
+            {"start": float(offset), "end": float(min(duration, offset + 5)), "text": f"[데모] {(start / 16000 + offset):.0f}초부터 녹음된 음성입니다."}
+            for offset in range(0, int(duration), 5)
+        ]
+        return {
+            "text": " ".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "duration": duration,
+            "skipped_fraction": 0.0
+        }
+    
     def get_supported_languages(self):
         """지원되는 언어 목록 반환 (더미)"""
         return {"ko": "Korean", "en": "English"}
\ No newline at end of file
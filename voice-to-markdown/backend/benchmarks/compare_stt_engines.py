@@ -0,0 +1,171 @@
+"""
+STT 엔진 비교 벤치마크
+
+같은 오디오 파일을 엔진별로 인식하여 실시간 대비 처리 속도(RTF = 처리 시간 / 오디오 길이),
+최대 메모리 사용량(RSS), 첫 번째 엔진 대비 전사 결과 유사도를 비교합니다.
+엔진마다 새 프로세스에서 모델을 로드하므로 메모리 사용량이 엔진 간에 섞이지 않습니다.
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.compare_stt_engines sample.wav
+    python -m benchmarks.compare_stt_engines a.wav b.mp3 --engines openai-whisper faster-whisper --model-size small
+"""
+import argparse
+import difflib
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from typing import List
+
+from app import config
+from app.services.stt_engines import STT_ENGINES, available_engines, compute_type_for
+
+
+def _peak_rss_mb() -> float:
+    """현재 프로세스의 최대 RSS (MB)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_engine(
+    engine: str,
+    model_size: str,
+    compute_type: str,
+    audio_paths: List[str],
+    language: str,
+    threads: int,
+    use_vad: bool,
+    result_queue
+):
+    """엔진 하나를 로드하고 모든 파일을 순서대로 인식 (벤치마크용 자식 프로세스)"""
+    try:
+        import tempfile
+        from app.services import audio_ingest, stt_base, vad
+        from app.services.stt_engines import load_engine_class
+
+        service_class = load_engine_class(engine)
+
+        started = time.perf_counter()
+        service_class.worker_init(model_size, threads, "cpu", compute_type)
+        service_class.worker_warm_up()
+        load_seconds = time.perf_counter() - started
+        rss_after_load = _peak_rss_mb()
+
+        files = []
+        for audio_path in audio_paths:
+            fd, pcm_path = tempfile.mkstemp(suffix=audio_ingest.PCM_SUFFIX)
+            os.close(fd)
+            try:
+                audio_ingest.decode_to_pcm(audio_path, pcm_path)
+                samples = len(audio_ingest.open_pcm(pcm_path))
+                started = time.perf_counter()
+                result = service_class.worker_transcribe(
+                    pcm_path, 0, samples, language, None, stt_base.VAD_OPTIONS if use_vad else None
+                )
+                elapsed = time.perf_counter() - started
+            finally:
+                os.remove(pcm_path)
+
+            duration = samples / vad.SAMPLE_RATE
+            files.append({
+                "file": os.path.basename(audio_path),
+                "audio_seconds": round(duration, 2),
+                "wall_seconds": round(elapsed, 2),
+                "rtf": round(elapsed / duration, 3) if duration else None,
+                "segments": len(result["segments"]),
+                "text": result["text"]
+            })
+
+        result_queue.put({
+            "engine": engine,
+            "compute_type": compute_type,
+            "load_seconds": round(load_seconds, 2),
+            "rss_after_load_mb": round(rss_after_load, 1),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+            "files": files
+        })
+    except Exception as e:
+        result_queue.put({"engine": engine, "compute_type": compute_type, "error": str(e)})
+
+
+def run_benchmark(
+    audio_paths: List[str],
+    engines: List[str],
+    model_size: str,
+    language: str,
+    threads: int,
+    use_vad: bool
+) -> List[dict]:
+    """엔진별로 새 프로세스를 띄워 순서대로 측정 (동시에 돌리면 CPU를 나눠 써서 RTF가 왜곡됨)"""
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for engine in engines:
+        compute_type = compute_type_for(engine)
+        result_queue = context.Queue()
+        process = context.Process(
+            target=_run_engine,
+            args=(engine, model_size, compute_type, audio_paths, language, threads, use_vad, result_queue)
+        )
+        process.start()
+        result = result_queue.get()
+        process.join()
+        results.append(result)
+    return results
+
+
+def print_report(results: List[dict]):
+    """엔진별 속도/메모리 표와 전사 결과 유사도 출력"""
+    print()
+    print(f"{'engine':<16} {'compute':<14} {'file':<24} {'audio s':>8} {'wall s':>8} {'RTF':>7} {'load s':>7} {'peak MB':>8}")
+    print("-" * 100)
+    for result in results:
+        if "error" in result:
+            print(f"{result['engine']:<16} {result['compute_type']:<14} 실패: {result['error']}")
+            continue
+        for file in result["files"]:
+            print(
+                f"{result['engine']:<16} {result['compute_type']:<14} {file['file'][:24]:<24} "
+                f"{file['audio_seconds']:>8.1f} {file['wall_seconds']:>8.1f} {file['rtf']:>7.3f} "
+                f"{result['load_seconds']:>7.1f} {result['peak_rss_mb']:>8.0f}"
+            )
+
+    succeeded = [result for result in results if "error" not in result]
+    if len(succeeded) < 2:
+        return
+    reference = succeeded[0]
+    print()
+    print(f"전사 결과 유사도 (기준: {reference['engine']})")
+    for result in succeeded[1:]:
+        for reference_file, file in zip(reference["files"], result["files"]):
+            ratio = difflib.SequenceMatcher(None, reference_file["text"], file["text"]).ratio()
+            print(f"  {result['engine']:<16} {file['file'][:24]:<24} {ratio:.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="STT 엔진별 RTF / 메모리 사용량 비교")
+    parser.add_argument("audio", nargs="+", help="비교할 오디오 파일")
+    parser.add_argument("--engines", nargs="+", choices=list(STT_ENGINES), help="비교할 엔진 (기본값: 설치된 모든 엔진)")
+    parser.add_argument("--model-size", default=config.WHISPER_MODEL_SIZE, help="모델 크기")
+    parser.add_argument("--language", default="ko", help="언어 코드")
+    parser.add_argument("--threads", type=int, default=config.CPU_COUNT, help="엔진이 사용할 CPU 스레드 수")
+    parser.add_argument("--no-vad", action="store_true", help="무음 구간 건너뛰기 없이 모델 속도만 측정")
+    parser.add_argument("--json", help="결과를 JSON 파일로도 저장")
+    args = parser.parse_args()
+
+    engines = args.engines or available_engines()
+    if not engines:
+        parser.error("설치된 STT 엔진이 없습니다. openai-whisper 또는 faster-whisper를 설치해주세요.")
+
+    results = run_benchmark(args.audio, engines, args.model_size, args.language, args.threads, not args.no_vad)
+    print_report(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
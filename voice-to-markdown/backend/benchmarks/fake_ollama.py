@@ -0,0 +1,314 @@
+"""
+벤치마크용 가짜 Ollama 서버
+
+/api/tags, /api/generate, /api/chat(스트리밍/비스트리밍)을 실제 Ollama와 같은 형식으로 응답하면서
+프롬프트 처리 시간, 첫 토큰 지연, 토큰 생성 속도, 생성 토큰 수를 지정한 분포대로 흉내 냅니다.
+동시 생성 수(parallel)를 넘는 요청은 실제 Ollama(OLLAMA_NUM_PARALLEL)처럼 앞 요청이 끝날 때까지 기다립니다.
+
+모델 상주와 접두사 캐시도 흉내 냅니다. keep_alive가 지나 내려간 모델은 다시 로드하는 시간(load_seconds)이 들고,
+모델이 올라와 있는 동안에는 최근 요청(슬롯 수만큼)과 같은 system 메시지를 다시 평가하지 않습니다.
+
+단독 실행 (backend 디렉토리에서):
+    python -m benchmarks.fake_ollama --port 11435 --tps lognormal:25,0.2
+    OLLAMA_BASE_URL=http://127.0.0.1:11435 uvicorn app.main:app
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, List, Optional, Union
+
+from app import config
+from app.services.text_chunker import estimate_tokens
+
+from .standins import parse_distribution
+
+# 생성 토큰으로 돌려 쓰는 요약 예시 (2글자를 토큰 하나로 취급)
+SAMPLE_SUMMARY = """## 핵심 내용
+- 배열은 같은 타입의 데이터를 연속된 메모리에 저장하여 인덱스로 바로 접근할 수 있습니다.
+- 연결 리스트는 삽입과 삭제가 빠르지만 임의 접근에는 순회가 필요합니다.
+
+## 결정 사항
+- 다음 주 금요일까지 각자 맡은 부분의 초안을 준비합니다.
+
+## 액션 아이템
+- [ ] 자료 구조별 시간 복잡도 표 정리
+- [ ] 회의록 공유 및 일정 확정
+"""
+TOKEN_CHARS = 2
+# keep_alive 기간 단위 (Ollama와 같은 "30m", "1h", "45s" 형식)
+DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_keep_alive(value: Union[int, float, str, None], default: float = 300.0) -> float:
+    """keep_alive 값을 초로 변환 (음수면 계속 유지, 없으면 Ollama 기본값 5분)"""
+    if value is None or value == "":
+        return default
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.fullmatch(r"(-?\d+(?:\.\d+)?)(ms|s|m|h)?", value.strip())
+    if not match:
+        raise ValueError(f"잘못된 keep_alive 값입니다: {value}")
+    return float(match.group(1)) * DURATION_UNITS[match.group(2) or "s"]
+
+
+class FakeOllamaServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        models: Optional[List[str]] = None,
+        ttft: str = "lognormal:0.4,0.3",
+        tps: str = "lognormal:20,0.2",
+        prefill_tps: float = 400.0,
+        tokens: str = "normal:500,150",
+        parallel: int = 1,
+        seed: Optional[int] = None,
+        load_seconds: float = 2.0
+    ):
+        """
+        가짜 Ollama 서버
+
+        Args:
+            host, port: 바인드 주소 (port=0이면 빈 포트)
+            models: /api/tags에 보일 모델 목록 (없으면 OLLAMA_MODEL, OLLAMA_FAST_MODEL)
+            ttft: 프롬프트 처리 후 첫 토큰까지의 추가 지연 분포 (초)
+            tps: 요청별 토큰 생성 속도 분포 (토큰/초)
+            prefill_tps: 프롬프트 처리 속도 (토큰/초, 긴 전사일수록 첫 토큰이 늦어짐)
+            tokens: 생성 토큰 수 분포 (요청의 num_predict를 넘지 않음)
+            parallel: 동시에 생성하는 요청 수
+            seed: 난수 시드
+            load_seconds: 내려간 모델을 다시 올리는 시간 (초)
+        """
+        self.models = models or [name for name in (config.OLLAMA_MODEL, config.OLLAMA_FAST_MODEL) if name]
+        self.ttft = parse_distribution(ttft)
+        self.tps = parse_distribution(tps)
+        self.prefill_tps = prefill_tps
+        self.tokens = parse_distribution(tokens)
+        self.slots = threading.Semaphore(parallel)
+        self.load_seconds = load_seconds
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.generated_tokens = 0
+        self.cached_prompt_tokens = 0
+        self.model_loads = 0
+        # 모델 -> 내려가는 시각 (음수 keep_alive면 inf), 모델 -> 최근 system 메시지 (슬롯 수만큼)
+        self._expires_at: Dict[str, float] = {}
+        self._prefixes: Dict[str, Deque[str]] = {}
+        self._active: Dict[str, int] = {}
+        self._parallel = parallel
+
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """백그라운드 스레드에서 서버 시작 (서버 URL 반환)"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def sample(self, distribution) -> float:
+        with self.lock:
+            return distribution(self.rng)
+
+    def acquire_model(self, model: str, system: str) -> tuple:
+        """
+        생성 슬롯을 얻은 요청의 모델 상주 상태 확인 (요청이 끝나면 release_model 호출)
+
+        Returns:
+            (모델 로드 시간, system 메시지 캐시 적중 여부)
+        """
+        with self.lock:
+            now = time.monotonic()
+            if self._expires_at.get(model, 0.0) <= now:
+                # keep_alive가 지나 내려갔으면 다시 로드하고 KV 캐시도 비움
+                self._prefixes[model] = deque(maxlen=self._parallel)
+                self.model_loads += 1
+                load = self.load_seconds
+            else:
+                load = 0.0
+            # 생성 중인 요청이 있는 동안에는 내려가지 않음
+            self._expires_at[model] = float("inf")
+            self._active[model] = self._active.get(model, 0) + 1
+            prefixes = self._prefixes.setdefault(model, deque(maxlen=self._parallel))
+            hit = bool(system) and system in prefixes
+            if system:
+                if hit:
+                    prefixes.remove(system)
+                prefixes.append(system)
+            return load, hit
+
+    def release_model(self, model: str, keep_alive: float):
+        """마지막 요청이 끝난 뒤 keep_alive만큼 모델 유지 (음수면 계속, 0이면 바로 내림)"""
+        with self.lock:
+            self._active[model] -= 1
+            if self._active[model] == 0:
+                self._expires_at[model] = float("inf") if keep_alive < 0 else time.monotonic() + keep_alive
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass  # 요청마다 로그를 찍지 않음
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    self._send_json(200, {"models": [{"name": name, "model": name} for name in server.models]})
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if self.path not in ("/api/generate", "/api/chat"):
+                    self._send_json(404, {"error": "not found"})
+                    return
+                if body.get("model") not in server.models:
+                    self._send_json(404, {"error": f"model '{body.get('model')}' not found"})
+                    return
+                try:
+                    keep_alive = parse_keep_alive(body.get("keep_alive"))
+                except ValueError as e:
+                    self._send_json(400, {"error": str(e)})
+                    return
+                self._chat = self.path == "/api/chat"
+                self._generate(body, keep_alive)
+
+            def _generate(self, body: dict, keep_alive: float):
+                started = time.perf_counter()
+                with server.lock:
+                    server.requests += 1
+                num_predict = body.get("options", {}).get("num_predict") or config.OLLAMA_NUM_PREDICT
+                if self._chat:
+                    messages = body.get("messages", [])
+                    system = "".join(m.get("content", "") for m in messages if m.get("role") == "system")
+                    rest = "".join(m.get("content", "") for m in messages if m.get("role") != "system")
+                else:
+                    system, rest = body.get("system", ""), body.get("prompt", "")
+                count = max(1, min(int(server.sample(server.tokens)), num_predict))
+                seconds_per_token = 1.0 / max(0.1, server.sample(server.tps))
+                stream = body.get("stream", True)
+
+                # 동시 생성 수를 넘으면 앞 요청이 끝날 때까지 대기
+                with server.slots:
+                    load_seconds, prefix_hit = server.acquire_model(body["model"], system)
+                    time.sleep(load_seconds)
+                    # 같은 system 메시지가 KV 캐시에 남아 있으면 나머지 부분만 평가
+                    system_tokens = estimate_tokens(system)
+                    prompt_tokens = estimate_tokens(rest) + (0 if prefix_hit else system_tokens)
+                    if prefix_hit:
+                        with server.lock:
+                            server.cached_prompt_tokens += system_tokens
+                    prefill_seconds = prompt_tokens / server.prefill_tps
+                    time.sleep(prefill_seconds + server.sample(server.ttft))
+                    eval_started = time.perf_counter()
+                    if stream:
+                        self.send_response(200)
+                        self.send_header("Content-Type", "application/x-ndjson")
+                        self.send_header("Transfer-Encoding", "chunked")
+                        self.end_headers()
+                    pieces = []
+                    try:
+                        for index in range(count):
+                            offset = (index * TOKEN_CHARS) % len(SAMPLE_SUMMARY)
+                            piece = SAMPLE_SUMMARY[offset:offset + TOKEN_CHARS]
+                            pieces.append(piece)
+                            if stream:
+                                self._send_chunk(self._line(body["model"], piece, False))
+                            time.sleep(seconds_per_token)
+                    except (BrokenPipeError, ConnectionResetError):
+                        return  # 클라이언트가 생성 중에 연결을 끊음
+                    finally:
+                        server.release_model(body["model"], keep_alive)
+                    eval_seconds = time.perf_counter() - eval_started
+                with server.lock:
+                    server.generated_tokens += count
+
+                final = self._line(body["model"], "" if stream else "".join(pieces), True)
+                final.update({
+                    "prompt_eval_count": prompt_tokens,
+                    "prompt_eval_duration": int(prefill_seconds * 1e9),
+                    "eval_count": count,
+                    "eval_duration": int(eval_seconds * 1e9),
+                    "load_duration": int(load_seconds * 1e9),
+                    "total_duration": int((time.perf_counter() - started) * 1e9)
+                })
+                if stream:
+                    self._send_chunk(final)
+                    self.wfile.write(b"0\r\n\r\n")
+                else:
+                    self._send_json(200, final)
+
+            def _line(self, model: str, text: str, done: bool) -> dict:
+                line = {"model": model, "created_at": datetime.now(timezone.utc).isoformat()}
+                if self._chat:
+                    line["message"] = {"role": "assistant", "content": text}
+                else:
+                    line["response"] = text
+                line["done"] = done
+                return line
+
+            def _send_chunk(self, data: dict):
+                line = (json.dumps(data, ensure_ascii=False) + "\n").encode("utf-8")
+                self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+                self.wfile.flush()
+
+            def _send_json(self, status: int, data: dict):
+                payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지연 분포를 흉내 내는 가짜 Ollama 서버")
+    parser.add_argument("--host", default="127.0.0.1", help="바인드 주소")
+    parser.add_argument("--port", type=int, default=11435, help="포트")
+    parser.add_argument("--models", nargs="+", help="제공할 모델 이름 (기본값: OLLAMA_MODEL, OLLAMA_FAST_MODEL)")
+    parser.add_argument("--ttft", default="lognormal:0.4,0.3", help="첫 토큰 추가 지연 분포 (초)")
+    parser.add_argument("--tps", default="lognormal:20,0.2", help="토큰 생성 속도 분포 (토큰/초)")
+    parser.add_argument("--prefill-tps", type=float, default=400.0, help="프롬프트 처리 속도 (토큰/초)")
+    parser.add_argument("--tokens", default="normal:500,150", help="생성 토큰 수 분포")
+    parser.add_argument("--parallel", type=int, default=1, help="동시에 생성하는 요청 수")
+    parser.add_argument("--load-seconds", type=float, default=2.0, help="내려간 모델을 다시 올리는 시간 (초)")
+    args = parser.parse_args()
+
+    server = FakeOllamaServer(
+        args.host, args.port, args.models, args.ttft, args.tps, args.prefill_tps, args.tokens, args.parallel,
+        load_seconds=args.load_seconds
+    )
+    print(f"Fake Ollama listening on {server.url} (models: {', '.join(server.models)})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
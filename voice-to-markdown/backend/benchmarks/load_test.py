@@ -0,0 +1,498 @@
+"""
+업로드 → 완료 전체 파이프라인 부하 테스트
+
+실제 FastAPI 앱을 별도 프로세스로 띄우고 길이가 섞인 오디오를 동시에 업로드하여
+처리량(jobs/min), 단계별 소요 시간 p50/p95/p99, 서버 프로세스 트리의 최대 메모리(RSS)를 측정합니다.
+단계 시각은 /ws/{task_id} 이벤트를 받은 시각으로 기록합니다.
+
+- upload: 업로드 요청 시작 ~ 응답
+- stt_wait: 업로드 완료 ~ 음성 인식 시작 (대기열)
+- stt: 음성 인식 시작 ~ 전사 완료
+- llm_wait: 전사 완료 ~ 요약 시작 (요약 대기열)
+- llm_first_token: 요약 시작 ~ 첫 토큰
+- llm: 요약 시작 ~ 완료
+- total: 업로드 시작 ~ 완료
+
+기본값은 대역 모드입니다. STT는 benchmarks.standins 대역 엔진, Ollama는 benchmarks.fake_ollama를 쓰므로
+모델 없이 스케줄러/배치/스트리밍 경로의 병목을 측정할 수 있습니다.
+--real이면 서버 환경 변수대로 설치된 STT 엔진과 실제 Ollama를 사용합니다 (--audio로 실제 녹음 파일 지정 권장).
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.load_test --jobs 40 --concurrency 8
+    python -m benchmarks.load_test --durations 20:6,120:3,900:1 --stt-rtf lognormal:0.3,0.4 --llm-tps 12
+    python -m benchmarks.load_test --real --audio lecture.mp3 meeting.m4a --jobs 6 --concurrency 2
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --audio sample.wav   # 이미 실행 중인 서버
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import resource
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import wave
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+import websockets
+
+from app.models.schemas import ProcessingType, QualityHint
+from app.services.vad import SAMPLE_RATE
+
+from .fake_ollama import FakeOllamaServer
+from .standins import DEFAULT_STT_RTF, STANDIN_ENGINE, parse_distribution
+
+STAGES = ["upload", "stt_wait", "stt", "llm_wait", "llm_first_token", "llm", "total"]
+# 단계 시작/끝 시각 (request/uploaded는 업로드 요청 시작/응답, 나머지는 WebSocket 이벤트)
+STAGE_MARKS = {
+    "upload": ("request", "uploaded"),
+    "stt_wait": ("uploaded", "transcribing"),
+    "stt": ("transcribing", "transcribed"),
+    "llm_wait": ("transcribed", "summarizing"),
+    "llm_first_token": ("summarizing", "first_token"),
+    "llm": ("summarizing", "completed"),
+    "total": ("request", "completed"),
+}
+TERMINAL = ("completed", "failed", "cancelled")
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_duration_mix(spec: str) -> List[Tuple[float, float]]:
+    """"20:6,120:3,900:1" -> [(길이 초, 가중치)]"""
+    mix = []
+    for item in spec.split(","):
+        seconds, _, weight = item.partition(":")
+        mix.append((float(seconds), float(weight or 1)))
+    return mix
+
+
+def synthetic_wav(seconds: float, seed: int) -> bytes:
+    """
+    16kHz mono 16bit WAV (ffmpeg 없이 디코딩되는 형식)
+
+    말소리 대신 2~6초 길이의 잡음 구간과 0.3~1.5초 무음을 번갈아 넣어 VAD가 실제처럼 일부 구간을 건너뛰게 합니다.
+    시드가 다르면 내용도 달라 캐시에 걸리지 않습니다.
+    """
+    rng = np.random.default_rng(seed)
+    total = int(seconds * SAMPLE_RATE)
+    audio = np.zeros(total, dtype=np.int16)
+    position = 0
+    while position < total:
+        voiced = int(rng.uniform(2.0, 6.0) * SAMPLE_RATE)
+        end = min(total, position + voiced)
+        audio[position:end] = (rng.standard_normal(end - position) * 3000).clip(-32768, 32767).astype(np.int16)
+        position = end + int(rng.uniform(0.3, 1.5) * SAMPLE_RATE)
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(audio.tobytes())
+    return buffer.getvalue()
+
+
+def percentile_table(values: List[float]) -> Dict[str, float]:
+    array = np.array(values)
+    return {
+        "count": len(values),
+        "p50": round(float(np.percentile(array, 50)), 2),
+        "p95": round(float(np.percentile(array, 95)), 2),
+        "p99": round(float(np.percentile(array, 99)), 2),
+        "max": round(float(array.max()), 2),
+    }
+
+
+def _process_tree_rss_mb(root_pid: int) -> Optional[float]:
+    """프로세스와 모든 자식 프로세스(STT 워커 등)의 현재 RSS 합계 (MB, /proc이 없으면 None)"""
+    if not os.path.isdir("/proc"):
+        return None
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                parent = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+
+    total_kb = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+        stack.extend(children.get(pid, []))
+    return total_kb / 1024
+
+
+class RssSampler:
+    def __init__(self, pid: int, interval: float = 0.5):
+        """서버 프로세스 트리의 RSS 합계를 주기적으로 측정하여 최댓값 기록"""
+        self.pid = pid
+        self.interval = interval
+        self.peak_mb: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            rss = _process_tree_rss_mb(self.pid)
+            if rss is not None:
+                self.peak_mb = max(self.peak_mb or 0.0, rss)
+            self._stop.wait(self.interval)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class BenchmarkServer:
+    def __init__(self, real: bool, env: Dict[str, str], keep_workdir: bool = False):
+        """
+        빈 작업 디렉토리에서 API 서버를 별도 프로세스로 실행 (uploads/results/cache가 저장소를 더럽히지 않음)
+
+        Args:
+            real: True면 uvicorn으로 그대로 실행, False면 STT 대역 엔진을 등록하여 실행
+            env: 서버 프로세스에 추가할 환경 변수
+        """
+        self.real = real
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.workdir = tempfile.mkdtemp(prefix="v2m-bench-")
+        self.keep_workdir = keep_workdir
+        self.env = {**os.environ, "PYTHONPATH": PROJECT_DIR, **env}
+        self.process: Optional[subprocess.Popen] = None
+        self.log_path = os.path.join(self.workdir, "server.log")
+
+    def start(self, timeout: float):
+        if self.real:
+            command = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(self.port), "--log-level", "warning"]
+        else:
+            command = [sys.executable, "-m", "benchmarks.standins", "--port", str(self.port)]
+        self._log = open(self.log_path, "w")
+        self.process = subprocess.Popen(command, cwd=self.workdir, env=self.env, stdout=self._log, stderr=subprocess.STDOUT)
+        self._wait_ready(timeout)
+
+    def _wait_ready(self, timeout: float):
+        """/health가 200(미리 로드할 모델 준비 완료)이 될 때까지 대기"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                self.keep_workdir = True  # 로그를 확인할 수 있도록 보존
+                raise Exception(f"서버가 시작하지 못했습니다. 로그: {self.log_path}")
+            try:
+                if httpx.get(f"{self.url}/health", timeout=2).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.5)
+        self.keep_workdir = True
+        raise Exception(f"서버가 {timeout:.0f}초 안에 준비되지 않았습니다. 로그: {self.log_path}")
+
+    def stop(self) -> Optional[float]:
+        """
+        서버 종료 (워커 프로세스까지 정리되도록 SIGINT로 lifespan 종료 처리)
+
+        Returns:
+            서버와 그 자식 중 가장 큰 프로세스의 최대 RSS (MB)
+        """
+        if self.process is None:
+            return None
+        self.process.send_signal(signal.SIGINT)
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self._log.close()
+        if not self.keep_workdir:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+        peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        # Linux는 KB, macOS는 바이트 단위
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def run_job(
+    client: httpx.AsyncClient,
+    ws_url: str,
+    index: int,
+    audio: Tuple[str, bytes, float],
+    processing_type: str,
+    quality: Optional[str],
+    timeout: float
+) -> dict:
+    """업로드 한 건을 완료될 때까지 추적하며 이벤트 시각 기록 (대기열이 가득 차면 Retry-After만큼 기다렸다가 재시도)"""
+    name, data, seconds = audio
+    marks: Dict[str, float] = {}
+    rejected = 0
+    fields = {"processing_type": processing_type}
+    if quality:
+        fields["quality"] = quality
+
+    while True:
+        marks["request"] = time.monotonic()
+        response = await client.post("/upload", files={"file": (name, data, "audio/wav")}, data=fields)
+        if response.status_code != 429:
+            break
+        rejected += 1
+        await asyncio.sleep(float(response.headers.get("Retry-After", 1)))
+    marks["uploaded"] = time.monotonic()
+    job = {"index": index, "audio_seconds": seconds, "rejected": rejected, "status": "failed"}
+    if response.status_code != 200:
+        job["error"] = f"upload {response.status_code}: {response.text[:200]}"
+        return job
+    task_id = response.json()["task_id"]
+    job["task_id"] = task_id
+
+    async def follow():
+        async with websockets.connect(f"{ws_url}/ws/{task_id}", max_size=None) as ws:
+            async for message in ws:
+                now = time.monotonic()
+                event = json.loads(message)
+                status = event.get("status")
+                if status:
+                    marks.setdefault(status, now)
+                if event.get("type") == "transcript_delta" or (event.get("type") == "snapshot" and event.get("transcript")):
+                    marks.setdefault("transcribed", now)
+                if event.get("type") == "summary_delta":
+                    marks.setdefault("first_token", now)
+                if status in TERMINAL:
+                    return
+
+    try:
+        await asyncio.wait_for(follow(), timeout)
+    except (asyncio.TimeoutError, websockets.ConnectionClosed) as e:
+        job["error"] = f"websocket: {e!r}"
+
+    status = (await client.get(f"/status/{task_id}")).json()
+    job.update({
+        "status": status["status"],
+        "message": status["message"],
+        "stt_model": status.get("stt_model"),
+        "llm_model": status.get("llm_model"),
+    })
+    job["stages"] = {
+        stage: round(marks[end] - marks[start], 3)
+        for stage, (start, end) in STAGE_MARKS.items()
+        if start in marks and end in marks
+    }
+    return job
+
+
+async def run_load(args, base_url: str, audios: List[Tuple[str, bytes, float]]) -> Tuple[List[dict], float]:
+    """동시 사용자 concurrency명이 jobs건을 나누어 차례로 업로드 (닫힌 부하 모델)"""
+    rng = random.Random(args.seed)
+    mix = parse_duration_mix(args.durations)
+    plan = []
+    for index in range(args.jobs):
+        if args.audio:
+            audio = audios[index % len(audios)]
+        else:
+            seconds = rng.choices([seconds for seconds, _ in mix], [weight for _, weight in mix])[0]
+            audio = (f"bench-{index}.wav", synthetic_wav(seconds, args.seed * 100003 + index), seconds)
+        processing_type = args.processing_type or rng.choice([t.value for t in ProcessingType])
+        plan.append((index, audio, processing_type))
+
+    ws_url = base_url.replace("http", "ws", 1)
+    pending = iter(plan)
+    results = []
+    limits = httpx.Limits(max_connections=args.concurrency * 2)
+    async with httpx.AsyncClient(base_url=base_url, timeout=httpx.Timeout(300.0), limits=limits) as client:
+        async def user():
+            for index, audio, processing_type in pending:
+                job = await run_job(client, ws_url, index, audio, processing_type, args.quality, args.job_timeout)
+                results.append(job)
+                print(
+                    f"  job {job['index']:>3} {job['audio_seconds']:>6.0f}s audio -> {job['status']:<9} "
+                    f"total {job['stages'].get('total', float('nan')):>7.1f}s  "
+                    f"{job.get('stt_model') or ''} / {job.get('llm_model') or ''}",
+                    flush=True
+                )
+
+        started = time.monotonic()
+        await asyncio.gather(*(user() for _ in range(args.concurrency)))
+        elapsed = time.monotonic() - started
+    return results, elapsed
+
+
+def build_report(results: List[dict], elapsed: float, peak_tree_mb: Optional[float], peak_process_mb: Optional[float]) -> dict:
+    completed = [job for job in results if job["status"] == "completed"]
+    stages = {}
+    for stage in STAGES:
+        values = [job["stages"][stage] for job in completed if stage in job["stages"]]
+        if values:
+            stages[stage] = percentile_table(values)
+    audio_seconds = sum(job["audio_seconds"] for job in completed)
+    stt_seconds = sum(job["stages"].get("stt", 0.0) for job in completed)
+
+    models: Dict[str, int] = {}
+    for job in completed:
+        key = f"{job.get('stt_model')} / {job.get('llm_model')}"
+        models[key] = models.get(key, 0) + 1
+
+    return {
+        "jobs": len(results),
+        "completed": len(completed),
+        "failed": [{"index": job["index"], "message": job.get("error") or job.get("message")} for job in results if job["status"] != "completed"],
+        "rejected_uploads": sum(job["rejected"] for job in results),
+        "wall_seconds": round(elapsed, 1),
+        "jobs_per_minute": round(len(completed) / elapsed * 60, 2) if elapsed else None,
+        "audio_minutes_per_minute": round(audio_seconds / elapsed, 2) if elapsed and audio_seconds else None,
+        "stt_rtf": round(stt_seconds / audio_seconds, 3) if audio_seconds else None,
+        "stages": stages,
+        "models": models,
+        "peak_rss_tree_mb": round(peak_tree_mb, 1) if peak_tree_mb is not None else None,
+        "peak_rss_process_mb": round(peak_process_mb, 1) if peak_process_mb is not None else None,
+    }
+
+
+def print_report(report: dict):
+    print()
+    print(
+        f"완료 {report['completed']}/{report['jobs']}건, {report['wall_seconds']}초, "
+        f"{report['jobs_per_minute']} jobs/min, 오디오 {report['audio_minutes_per_minute']}분/분, "
+        f"STT RTF {report['stt_rtf']}, 429 재시도 {report['rejected_uploads']}회"
+    )
+    print()
+    print(f"{'stage':<16} {'n':>4} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} {'max s':>8}")
+    print("-" * 58)
+    for stage, row in report["stages"].items():
+        print(f"{stage:<16} {row['count']:>4} {row['p50']:>8.2f} {row['p95']:>8.2f} {row['p99']:>8.2f} {row['max']:>8.2f}")
+    print()
+    for models, count in report["models"].items():
+        print(f"모델 {models}: {count}건")
+    tree = report["peak_rss_tree_mb"]
+    process = report["peak_rss_process_mb"]
+    print(
+        f"최대 RSS: 서버 프로세스 트리 합계 {f'{tree:.0f} MB' if tree is not None else '측정 불가'}, "
+        f"가장 큰 프로세스 {f'{process:.0f} MB' if process is not None else '측정 불가'}"
+    )
+    for failure in report["failed"]:
+        print(f"실패 job {failure['index']}: {failure['message']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="업로드 → 완료 파이프라인 부하 테스트")
+    parser.add_argument("--jobs", type=int, default=20, help="전체 업로드 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 업로드/대기하는 사용자 수")
+    parser.add_argument("--durations", default="20:6,120:3,900:1", help="합성 오디오 길이(초):가중치 목록")
+    parser.add_argument("--audio", nargs="+", help="합성 오디오 대신 돌아가며 업로드할 오디오 파일")
+    parser.add_argument("--processing-type", choices=[t.value for t in ProcessingType], help="처리 유형 (기본값: 무작위)")
+    parser.add_argument("--quality", choices=[q.value for q in QualityHint], help="업로드 품질 힌트")
+    parser.add_argument("--seed", type=int, default=1, help="난수 시드")
+    parser.add_argument("--job-timeout", type=float, default=3600, help="작업 하나의 최대 대기 시간 (초)")
+    parser.add_argument("--json", help="결과를 JSON 파일로도 저장")
+
+    server_group = parser.add_argument_group("서버")
+    server_group.add_argument("--url", help="이미 실행 중인 서버 주소 (지정하면 서버를 띄우지 않고 RSS도 측정하지 않음)")
+    server_group.add_argument("--real", action="store_true", help="대역 대신 설치된 STT 엔진과 실제 Ollama 사용")
+    server_group.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="서버 환경 변수 (여러 번 지정 가능)")
+    server_group.add_argument("--keep-cache", action="store_true", help="전사/요약 캐시 사용 (기본값: 끔, 같은 파일 반복 시 측정 왜곡 방지)")
+    server_group.add_argument("--keep-workdir", action="store_true", help="서버 작업 디렉토리(로그, 결과) 보존")
+    server_group.add_argument("--startup-timeout", type=float, default=600, help="서버 준비 대기 시간 (초)")
+
+    standin_group = parser.add_argument_group("대역 (--real이 아닐 때)")
+    standin_group.add_argument("--stt-rtf", default=DEFAULT_STT_RTF, help="STT 실시간 대비 처리 시간 분포 (base 모델 기준)")
+    standin_group.add_argument("--stt-load-seconds", type=float, default=1.0, help="STT 워커 모델 로드 시간")
+    standin_group.add_argument("--stt-busy", action="store_true", help="STT 대역이 sleep 대신 CPU를 점유")
+    standin_group.add_argument("--llm-ttft", default="lognormal:0.4,0.3", help="첫 토큰 추가 지연 분포 (초)")
+    standin_group.add_argument("--llm-tps", default="lognormal:20,0.2", help="토큰 생성 속도 분포 (토큰/초)")
+    standin_group.add_argument("--llm-prefill-tps", type=float, default=400.0, help="프롬프트 처리 속도 (토큰/초)")
+    standin_group.add_argument("--llm-tokens", default="normal:500,150", help="생성 토큰 수 분포")
+    standin_group.add_argument("--llm-parallel", type=int, default=1, help="가짜 Ollama 동시 생성 수")
+    args = parser.parse_args()
+
+    for spec in (args.stt_rtf, args.llm_ttft, args.llm_tps, args.llm_tokens):
+        try:
+            parse_distribution(spec)
+        except ValueError as e:
+            parser.error(str(e))
+
+    audios = []
+    for path in args.audio or []:
+        with open(path, "rb") as f:
+            data = f.read()
+        audios.append((os.path.basename(path), data, 0.0))
+
+    env = dict(item.split("=", 1) for item in args.env)
+    if not args.keep_cache:
+        env.setdefault("CACHE_MAX_MB", "0")
+    env.setdefault("TASK_DB_PATH", "tasks.db")
+
+    fake_ollama = None
+    server = None
+    sampler = None
+    peak_process_mb = None
+    base_url = args.url
+    try:
+        if base_url is None:
+            if not args.real:
+                fake_ollama = FakeOllamaServer(
+                    ttft=args.llm_ttft,
+                    tps=args.llm_tps,
+                    prefill_tps=args.llm_prefill_tps,
+                    tokens=args.llm_tokens,
+                    parallel=args.llm_parallel,
+                    seed=args.seed,
+                    models=[name for name in (env.get("OLLAMA_MODEL"), env.get("OLLAMA_FAST_MODEL")) if name] or None
+                )
+                env.setdefault("OLLAMA_BASE_URL", fake_ollama.start())
+                env.update({
+                    "STT_ENGINE": STANDIN_ENGINE,
+                    "BENCH_STT_RTF": args.stt_rtf,
+                    "BENCH_STT_LOAD_SECONDS": str(args.stt_load_seconds),
+                    "BENCH_STT_BUSY": "1" if args.stt_busy else "",
+                })
+            server = BenchmarkServer(args.real, env, args.keep_workdir)
+            print(f"Starting API server on {server.url} ({'real models' if args.real else 'stand-ins'}), log: {server.log_path}")
+            server.start(args.startup_timeout)
+            base_url = server.url
+            sampler = RssSampler(server.process.pid)
+            sampler.start()
+
+        print(f"Running {args.jobs} jobs with {args.concurrency} concurrent users against {base_url}")
+        results, elapsed = asyncio.run(run_load(args, base_url, audios))
+    finally:
+        if sampler is not None:
+            sampler.stop()
+        if server is not None:
+            peak_process_mb = server.stop()
+        if fake_ollama is not None:
+            fake_ollama.stop()
+
+    report = build_report(results, elapsed, sampler.peak_mb if sampler else None, peak_process_mb)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"report": report, "jobs": results, "args": vars(args)}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+벤치마크용 STT 대역 엔진
+
+모델 없이 지연 분포만 흉내 내는 STT 엔진입니다. 워커 프로세스 풀, PCM 디코딩, VAD, 짧은 오디오 배치,
+긴 오디오 분할, 진행률 전달은 실제 엔진과 같은 코드(STTService)를 그대로 타고
+모델 추론만 "오디오 길이 × RTF" 동안 기다리는 것으로 대신합니다.
+
+설정은 환경 변수로 받습니다 (spawn 워커 프로세스도 같은 값을 읽음).
+    BENCH_STT_RTF: 실시간 대비 처리 시간 분포 (base 모델 기준, 기본값 lognormal:0.15,0.35)
+    BENCH_STT_LOAD_SECONDS: 워커 하나의 모델 로드 시간 (기본값 1)
+    BENCH_STT_BUSY: 1이면 sleep 대신 CPU를 점유하며 기다림 (워커 간 CPU 경합까지 재현)
+
+대역 엔진으로 API 서버 실행 (backend 디렉토리에서, Ollama는 실제 서버나 benchmarks.fake_ollama 사용):
+    python -m benchmarks.standins --port 8000
+"""
+import argparse
+import math
+import os
+import random
+import time
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from app import config
+from app.services import vad
+from app.services.stt_base import STTService, transcribe_pcm_batch, transcribe_pcm_range
+from app.services.stt_engines import STT_ENGINES
+
+STANDIN_ENGINE = "standin"
+DEFAULT_STT_RTF = "lognormal:0.15,0.35"
+# base 모델 대비 모델 크기별 처리 시간 배율 (모델 선택 정책의 효과를 볼 수 있도록)
+MODEL_RTF_SCALE = {
+    "tiny": 0.4,
+    "base": 1.0,
+    "small": 2.2,
+    "medium": 4.5,
+    "large": 9.0,
+}
+# 배치 인식: 가장 긴 클립은 그대로, 나머지 클립은 이 비율만큼만 시간이 더 걸림
+BATCH_EXTRA_COST = 0.25
+# 대역 전사 결과 (세그먼트 하나에 문장 하나씩 돌아가며 사용)
+SAMPLE_SENTENCES = [
+    "오늘은 지난 시간에 이어서 데이터 구조에 대해 알아보겠습니다.",
+    "배열은 같은 타입의 데이터를 연속된 메모리에 저장합니다.",
+    "연결 리스트는 노드마다 다음 노드의 주소를 함께 저장합니다.",
+    "삽입과 삭제가 잦다면 연결 리스트가 더 유리할 수 있습니다.",
+    "다음 회의까지 각자 맡은 부분의 초안을 준비하기로 했습니다.",
+    "일정은 다음 주 금요일까지로 조정하는 것이 좋겠습니다.",
+]
+SEGMENT_SECONDS = 5.0
+
+
+def parse_distribution(spec: str) -> Callable[[random.Random], float]:
+    """
+    지연 분포 문자열을 샘플링 함수로 변환 (결과는 0 이상)
+
+    - "0.3" 또는 "const:0.3": 고정값
+    - "uniform:최소,최대"
+    - "normal:평균,표준편차"
+    - "lognormal:중앙값,sigma": 꼬리가 긴 분포 (실제 추론 지연에 가까움)
+
+    Raises:
+        ValueError: 형식이 잘못된 경우
+    """
+    kind, _, params = spec.partition(":")
+    if not params:
+        kind, params = "const", kind
+    try:
+        values = [float(value) for value in params.split(",")]
+    except ValueError:
+        raise ValueError(f"잘못된 분포 형식입니다: {spec}")
+
+    if kind == "const" and len(values) == 1:
+        return lambda rng: max(0.0, values[0])
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: max(0.0, rng.uniform(values[0], values[1]))
+    if kind == "normal" and len(values) == 2:
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal" and len(values) == 2 and values[0] > 0:
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1])
+    raise ValueError(f"잘못된 분포 형식입니다: {spec} (const, uniform, normal, lognormal)")
+
+
+def register_stt_engine():
+    """대역 엔진을 STT 엔진 목록에 등록 (app.main을 import하기 전에 호출)"""
+    STT_ENGINES.setdefault(STANDIN_ENGINE, ("benchmarks", "benchmarks.standins", "StandInSTTService"))
+
+
+# 워커 프로세스마다 한 번만 만드는 설정
+_rtf: Optional[Callable[[random.Random], float]] = None
+_rtf_scale = 1.0
+_busy = False
+_rng = random.Random()
+
+
+def _wait(seconds: float):
+    """모델 추론 대신 기다림 (BENCH_STT_BUSY=1이면 CPU 점유)"""
+    deadline = time.perf_counter() + seconds
+    if not _busy:
+        time.sleep(seconds)
+        return
+    while time.perf_counter() < deadline:
+        pass
+
+
+def _init_worker(model_size: str, num_threads: int, device: str = "cpu", compute_type: str = "float32"):
+    """워커 프로세스 초기화: 환경 변수에서 지연 분포를 읽고 모델 로드 시간만큼 대기"""
+    global _rtf, _rtf_scale, _busy, _rng
+
+    _rtf = parse_distribution(os.environ.get("BENCH_STT_RTF", DEFAULT_STT_RTF))
+    _rtf_scale = MODEL_RTF_SCALE.get(model_size.split(".")[0].split("-")[0], 1.0)
+    _busy = os.environ.get("BENCH_STT_BUSY", "") == "1"
+    _rng = random.Random(os.getpid())
+    print(f"[worker {os.getpid()}] Loading stand-in STT model: {model_size} (RTF x{_rtf_scale})")
+    _wait(float(os.environ.get("BENCH_STT_LOAD_SECONDS", "1")))
+
+
+def _warm_up_worker() -> int:
+    return os.getpid()
+
+
+def _sample_segments(duration: float) -> List[dict]:
+    """오디오 길이만큼 SEGMENT_SECONDS 간격의 대역 세그먼트"""
+    count = max(1, math.ceil(duration / SEGMENT_SECONDS))
+    return [
+        {
+            "start": index * SEGMENT_SECONDS,
+            "end": min(duration, (index + 1) * SEGMENT_SECONDS),
+            "text": SAMPLE_SENTENCES[index % len(SAMPLE_SENTENCES)],
+            "avg_logprob": -0.2
+        }
+        for index in range(count)
+    ]
+
+
+def _model_transcribe(audio: np.ndarray, language: str, report: Callable[[float, float], None]) -> List[dict]:
+    """오디오 길이 × RTF 동안 30초 창 단위로 기다리며 진행률 보고"""
+    duration = len(audio) / vad.SAMPLE_RATE
+    seconds_per_audio_second = _rtf(_rng) * _rtf_scale
+    position = 0.0
+    while position < duration:
+        window = min(30.0, duration - position)
+        _wait(window * seconds_per_audio_second)
+        position += window
+        report(position, duration)
+    return _sample_segments(duration)
+
+
+def _model_transcribe_batch(audios: List[np.ndarray], language: str) -> List[List[dict]]:
+    """클립 여러 개를 한 번에 인식하는 것처럼 대기 (가장 긴 클립 + 나머지의 BATCH_EXTRA_COST배)"""
+    durations = [len(audio) / vad.SAMPLE_RATE for audio in audios]
+    longest = max(durations)
+    _wait((longest + BATCH_EXTRA_COST * (sum(durations) - longest)) * _rtf(_rng) * _rtf_scale)
+    return [_sample_segments(duration) for duration in durations]
+
+
+def _transcribe_in_worker(
+    pcm_path: str,
+    start: int,
+    end: int,
+    language: str,
+    progress_queue=None,
+    vad_options: Optional[dict] = None
+) -> dict:
+    return transcribe_pcm_range(pcm_path, start, end, language, progress_queue, vad_options, _model_transcribe)
+
+
+def _transcribe_batch_in_worker(clips, language: str, vad_options: Optional[dict] = None) -> List[dict]:
+    return transcribe_pcm_batch(clips, language, vad_options, _model_transcribe_batch)
+
+
+class StandInSTTService(STTService):
+    """지연 분포만 흉내 내는 벤치마크용 STT 엔진 (모델 추론 외에는 실제 엔진과 같은 경로)"""
+    engine_name = STANDIN_ENGINE
+    model_memory_mb = {size: 20 for size in MODEL_RTF_SCALE}
+    worker_init = staticmethod(_init_worker)
+    worker_warm_up = staticmethod(_warm_up_worker)
+    worker_transcribe = staticmethod(_transcribe_in_worker)
+    worker_transcribe_batch = staticmethod(_transcribe_batch_in_worker)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="STT 대역 엔진으로 API 서버 실행")
+    parser.add_argument("--host", default="127.0.0.1", help="바인드 주소")
+    parser.add_argument("--port", type=int, default=8000, help="포트")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    register_stt_engine()
+    # app.main(processor_demo)을 import하기 전에 바꿔야 데모 모드 대신 대역 엔진을 기본 엔진으로 사용
+    config.STT_ENGINE = STANDIN_ENGINE
+    uvicorn.run("app.main:app", host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+API 서버 시작 비용 측정 (import 시간, 시작 시간, 메모리)
+
+매번 새 파이썬 프로세스에서 app.main을 import하고 lifespan 시작(작업 저장소, 스케줄러 등)까지 마친 뒤 측정합니다.
+기본값은 STT 모델을 미리 로드하지 않으므로(WHISPER_PRELOAD=none) /status, /download만 처리하는 API 프로세스 자체의 비용입니다.
+--env WHISPER_PRELOAD=base처럼 지정하면 미리 로드가 끝날 때까지 기다린 뒤 API 프로세스(워커 제외)를 측정합니다.
+
+- interpreter: 빈 파이썬 프로세스 실행 시간 (기준선)
+- import: app.main import 시간
+- startup: lifespan 시작 시간
+- rss: 시작을 마친 API 프로세스의 RSS
+- heavy modules: API 프로세스에 로드되면 안 되는 모듈(torch, whisper, faster_whisper, ctranslate2) 중 로드된 것
+  (엔진 패키지는 워커 프로세스에서만 import하고 설치 여부는 import 없이 확인해야 함)
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 5 --json startup.json
+    python -m benchmarks.startup --env STT_ENGINE=faster-whisper --importtime
+    python -m benchmarks.startup --env WHISPER_PRELOAD=base   # 모델 워커를 띄워도 API 프로세스는 가벼운지 확인
+    python -m benchmarks.startup --max-import-seconds 1.5 --max-rss-mb 150   # 넘거나 무거운 모듈이 로드되면 종료 코드 1
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# API 프로세스에는 로드되면 안 되는 모듈 (STT 워커 프로세스 전용)
+HEAVY_MODULES = ("torch", "whisper", "faster_whisper", "ctranslate2", "onnxruntime", "transformers")
+# 측정 프로세스가 결과를 출력하는 줄의 접두어 (앱의 print 출력과 구분)
+RESULT_PREFIX = "V2M_STARTUP_RESULT "
+
+
+def _current_rss_mb() -> Optional[float]:
+    """현재 프로세스의 RSS (MB, /proc이 없으면 최대 RSS로 대신)"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KB 단위
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _measure_in_process(ready_timeout: float):
+    """측정 프로세스 본체: app.main import와 lifespan 시작 시간, RSS 측정 후 결과 한 줄 출력"""
+    import asyncio
+
+    started = time.perf_counter()
+    from app import main as app_main
+    imported = time.perf_counter()
+    import_rss_mb = _current_rss_mb()
+
+    async def start_and_stop():
+        lifespan_started = time.perf_counter()
+        async with app_main.lifespan(app_main.app):
+            startup_seconds = time.perf_counter() - lifespan_started
+            # 미리 로드할 모델이 있으면 로드가 끝날 때까지 대기 (로드 실패도 끝난 것으로 봄)
+            registry = app_main.app.state.model_registry
+            deadline = time.perf_counter() + ready_timeout
+            while registry.preload and time.perf_counter() < deadline:
+                models = registry.status()["models"]
+                if models and all(model["state"] != "loading" for model in models):
+                    break
+                await asyncio.sleep(0.1)
+            ready_seconds = time.perf_counter() - lifespan_started if registry.preload else None
+            return startup_seconds, ready_seconds, registry.status()["models"]
+
+    startup_seconds, ready_seconds, models = asyncio.run(start_and_stop())
+    processor = getattr(app_main.app.state, "audio_processor", None)
+    result = {
+        "import_seconds": imported - started,
+        "startup_seconds": startup_seconds,
+        "models_ready_seconds": ready_seconds,
+        "models": [{"key": model["key"], "state": model["state"], "error": model["error"]} for model in models],
+        "import_rss_mb": import_rss_mb,
+        "rss_mb": _current_rss_mb(),
+        "heavy_modules": [name for name in HEAVY_MODULES if name in sys.modules],
+        "stt_engine": app_main.config.STT_ENGINE,
+        "real_stt": processor.use_real_stt if processor is not None else None,
+        "real_llm": processor.use_real_llm if processor is not None else None,
+    }
+    print(RESULT_PREFIX + json.dumps(result), flush=True)
+
+
+def _slowest_imports(stderr: str, top: int) -> List[Dict[str, float]]:
+    """python -X importtime 출력에서 누적 import 시간이 긴 최상위 패키지 목록"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            cumulative_us = int(cumulative)
+        except ValueError:
+            continue
+        name = name.strip()
+        # 최상위 패키지만 (하위 모듈은 상위 패키지 누적 시간에 포함됨)
+        if "." not in name:
+            rows.append({"module": name, "seconds": cumulative_us / 1e6})
+    rows.sort(key=lambda row: row["seconds"], reverse=True)
+    return rows[:top]
+
+
+def run_once(env: Dict[str, str], importtime: bool, ready_timeout: float) -> dict:
+    """
+    새 프로세스에서 한 번 측정
+
+    Raises:
+        Exception: 측정 프로세스가 실패한 경우
+    """
+    workdir = tempfile.mkdtemp(prefix="v2m-startup-")
+    try:
+        baseline_started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        interpreter_seconds = time.perf_counter() - baseline_started
+
+        command = [sys.executable]
+        if importtime:
+            command += ["-X", "importtime"]
+        command += ["-m", "benchmarks.startup", "--child", "--ready-timeout", str(ready_timeout)]
+        started = time.perf_counter()
+        process = subprocess.run(
+            command,
+            cwd=workdir,
+            env={**os.environ, "PYTHONPATH": PROJECT_DIR, **env},
+            capture_output=True,
+            text=True
+        )
+        wall_seconds = time.perf_counter() - started
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    lines = [line for line in process.stdout.splitlines() if line.startswith(RESULT_PREFIX)]
+    if process.returncode != 0 or not lines:
+        raise Exception(f"측정 프로세스가 실패했습니다 (종료 코드 {process.returncode}):\n{process.stderr[-2000:]}")
+    result = json.loads(lines[-1][len(RESULT_PREFIX):])
+    result["interpreter_seconds"] = interpreter_seconds
+    result["wall_seconds"] = wall_seconds
+    if importtime:
+        result["slowest_imports"] = _slowest_imports(process.stderr, 10)
+    return result
+
+
+def build_report(runs: List[dict]) -> dict:
+    """여러 번 측정한 값의 중앙값 (처음 실행은 디스크 캐시 영향이 커서 최댓값도 함께 기록)"""
+    def summarize(key: str) -> Optional[dict]:
+        values = [run[key] for run in runs if run.get(key) is not None]
+        if not values:
+            return None
+        return {"median": round(statistics.median(values), 3), "max": round(max(values), 3)}
+
+    return {
+        "runs": len(runs),
+        "stt_engine": runs[0]["stt_engine"],
+        "real_stt": runs[0]["real_stt"],
+        "real_llm": runs[0]["real_llm"],
+        "interpreter_seconds": summarize("interpreter_seconds"),
+        "import_seconds": summarize("import_seconds"),
+        "startup_seconds": summarize("startup_seconds"),
+        "models_ready_seconds": summarize("models_ready_seconds"),
+        "models": runs[-1]["models"],
+        "wall_seconds": summarize("wall_seconds"),
+        "import_rss_mb": summarize("import_rss_mb"),
+        "rss_mb": summarize("rss_mb"),
+        "heavy_modules": sorted({name for run in runs for name in run["heavy_modules"]}),
+        "slowest_imports": runs[-1].get("slowest_imports"),
+    }
+
+
+def print_report(report: dict):
+    def value(key: str, unit: str, digits: int) -> str:
+        stats = report[key]
+        if stats is None:
+            return "측정 불가"
+        return f"{stats['median']:.{digits}f}{unit} (최대 {stats['max']:.{digits}f}{unit})"
+
+    print()
+    print(f"API 시작 비용 ({report['runs']}회 중앙값, STT 엔진 {report['stt_engine']}, "
+          f"STT {'실제' if report['real_stt'] else '더미'}, 요약 {'실제' if report['real_llm'] else '더미'})")
+    print(f"  파이썬 실행 (기준선): {value('interpreter_seconds', 's', 3)}")
+    print(f"  app.main import:      {value('import_seconds', 's', 3)}")
+    print(f"  lifespan 시작:        {value('startup_seconds', 's', 3)}")
+    if report["models_ready_seconds"] is not None:
+        states = ", ".join(f"{model['key']} {model['state']}" for model in report["models"])
+        print(f"  모델 미리 로드:       {value('models_ready_seconds', 's', 3)} ({states})")
+    print(f"  프로세스 전체:        {value('wall_seconds', 's', 3)}")
+    print(f"  RSS (import 직후):    {value('import_rss_mb', ' MB', 1)}")
+    print(f"  RSS (시작 완료):      {value('rss_mb', ' MB', 1)}")
+    heavy = report["heavy_modules"]
+    print(f"  무거운 모듈:          {', '.join(heavy) if heavy else '없음'}")
+    if report["slowest_imports"]:
+        print()
+        print(f"{'module':<24} {'import s':>9}")
+        print("-" * 34)
+        for row in report["slowest_imports"]:
+            print(f"{row['module']:<24} {row['seconds']:>9.3f}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 서버 시작 비용(import 시간, 시작 시간, RSS) 측정")
+    parser.add_argument("--runs", type=int, default=3, help="측정 횟수 (매번 새 프로세스)")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="서버 환경 변수 (여러 번 지정 가능)")
+    parser.add_argument("--importtime", action="store_true", help="python -X importtime으로 느린 import 상위 목록 출력")
+    parser.add_argument("--json", help="결과를 JSON 파일로도 저장")
+    parser.add_argument("--ready-timeout", type=float, default=600, help="WHISPER_PRELOAD 모델 로드 대기 시간 (초)")
+    parser.add_argument("--max-import-seconds", type=float, help="app.main import 중앙값이 이보다 길면 실패 (종료 코드 1)")
+    parser.add_argument("--max-rss-mb", type=float, help="시작 완료 후 RSS 중앙값이 이보다 크면 실패 (종료 코드 1)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _measure_in_process(args.ready_timeout)
+        return
+
+    env = dict(item.split("=", 1) for item in args.env)
+    # 모델 워커를 띄우지 않은 API 프로세스만 측정 (워커는 별도 프로세스)
+    env.setdefault("WHISPER_PRELOAD", "none")
+    env.setdefault("TASK_DB_PATH", "tasks.db")
+
+    runs = []
+    for index in range(max(1, args.runs)):
+        # importtime 출력은 마지막 실행에서만 수집 (측정값에 영향을 주지 않도록)
+        run = run_once(env, args.importtime and index == args.runs - 1, args.ready_timeout)
+        rss = f", RSS {run['rss_mb']:.1f} MB" if run["rss_mb"] is not None else ""
+        print(f"run {index + 1}: import {run['import_seconds']:.3f}s, startup {run['startup_seconds']:.3f}s{rss}")
+        runs.append(run)
+
+    report = build_report(runs)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"report": report, "runs": runs, "args": vars(args)}, f, ensure_ascii=False, indent=2)
+
+    failures = []
+    if report["heavy_modules"]:
+        failures.append(f"API 프로세스에 무거운 모듈이 로드되었습니다: {', '.join(report['heavy_modules'])}")
+    if args.max_import_seconds is not None and report["import_seconds"]["median"] > args.max_import_seconds:
+        failures.append(f"import 시간 {report['import_seconds']['median']:.3f}s > {args.max_import_seconds}s")
+    if args.max_rss_mb is not None and report["rss_mb"] is not None and report["rss_mb"]["median"] > args.max_rss_mb:
+        failures.append(f"RSS {report['rss_mb']['median']:.1f} MB > {args.max_rss_mb} MB")
+    for failure in failures:
+        print(f"실패: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
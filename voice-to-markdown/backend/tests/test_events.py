@@ -0,0 +1,51 @@
+import asyncio
+
+from app.services.events import RESYNC_EVENT, TaskEventBus, drain
+
+
+def test_publish_reaches_only_subscribers_of_the_task():
+    async def scenario():
+        bus = TaskEventBus()
+        bus.publish("task", "status", status="pending")  # 구독자가 없으면 버려짐
+
+        with bus.subscribe("task") as queue, bus.subscribe("other") as other:
+            bus.publish("task", "progress", progress=40)
+            assert queue.get_nowait() == {"task_id": "task", "type": "progress", "progress": 40}
+            assert other.empty()
+            assert bus.subscriber_count() == 2
+
+        assert not bus.has_subscribers("task")
+        assert bus.subscriber_count() == 0
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_gets_a_single_resync():
+    async def scenario():
+        bus = TaskEventBus(max_queued_events=4)
+        with bus.subscribe("task") as slow, bus.subscribe("task") as fast:
+            for index in range(4):
+                bus.publish("task", "summary_delta", text=str(index))
+                fast.get_nowait()
+
+            # 가득 찬 큐는 밀린 이벤트를 버리고 resync 하나만 남김
+            bus.publish("task", "summary_delta", text="4")
+            assert slow.qsize() == 1
+            assert slow.get_nowait() == {"task_id": "task", "type": RESYNC_EVENT}
+            assert fast.get_nowait()["text"] == "4"
+
+            bus.publish("task", "status", status="completed")
+            assert slow.get_nowait()["type"] == "status"
+
+    asyncio.run(scenario())
+
+
+def test_drain_returns_dropped_count():
+    async def scenario():
+        queue: asyncio.Queue = asyncio.Queue()
+        for index in range(3):
+            queue.put_nowait(index)
+        assert drain(queue) == 3
+        assert queue.empty()
+
+    asyncio.run(scenario())
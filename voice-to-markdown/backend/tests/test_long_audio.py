@@ -0,0 +1,78 @@
+import numpy as np
+
+from app.services import vad
+from app.services.stt_base import stitch_chunks
+
+SR = vad.SAMPLE_RATE
+
+
+def _result(segments, duration, skipped=0.0) -> dict:
+    return {
+        "segments": [{"start": start, "end": end, "text": text, "confidence": 0.9} for start, end, text in segments],
+        "duration": duration,
+        "skipped_fraction": skipped
+    }
+
+
+def test_stitch_splits_overlap_at_its_midpoint():
+    # 두 번째 청크가 8초부터 시작해 [8, 10)초가 겹침 -> 9초 기준으로 나눔
+    chunks = [(0, 10 * SR), (8 * SR, 20 * SR)]
+    results = [
+        _result([(0.0, 4.0, "하나"), (7.5, 9.5, "둘"), (9.2, 10.0, "잘린 말")], 10.0),
+        _result([(0.0, 1.5, "둘"), (0.9, 2.0, "셋"), (2.0, 5.0, "넷")], 12.0)
+    ]
+
+    stitched = stitch_chunks(chunks, results, 20.0)
+
+    assert [segment["text"] for segment in stitched["segments"]] == ["하나", "둘", "셋", "넷"]
+    assert stitched["text"] == "하나 둘 셋 넷"
+    # 뒤 청크의 세그먼트 시각은 청크 시작만큼 밀림
+    assert stitched["segments"][2]["start"] == 8.9
+    assert stitched["segments"][3]["end"] == 13.0
+
+
+def test_stitch_keeps_adjacent_chunks_and_combines_skipped_fraction():
+    chunks = [(0, 10 * SR), (10 * SR, 30 * SR)]
+    results = [
+        _result([(0.0, 9.9, "앞")], 10.0, skipped=0.5),
+        _result([(0.0, 0.2, "뒤")], 20.0, skipped=0.0)
+    ]
+
+    stitched = stitch_chunks(chunks, results, 30.0)
+
+    assert [segment["text"] for segment in stitched["segments"]] == ["앞", "뒤"]
+    assert stitched["segments"][1]["start"] == 10.0
+    assert abs(stitched["skipped_fraction"] - 5.0 / 30.0) < 1e-9
+
+
+def test_stitch_prefix_matches_final_result():
+    # 앞 청크부터 끝난 만큼 이어 붙인 부분 결과는 최종 결과의 앞부분과 같아야 함 (요약 겹쳐 시작용)
+    chunks = [(0, 10 * SR), (8 * SR, 20 * SR), (18 * SR, 25 * SR)]
+    results = [
+        _result([(1.0, 8.7, "a"), (8.8, 10.0, "b")], 10.0),
+        _result([(0.5, 2.0, "b"), (2.0, 9.0, "c"), (9.5, 12.0, "d")], 12.0),
+        _result([(0.0, 1.5, "d"), (1.6, 6.0, "e")], 7.0)
+    ]
+
+    final = stitch_chunks(chunks, results, 25.0)["segments"]
+    for ready in range(1, len(chunks)):
+        partial = stitch_chunks(chunks, results[:ready], 25.0)["segments"]
+        assert partial == final[:len(partial)]
+
+
+def test_plan_chunks_cuts_at_silence_and_overlaps_continuous_speech():
+    rng = np.random.default_rng(0)
+    speech = rng.normal(0, 0.3, SR * 100).astype(np.float32)
+
+    # 45초 부근에 2초 무음 -> 무음 가운데에서 겹침 없이 자름
+    with_pause = speech.copy()
+    with_pause[45 * SR:47 * SR] = 0.0
+    chunks = vad.plan_chunks(with_pause, max_seconds=60, overlap_seconds=2)
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(with_pause)
+    assert 45 * SR <= chunks[0][1] <= 47 * SR
+    assert chunks[1][0] == chunks[0][1]
+
+    # 쉬지 않는 말 -> 상한에서 자르고 다음 청크를 겹쳐 시작
+    chunks = vad.plan_chunks(speech, max_seconds=60, overlap_seconds=2)
+    assert all(end - start <= 60 * SR for start, end in chunks)
+    assert chunks[1][0] == chunks[0][1] - 2 * SR
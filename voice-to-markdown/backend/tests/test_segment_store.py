@@ -0,0 +1,61 @@
+import os
+
+from app.services.segment_store import load_segments, save_segments, segments_path, share_segments
+
+SEGMENTS = [
+    {"start": 0.0, "end": 2.5, "text": "안녕하세요", "confidence": 0.91},
+    {"start": 2.5, "end": 6.0, "text": "오늘은 배열을 다룹니다.", "confidence": None},
+    {"start": 5.5, "end": 7.0, "text": "겹친 세그먼트", "confidence": 0.5},
+    {"start": 10.0, "end": 12.25, "text": "", "confidence": 0.7},
+    {"start": 12.25, "end": 15.0, "text": "Big-O notation", "confidence": 0.8},
+]
+
+
+def _saved(tmp_path):
+    path = segments_path(str(tmp_path), "task")
+    save_segments(path, SEGMENTS)
+    return path
+
+
+def test_round_trip(tmp_path):
+    table = load_segments(_saved(tmp_path))
+
+    assert len(table) == len(SEGMENTS)
+    assert table.duration == 15.0
+    rows = table.rows(0, len(table))
+    assert [row["index"] for row in rows] == list(range(len(SEGMENTS)))
+    assert [row["text"] for row in rows] == [segment["text"] for segment in SEGMENTS]
+    assert [row["confidence"] for row in rows] == [segment["confidence"] for segment in SEGMENTS]
+    assert (rows[4]["start"], rows[4]["end"]) == (12.25, 15.0)
+
+
+def test_time_range_returns_overlapping_segments(tmp_path):
+    table = load_segments(_saved(tmp_path))
+
+    assert table.time_range() == (0, 5)
+    # 시작 시각보다 늦게 끝나는 첫 세그먼트부터, 끝 시각 전에 시작하는 마지막 세그먼트까지
+    assert table.time_range(6.5, 11.0) == (2, 4)
+    assert table.time_range(2.5, 2.5) == (1, 1)
+    assert table.time_range(8.0, 9.0) == (3, 3)
+    assert table.time_range(20.0) == (5, 5)
+    assert table.rows(*table.time_range(None, 2.0)) == table.rows(0, 1)
+
+
+def test_empty_table(tmp_path):
+    path = segments_path(str(tmp_path), "empty")
+    save_segments(path, [])
+    table = load_segments(path)
+
+    assert len(table) == 0
+    assert table.duration == 0.0
+    assert table.time_range(1.0, 2.0) == (0, 0)
+    assert table.rows(0, 10) == []
+
+
+def test_shared_file_survives_source_removal(tmp_path):
+    source = _saved(tmp_path)
+    copy = segments_path(str(tmp_path), "reupload")
+    share_segments(source, copy)
+    os.remove(source)
+
+    assert [row["text"] for row in load_segments(copy).rows(0, 2)] == ["안녕하세요", "오늘은 배열을 다룹니다."]
@@ -0,0 +1,120 @@
+import asyncio
+
+from app.services.task_store import SQLiteTaskStore
+
+
+def _task(status: str = "transcribing") -> dict:
+    return {"status": status, "progress": 10, "message": "음성 인식 중..."}
+
+
+def test_claim_takes_only_stale_active_tasks(tmp_path):
+    db_path = str(tmp_path / "tasks.db")
+
+    async def scenario():
+        owner = SQLiteTaskStore(db_path)
+        other = SQLiteTaskStore(db_path)
+        await owner.create("running", _task())
+        await owner.create("done", _task("completed"))
+
+        # 방금 갱신된 작업은 임대 시간 안이므로 가져가지 않음
+        assert await other.claim_interrupted(lease_seconds=60) == []
+
+        await asyncio.sleep(0.05)
+        claimed = await other.claim_interrupted(lease_seconds=0.01)
+        assert [task["task_id"] for task in claimed] == ["running"]
+        assert claimed[0]["message"] == "음성 인식 중..."
+
+        # 가져간 작업은 임대가 새로 시작되므로 다른 워커가 다시 가져가지 않음
+        assert await owner.claim_interrupted(lease_seconds=0.01) == []
+
+        await owner.close()
+        await other.close()
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_claims_take_each_task_once(tmp_path):
+    db_path = str(tmp_path / "tasks.db")
+
+    async def scenario():
+        creator = SQLiteTaskStore(db_path)
+        for index in range(20):
+            await creator.create(f"task-{index}", _task("pending"))
+        await creator.close()
+        await asyncio.sleep(0.05)
+
+        workers = [SQLiteTaskStore(db_path) for _ in range(4)]
+        results = await asyncio.gather(*(worker.claim_interrupted(lease_seconds=0.01) for worker in workers))
+        claimed = [task["task_id"] for tasks in results for task in tasks]
+        assert sorted(claimed) == sorted(f"task-{index}" for index in range(20))
+
+        for worker in workers:
+            await worker.close()
+
+    asyncio.run(scenario())
+
+
+def test_heartbeat_keeps_running_task_leased(tmp_path):
+    db_path = str(tmp_path / "tasks.db")
+
+    async def scenario():
+        owner = SQLiteTaskStore(db_path, flush_interval=0.02, heartbeat_interval=0.02)
+        other = SQLiteTaskStore(db_path)
+        await owner.start()
+        await owner.create("running", _task())
+
+        await asyncio.sleep(0.5)
+        assert await other.claim_interrupted(lease_seconds=0.3) == []
+
+        # 워커가 멈추면 heartbeat가 끊겨 임대 시간이 지난 뒤 다른 워커가 가져감
+        await owner.close()
+        await asyncio.sleep(0.5)
+        claimed = await other.claim_interrupted(lease_seconds=0.3)
+        assert [task["task_id"] for task in claimed] == ["running"]
+        await other.close()
+
+    asyncio.run(scenario())
+
+
+def test_progress_is_visible_before_flush_and_terminal_status_releases(tmp_path):
+    db_path = str(tmp_path / "tasks.db")
+
+    async def scenario():
+        store = SQLiteTaskStore(db_path, flush_interval=60)
+        await store.create("task", _task())
+        await store.update_progress("task", progress=55, message="청크 2/4")
+
+        task = await store.get("task")
+        assert (task["status"], task["progress"], task["message"]) == ("transcribing", 55, "청크 2/4")
+
+        # 상태 변경은 아직 기록하지 않은 진행률과 합쳐 즉시 기록
+        await store.update("task", status="completed", progress=100)
+        reader = SQLiteTaskStore(db_path)
+        task = await reader.get("task")
+        assert (task["status"], task["progress"], task["message"]) == ("completed", 100, "청크 2/4")
+        assert "task" not in store._owned
+
+        await asyncio.sleep(0.05)
+        assert await reader.claim_interrupted(lease_seconds=0.01) == []
+        await store.close()
+        await reader.close()
+
+    asyncio.run(scenario())
+
+
+def test_purge_expired_removes_only_old_terminal_tasks(tmp_path):
+    db_path = str(tmp_path / "tasks.db")
+
+    async def scenario():
+        store = SQLiteTaskStore(db_path)
+        await store.create("done", _task("completed"))
+        await store.create("running", _task())
+        await asyncio.sleep(0.05)
+
+        purged = await store.purge_expired(ttl_seconds=0.01)
+        assert [task["task_id"] for task in purged] == ["done"]
+        assert await store.get("done") is None
+        assert await store.get("running") is not None
+        await store.close()
+
+    asyncio.run(scenario())
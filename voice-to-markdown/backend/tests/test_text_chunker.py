@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from app.services.text_chunker import ChunkAccumulator, estimate_tokens, split_into_chunks
+
+WORDS = ["강의", "배열은", "메모리에", "data", "structure", "인덱스로", "접근", "x", "음", "그래서"]
+
+
+def _random_transcript(rng: random.Random) -> str:
+    words = []
+    for _ in range(rng.randint(0, 400)):
+        word = rng.choice(WORDS)
+        r = rng.random()
+        if r < 0.03:
+            word += "."
+        elif r < 0.04:
+            word += "\n"
+        elif r < 0.05:
+            word += "  "
+        words.append(word)
+    return " ".join(words)
+
+
+def _stream(text: str, max_tokens: int, overlap_tokens: int, rng: random.Random) -> list:
+    accumulator = ChunkAccumulator(max_tokens, overlap_tokens)
+    chunks = []
+    position = 0
+    while position < len(text):
+        step = rng.randint(1, 30)
+        chunks += accumulator.add(text[position:position + step])
+        position += step
+    return chunks + accumulator.flush()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_streaming_matches_split(seed):
+    # 전사가 조각조각 이어 붙어도 전체를 한 번에 나눈 것과 같은 청크가 나와야 함 (요약 캐시 키가 같도록)
+    rng = random.Random(seed)
+    for _ in range(50):
+        text = _random_transcript(rng)
+        max_tokens = rng.choice([8, 20, 50])
+        overlap_tokens = rng.choice([0, 3, 10])
+
+        expected = split_into_chunks(text, max_tokens, overlap_tokens)
+        assert _stream(text, max_tokens, overlap_tokens, rng) == expected
+        assert all(estimate_tokens(chunk) <= max_tokens for chunk in expected)
+
+
+def test_unpunctuated_stream_emits_before_flush():
+    accumulator = ChunkAccumulator(50, 10)
+    emitted = []
+    for _ in range(100):
+        emitted += accumulator.add("그래서 배열은 메모리에 연속으로 저장되고 ")
+
+    assert len(emitted) > 10
+    assert all(estimate_tokens(chunk) <= 50 for chunk in emitted)
+    assert emitted + accumulator.flush() == split_into_chunks("그래서 배열은 메모리에 연속으로 저장되고 " * 100, 50, 10)
+
+
+def test_overlap_repeats_end_of_previous_chunk():
+    # 다음 청크 앞에 앞 청크의 마지막 문장(들어가지 않으면 끝부분 단어)을 겹쳐 넣음
+    assert split_into_chunks("First sentence here. Second one is here. Third.", 8, 4) == [
+        "First sentence here.",
+        "sentence here. Second one is here.",
+        "Second one is here. Third."
+    ]
+    assert split_into_chunks("First sentence here. Second one is here. Third.", 8, 0) == [
+        "First sentence here.",
+        "Second one is here. Third."
+    ]
+
+
+def test_empty_text_has_no_chunks():
+    assert split_into_chunks("", 20) == []
+    accumulator = ChunkAccumulator(20)
+    assert accumulator.add("   ") == []
+    assert accumulator.flush() == []
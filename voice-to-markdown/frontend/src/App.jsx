@@ -4,7 +4,7 @@ import AudioRecorder from './components/AudioRecorder'
 import FileUploader from './components/FileUploader'
 import ProcessingStatus from './components/ProcessingStatus'
 import ResultViewer from './components/ResultViewer'
-import WebSocketService from './services/websocket'
+import WebSocketService, { applyTaskEvent } from './services/websocket'
 import { uploadAudio, getProcessingStatus } from './services/api'
 
 function App() {
@@ -16,7 +16,8 @@ function App() {
     status: 'pending',
     progress: 0,
     message: '준비 중...',
-    transcript: null
+    transcript: null,
+    partialSummary: null
   })
 
   const wsService = new WebSocketService()
@@ -28,6 +29,29 @@ function App() {
     }
   }, [])
 
+  // WebSocket 연결하여 실시간 상태 업데이트 (실패 시 폴링)
+  const watchTask = (id) => {
+    wsService.connect(
+      id,
+      (data) => {
+        // 처음에는 전체 상태(snapshot), 이후에는 변경분만 수신
+        setProcessingStatus((prev) => applyTaskEvent(prev, data))
+        
+        if (data.status === 'completed') {
+          setCurrentStep('completed')
+          wsService.disconnect()
+        } else if (data.status === 'failed') {
+          wsService.disconnect()
+        }
+      },
+      (error) => {
+        console.error('WebSocket error:', error)
+        // Fallback to polling
+        startPolling(id)
+      }
+    )
+  }
+
   const handleRecordingComplete = async (audioFile) => {
     try {
       setCurrentStep('processing')
@@ -35,31 +59,7 @@ function App() {
       // 파일 업로드
       const response = await uploadAudio(audioFile, processingType)
       setTaskId(response.task_id)
-      
-      // WebSocket 연결하여 실시간 상태 업데이트
-      wsService.connect(
-        response.task_id,
-        (data) => {
-          setProcessingStatus({
-            status: data.status,
-            progress: data.progress || 0,
-            message: data.message || '',
-            transcript: data.transcript
-          })
-          
-          if (data.status === 'completed') {
-            setCurrentStep('completed')
-            wsService.disconnect()
-          } else if (data.status === 'failed') {
-            wsService.disconnect()
-          }
-        },
-        (error) => {
-          console.error('WebSocket error:', error)
-          // Fallback to polling
-          startPolling(response.task_id)
-        }
-      )
+      watchTask(response.task_id)
       
     } catch (error) {
       console.error('Upload failed:', error)
@@ -68,16 +68,32 @@ function App() {
     }
   }
 
+  // 실시간 전사 녹음 완료: 전사는 이미 끝났으므로 요약 진행만 표시
+  const handleLiveComplete = (liveTaskId) => {
+    setCurrentStep('processing')
+    setTaskId(liveTaskId)
+    watchTask(liveTaskId)
+  }
+
   const startPolling = (taskId) => {
+    let transcriptLoaded = false
     const pollInterval = setInterval(async () => {
       try {
-        const status = await getProcessingStatus(taskId)
-        setProcessingStatus({
+        // 전사 텍스트는 인식이 끝난 뒤 한 번만 받음
+        let status = await getProcessingStatus(taskId)
+        if (status.segment_count && !transcriptLoaded) {
+          status = await getProcessingStatus(taskId, { includeTranscript: true })
+          transcriptLoaded = true
+        }
+        setProcessingStatus((prev) => ({
           status: status.status,
           progress: status.progress,
           message: status.message,
-          transcript: status.transcript
-        })
+          transcript: status.transcript || prev.transcript,
+          partialSummary: status.partial_summary,
+          queuePosition: status.queue_position,
+          estimatedStartAt: status.estimated_start_at
+        }))
         
         if (status.status === 'completed' || status.status === 'failed') {
           if (status.status === 'completed') {
@@ -99,7 +115,8 @@ function App() {
       status: 'pending',
       progress: 0,
       message: '준비 중...',
-      transcript: null
+      transcript: null,
+      partialSummary: null
     })
     wsService.disconnect()
   }
@@ -148,7 +165,9 @@ function App() {
             {/* 선택된 입력 방식에 따른 컴포넌트 렌더링 */}
             {inputMode === 'record' ? (
               <AudioRecorder 
+                processingType={processingType}
                 onRecordingComplete={handleRecordingComplete}
+                onLiveComplete={handleLiveComplete}
               />
             ) : (
               <FileUploader 
@@ -166,6 +185,9 @@ function App() {
             message={processingStatus.message}
             taskId={taskId}
             transcript={processingStatus.transcript}
+            partialSummary={processingStatus.partialSummary}
+            queuePosition={processingStatus.queuePosition}
+            estimatedStartAt={processingStatus.estimatedStartAt}
           />
         )
       
@@ -1,15 +1,21 @@
 import React, { useState, useRef, useEffect } from 'react'
+import LiveTranscriptionService from '../services/liveTranscription'
 
-const AudioRecorder = ({ onRecordingComplete, disabled = false }) => {
+const AudioRecorder = ({ onRecordingComplete, onLiveComplete, processingType, disabled = false }) => {
   const [isRecording, setIsRecording] = useState(false)
   const [audioBlob, setAudioBlob] = useState(null)
   const [recordingTime, setRecordingTime] = useState(0)
   const [audioUrl, setAudioUrl] = useState(null)
+  // 실시간 전사: 확정된 세그먼트 + 아직 바뀔 수 있는 텍스트
+  const [liveSegments, setLiveSegments] = useState([])
+  const [livePartial, setLivePartial] = useState('')
+  const [isFinishing, setIsFinishing] = useState(false)
   
   const mediaRecorderRef = useRef(null)
   const streamRef = useRef(null)
   const intervalRef = useRef(null)
   const chunksRef = useRef([])
+  const liveRef = useRef(null)
 
   useEffect(() => {
     return () => {
@@ -26,6 +32,38 @@ const AudioRecorder = ({ onRecordingComplete, disabled = false }) => {
     }
   }, [audioUrl])
 
+  useEffect(() => {
+    return () => {
+      if (liveRef.current) {
+        liveRef.current.disconnect()
+      }
+    }
+  }, [])
+
+  // 실시간 전사 시작 (실패하면 녹음 파일 업로드 방식으로 처리)
+  const startLiveTranscription = async (stream) => {
+    if (!onLiveComplete || !window.AudioWorkletNode) return
+
+    const live = new LiveTranscriptionService()
+    try {
+      await live.start(stream, {
+        processingType,
+        onPartial: (data) => setLivePartial(data.text),
+        onFinal: (segments) => setLiveSegments((prev) => [...prev, ...segments]),
+        onError: (message) => {
+          console.error('Live transcription error:', message)
+          live.disconnect()
+          liveRef.current = null
+          setLivePartial('')
+        }
+      })
+      liveRef.current = live
+    } catch (error) {
+      console.error('Live transcription unavailable:', error)
+      live.disconnect()
+    }
+  }
+
   const startRecording = async () => {
     try {
       // 기존 녹음 정리
@@ -36,6 +74,8 @@ const AudioRecorder = ({ onRecordingComplete, disabled = false }) => {
         URL.revokeObjectURL(audioUrl)
         setAudioUrl(null)
       }
+      setLiveSegments([])
+      setLivePartial('')
 
       const stream = await navigator.mediaDevices.getUserMedia({
         audio: {
@@ -75,7 +115,9 @@ const AudioRecorder = ({ onRecordingComplete, disabled = false }) => {
         }
       }
 
+      // 실시간 전사를 쓰지 못하는 경우를 위해 녹음 파일도 함께 만듦
       mediaRecorder.start(100) // 100ms마다 데이터 수집
+      await startLiveTranscription(stream)
       setIsRecording(true)
       setRecordingTime(0)
 
@@ -90,7 +132,7 @@ const AudioRecorder = ({ onRecordingComplete, disabled = false }) => {
     }
   }
 
-  const stopRecording = () => {
+  const stopRecording = async () => {
     if (mediaRecorderRef.current && isRecording) {
       mediaRecorderRef.current.stop()
       setIsRecording(false)
@@ -99,6 +141,21 @@ const AudioRecorder = ({ onRecordingComplete, disabled = false }) => {
         clearInterval(intervalRef.current)
         intervalRef.current = null
       }
+
+      const live = liveRef.current
+      if (live) {
+        liveRef.current = null
+        setIsFinishing(true)
+        try {
+          // 남은 구간 전사가 끝나면 요약만 남은 작업이 만들어짐
+          const result = await live.stop()
+          onLiveComplete(result.task_id)
+        } catch (error) {
+          console.error('Live transcription failed:', error)
+        } finally {
+          setIsFinishing(false)
+        }
+      }
     }
   }
 
@@ -114,6 +171,8 @@ const AudioRecorder = ({ onRecordingComplete, disabled = false }) => {
   const clearRecording = () => {
     setAudioBlob(null)
     setRecordingTime(0)
+    setLiveSegments([])
+    setLivePartial('')
     
     if (audioUrl) {
       URL.revokeObjectURL(audioUrl)
@@ -157,7 +216,10 @@ const AudioRecorder = ({ onRecordingComplete, disabled = false }) => {
           {isRecording && (
             <div className="text-sm text-red-400 mt-2 animate-pulse">🔴 녹음 중...</div>
           )}
-          {audioBlob && !isRecording && (
+          {isFinishing && (
+            <div className="text-sm text-blue-400 mt-2 animate-pulse">⏳ 전사 마무리 중...</div>
+          )}
+          {audioBlob && !isRecording && !isFinishing && (
             <div className="text-sm text-green-400 mt-2">✅ 녹음 완료</div>
           )}
         </div>
@@ -186,7 +248,7 @@ const AudioRecorder = ({ onRecordingComplete, disabled = false }) => {
             </button>
           )}
 
-          {audioBlob && !isRecording && (
+          {audioBlob && !isRecording && !isFinishing && (
             <div className="space-y-3">
               {audioUrl && (
                 <div>
@@ -224,6 +286,17 @@ const AudioRecorder = ({ onRecordingComplete, disabled = false }) => {
         </div>
       </div>
 
+      {(liveSegments.length > 0 || livePartial) && (
+        <div className="max-h-64 overflow-y-auto rounded-xl bg-gray-900/60 border border-gray-700/50 p-4 text-left leading-relaxed">
+          <span className="text-gray-100">
+            {liveSegments.map((segment) => segment.text).join(' ')}
+          </span>
+          {livePartial && (
+            <span className="text-gray-500"> {livePartial}</span>
+          )}
+        </div>
+      )}
+
       {!navigator.mediaDevices && (
         <div className="text-center text-red-400 text-sm">
           이 브라우저는 음성 녹음을 지원하지 않습니다. Chrome, Firefox, Safari 등 최신 브라우저를 사용해주세요.
@@ -1,6 +1,7 @@
 import React from 'react'
+import ReactMarkdown from 'react-markdown'
 
-const ProcessingStatus = ({ status, progress, message, taskId, transcript }) => {
+const ProcessingStatus = ({ status, progress, message, taskId, transcript, partialSummary, queuePosition, estimatedStartAt }) => {
   const getStatusColor = (status) => {
     switch (status) {
       case 'pending':
@@ -86,6 +87,12 @@ const ProcessingStatus = ({ status, progress, message, taskId, transcript }) =>
       {/* 상태 메시지 */}
       <div className="text-center">
         <p className="text-gray-300 text-lg">{message}</p>
+        {queuePosition && (
+          <p className="text-sm text-yellow-300 mt-2">
+            대기 순번: {queuePosition}번째
+            {estimatedStartAt && ` (예상 시작: ${new Date(estimatedStartAt).toLocaleTimeString()})`}
+          </p>
+        )}
         {taskId && (
           <p className="text-xs text-gray-500 mt-2">작업 ID: {taskId}</p>
         )}
@@ -143,6 +150,16 @@ const ProcessingStatus = ({ status, progress, message, taskId, transcript }) =>
         </div>
       )}
 
+      {/* 생성 중인 요약 (스트리밍) */}
+      {partialSummary && (
+        <div className="mt-6 p-6 bg-gradient-to-br from-indigo-900/30 to-purple-900/30 border border-indigo-600/30 rounded-xl backdrop-blur-sm">
+          <div className="text-indigo-300 font-medium mb-3 text-lg">🤖 요약 생성 중</div>
+          <div className="prose prose-invert prose-sm max-w-none bg-gray-800/80 p-4 rounded-lg border border-gray-700/50 max-h-80 overflow-y-auto">
+            <ReactMarkdown>{partialSummary}</ReactMarkdown>
+          </div>
+        </div>
+      )}
+
       {status === 'failed' && (
         <div className="mt-4 p-6 bg-gradient-to-br from-red-900/30 to-pink-900/30 border border-red-600/30 rounded-xl backdrop-blur-sm">
           <div className="text-red-300 font-medium text-lg">처리 실패</div>
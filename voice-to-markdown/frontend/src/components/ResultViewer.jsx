@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react'
 import ReactMarkdown from 'react-markdown'
-import { getResultContent, downloadResult, getProcessingStatus } from '../services/api'
+import { getResultContent, downloadResult, getProcessingStatus, getAllTranscriptSegments } from '../services/api'
 
 const ResultViewer = ({ taskId, onStartNew }) => {
   const [content, setContent] = useState('')
@@ -15,14 +15,16 @@ const ResultViewer = ({ taskId, onStartNew }) => {
       try {
         setLoading(true)
         
-        // 결과 내용과 transcript 동시에 가져오기
-        const [resultContent, statusData] = await Promise.all([
+        // 결과 내용과 transcript 동시에 가져오기 (세그먼트 파일이 없는 이전 작업은 상태 API로)
+        const [resultContent, transcriptText] = await Promise.all([
           getResultContent(taskId),
-          getProcessingStatus(taskId)
+          getAllTranscriptSegments(taskId)
+            .then((segments) => segments.map((segment) => segment.text).join(' '))
+            .catch(() => getProcessingStatus(taskId, { includeTranscript: true }).then((data) => data.transcript))
         ])
         
         setContent(resultContent)
-        setTranscript(statusData.transcript || '음성 전사 결과를 찾을 수 없습니다.')
+        setTranscript(transcriptText || '음성 전사 결과를 찾을 수 없습니다.')
       } catch (err) {
         console.error('Failed to fetch result:', err)
         setError('결과를 불러오는데 실패했습니다.')
@@ -35,11 +35,32 @@ export const uploadAudio = async (audioFile, processingType = 'lecture') => {
   return response.data
 }
 
-export const getProcessingStatus = async (taskId) => {
-  const response = await api.get(`/status/${taskId}`)
+// 전사 텍스트는 includeTranscript일 때만 포함 (폴링마다 다시 받지 않음)
+export const getProcessingStatus = async (taskId, { includeTranscript = false } = {}) => {
+  const response = await api.get(`/status/${taskId}`, {
+    params: includeTranscript ? { include_transcript: true } : {},
+  })
+  return response.data
+}
+
+// 전사 세그먼트 구간 조회 (offset, limit, start_time, end_time)
+export const getTranscriptSegments = async (taskId, params = {}) => {
+  const response = await api.get(`/transcript/${taskId}/segments`, { params })
   return response.data
 }
 
+// 전체 전사 세그먼트를 페이지 단위로 모두 가져오기
+export const getAllTranscriptSegments = async (taskId) => {
+  const segments = []
+  let offset = 0
+  while (offset !== null) {
+    const page = await getTranscriptSegments(taskId, { offset, limit: 1000 })
+    segments.push(...page.segments)
+    offset = page.next_offset
+  }
+  return segments
+}
+
 export const downloadResult = async (taskId) => {
   const response = await api.get(`/download/${taskId}`, {
     responseType: 'blob',
@@ -0,0 +1,163 @@
+import { getWebSocketURL } from './websocket'
+
+// 서버가 인식하는 샘플링 레이트 (16kHz mono 16bit PCM으로 전송)
+const TARGET_SAMPLE_RATE = 16000
+// 모은 오디오를 서버로 보내는 간격 (ms)
+const SEND_INTERVAL_MS = 250
+
+// 마이크 입력을 16kHz로 변환해 Int16 PCM으로 넘기는 AudioWorklet (선형 보간)
+const WORKLET_SOURCE = `
+class PcmCaptureProcessor extends AudioWorkletProcessor {
+  constructor(options) {
+    super()
+    this.ratio = sampleRate / options.processorOptions.targetRate
+    this.position = 0
+    this.last = 0
+  }
+
+  process(inputs) {
+    const input = inputs[0] && inputs[0][0]
+    if (!input || input.length === 0) return true
+
+    const sample = (i) => (i < 0 ? this.last : input[Math.min(i, input.length - 1)])
+    const out = []
+    let position = this.position
+    while (position <= input.length - 1) {
+      const index = Math.floor(position)
+      const frac = position - index
+      const value = sample(index) * (1 - frac) + sample(index + 1) * frac
+      out.push(Math.max(-1, Math.min(1, value)) * 0x7fff)
+      position += this.ratio
+    }
+    this.position = position - input.length
+    this.last = input[input.length - 1]
+
+    const pcm = Int16Array.from(out)
+    this.port.postMessage(pcm.buffer, [pcm.buffer])
+    return true
+  }
+}
+registerProcessor('pcm-capture', PcmCaptureProcessor)
+`
+
+class LiveTranscriptionService {
+  constructor() {
+    this.ws = null
+    this.audioContext = null
+    this.chunks = []
+    this.sendTimer = null
+    this.pendingStop = null
+  }
+
+  // 녹음 스트림을 서버로 보내며 실시간 전사 시작 (연결/마이크 처리 실패 시 예외)
+  async start(stream, { processingType, language = 'ko', onPartial, onFinal, onError }) {
+    this.ws = new WebSocket(getWebSocketURL('/ws/live'))
+    this.ws.binaryType = 'arraybuffer'
+    await new Promise((resolve, reject) => {
+      this.ws.onopen = resolve
+      this.ws.onerror = () => reject(new Error('실시간 전사 서버에 연결할 수 없습니다'))
+    })
+
+    this.ws.onmessage = (event) => {
+      const data = JSON.parse(event.data)
+      switch (data.type) {
+        case 'partial':
+          if (onPartial) onPartial(data)
+          break
+        case 'final':
+          if (onFinal) onFinal(data.segments)
+          break
+        case 'completed':
+          if (this.pendingStop) this.pendingStop.resolve(data)
+          break
+        case 'error':
+          if (this.pendingStop) this.pendingStop.reject(new Error(data.message))
+          else if (onError) onError(data.message)
+          break
+        default:
+          break
+      }
+    }
+    this.ws.onclose = () => {
+      if (this.pendingStop) this.pendingStop.reject(new Error('실시간 전사 연결이 끊어졌습니다'))
+      this.stopCapture()
+    }
+    this.ws.send(JSON.stringify({ type: 'start', processing_type: processingType, language }))
+
+    // 마이크 입력 -> 16kHz Int16 PCM
+    this.audioContext = new AudioContext()
+    const moduleUrl = URL.createObjectURL(new Blob([WORKLET_SOURCE], { type: 'application/javascript' }))
+    await this.audioContext.audioWorklet.addModule(moduleUrl)
+    URL.revokeObjectURL(moduleUrl)
+
+    const source = this.audioContext.createMediaStreamSource(stream)
+    const capture = new AudioWorkletNode(this.audioContext, 'pcm-capture', {
+      processorOptions: { targetRate: TARGET_SAMPLE_RATE }
+    })
+    capture.port.onmessage = (event) => this.chunks.push(new Int16Array(event.data))
+    source.connect(capture)
+    // 출력은 무음이지만 그래프에 연결해야 process()가 호출됨
+    capture.connect(this.audioContext.destination)
+
+    this.sendTimer = setInterval(() => this.sendChunks(), SEND_INTERVAL_MS)
+  }
+
+  // 모아 둔 오디오를 한 프레임으로 전송
+  sendChunks() {
+    if (!this.isConnected() || this.chunks.length === 0) return
+
+    const length = this.chunks.reduce((sum, chunk) => sum + chunk.length, 0)
+    const frame = new Int16Array(length)
+    let offset = 0
+    this.chunks.forEach((chunk) => {
+      frame.set(chunk, offset)
+      offset += chunk.length
+    })
+    this.chunks = []
+    this.ws.send(frame.buffer)
+  }
+
+  // 녹음 종료: 남은 오디오를 보내고 서버가 전사를 마치면 { task_id, transcript } 반환
+  stop() {
+    this.sendChunks()
+    this.stopCapture()
+    if (!this.isConnected()) {
+      return Promise.reject(new Error('실시간 전사 연결이 끊어졌습니다'))
+    }
+
+    const result = new Promise((resolve, reject) => {
+      this.pendingStop = { resolve, reject }
+    })
+    this.ws.send(JSON.stringify({ type: 'stop' }))
+    return result.finally(() => {
+      this.pendingStop = null
+      this.disconnect()
+    })
+  }
+
+  stopCapture() {
+    if (this.sendTimer) {
+      clearInterval(this.sendTimer)
+      this.sendTimer = null
+    }
+    if (this.audioContext) {
+      this.audioContext.close()
+      this.audioContext = null
+    }
+  }
+
+  disconnect() {
+    this.stopCapture()
+    if (this.ws) {
+      this.ws.onclose = null
+      this.ws.close()
+      this.ws = null
+    }
+  }
+
+  isConnected() {
+    return this.ws && this.ws.readyState === WebSocket.OPEN
+  }
+}
+
+export default LiveTranscriptionService
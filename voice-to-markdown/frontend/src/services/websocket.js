@@ -1,3 +1,20 @@
+// 현재 호스트에 맞춰 WebSocket URL 동적 설정 (path 예: '/ws/<task_id>')
+export const getWebSocketURL = (path) => {
+  const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:'
+  
+  // ngrok이나 다른 프록시 환경에서는 같은 도메인 사용
+  if (window.location.hostname.includes('ngrok') || 
+      window.location.hostname.includes('app') ||
+      window.location.port === '') {
+    // ngrok이나 배포 환경에서는 /api 경로 사용
+    return `${protocol}//${window.location.host}/api${path}`
+  }
+  
+  // 로컬 개발 환경에서는 백엔드 포트 직접 사용
+  const hostname = window.location.hostname
+  return `${protocol}//${hostname}:8000${path}`
+}
+
 class WebSocketService {
   constructor() {
     this.ws = null
@@ -5,23 +22,7 @@ class WebSocketService {
   }
 
   connect(taskId, onMessage, onError = null, onClose = null) {
-    // 현재 호스트에 맞춰 WebSocket URL 동적 설정
-    const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:'
-    
-    let wsUrl
-    // ngrok이나 다른 프록시 환경에서는 같은 도메인 사용
-    if (window.location.hostname.includes('ngrok') || 
-        window.location.hostname.includes('app') ||
-        window.location.port === '') {
-      // ngrok이나 배포 환경에서는 /api/ws 경로 사용
-      wsUrl = `${protocol}//${window.location.host}/api/ws/${taskId}`
-    } else {
-      // 로컬 개발 환경에서는 백엔드 포트 직접 사용
-      const hostname = window.location.hostname
-      wsUrl = `${protocol}//${hostname}:8000/ws/${taskId}`
-    }
-    
-    this.ws = new WebSocket(wsUrl)
+    this.ws = new WebSocket(getWebSocketURL(`/ws/${taskId}`))
     
     this.ws.onopen = () => {
       console.log('WebSocket connected')
@@ -59,4 +60,53 @@ class WebSocketService {
   }
 }
 
+// 서버 이벤트 필드 -> 화면 상태 필드
+const FIELD_NAMES = {
+  status: 'status',
+  progress: 'progress',
+  message: 'message',
+  transcript: 'transcript',
+  segment_count: 'segmentCount',
+  partial_summary: 'partialSummary',
+  queue_position: 'queuePosition',
+  estimated_start_at: 'estimatedStartAt'
+}
+
+// WebSocket 이벤트(snapshot 또는 변경분)를 현재 처리 상태에 적용
+export function applyTaskEvent(prev, event) {
+  switch (event.type) {
+    case 'snapshot':
+      return {
+        status: event.status,
+        progress: event.progress || 0,
+        message: event.message || '',
+        transcript: event.transcript,
+        segmentCount: event.segment_count,
+        partialSummary: event.partial_summary,
+        queuePosition: event.queue_position,
+        estimatedStartAt: event.estimated_start_at
+      }
+    case 'transcript_delta':
+      return { ...prev, transcript: (prev.transcript || '') + event.text }
+    case 'summary_delta':
+      return { ...prev, partialSummary: (prev.partialSummary || '') + event.text }
+    case 'status':
+    case 'progress':
+    case 'queue': {
+      const next = { ...prev }
+      // 대기 상태를 벗어나면 대기 순번 표시 제거
+      if (event.type === 'status') {
+        next.queuePosition = null
+        next.estimatedStartAt = null
+      }
+      Object.entries(FIELD_NAMES).forEach(([key, name]) => {
+        if (key in event) next[name] = event[key]
+      })
+      return next
+    }
+    default:
+      return prev
+  }
+}
+
 export default WebSocketService
\ No newline at end of file